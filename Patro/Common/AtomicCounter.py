@@ -18,7 +18,7 @@
 #
 ####################################################################################################
 
-__all__ = ['AtomicCounter']
+__all__ = ['AtomicCounter', 'IdAllocator']
 
 ####################################################################################################
 
@@ -62,3 +62,54 @@ class AtomicCounter:
             if value <= self._value:
                 raise ValueError
             self._value = value
+
+####################################################################################################
+
+class IdAllocator:
+
+    """A thread-safe allocator of unique integer ids.
+
+    Contrary to :class:`AtomicCounter`, an explicit id can be reserved in any order.
+
+    """
+
+    ##############################################
+
+    def __init__(self, start=0):
+        self._next_id = start
+        self._ids = set()
+        self._lock = threading.Lock()
+
+    ##############################################
+
+    def __contains__(self, id):
+        return id in self._ids
+
+    ##############################################
+
+    def new_id(self):
+        """Return a new id"""
+        with self._lock:
+            id = self._next_id
+            while id in self._ids:
+                id += 1
+            self._ids.add(id)
+            self._next_id = id + 1
+        return id
+
+    ##############################################
+
+    def reserve(self, id):
+        """Reserve an explicit id, raise :obj:`ValueError` if it is already allocated."""
+        with self._lock:
+            if id in self._ids:
+                raise ValueError
+            self._ids.add(id)
+            if id >= self._next_id:
+                self._next_id = id + 1
+
+    ##############################################
+
+    def release(self, id):
+        with self._lock:
+            self._ids.discard(id)
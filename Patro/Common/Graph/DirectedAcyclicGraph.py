@@ -20,12 +20,18 @@
 
 """This module implements a directed acyclic graph.
 
+The graph maintains a topological order incrementally using the algorithm of Pearce and Kelly, `A
+Dynamic Topological Sort Algorithm for Directed Acyclic Graphs`, thus a cycle is detected when an
+edge is added.
+
 """
 
 ####################################################################################################
 
 # import logging
 
+from collections import deque
+
 ####################################################################################################
 
 class DirectedAcyclicGraphNode:
@@ -34,10 +40,12 @@ class DirectedAcyclicGraphNode:
 
     ##############################################
 
-    def __init__(self, node_id, data=None):
+    def __init__(self, node_id, data=None, graph=None):
 
         self._node_id = node_id
         self._data = data
+        self._graph = graph
+        self._rank = 0 # index in the topological order
 
         self._ancestors = set()
         self._descendants = set()
@@ -58,8 +66,12 @@ class DirectedAcyclicGraphNode:
         return self._data
 
     @property
-    def ancestor(self):
-        return self._ancestor
+    def rank(self):
+        return self._rank
+
+    @property
+    def ancestors(self):
+        return self._ancestors
 
     @property
     def descendants(self):
@@ -80,30 +92,50 @@ class DirectedAcyclicGraphNode:
     ##############################################
 
     def disconnect_ancestor(self, node):
+        # the topological order remains valid
         self._ancestors.remove(node)
-        node.descendants.remove(self)
+        node._descendants.remove(self)
 
     ##############################################
 
     def connect_ancestor(self, node):
+
+        """Add an edge from *node* to self, raise :obj:`NameError` if the edge creates a cycle."""
+
+        if node in self._ancestors:
+            return
+        if self._graph is not None:
+            self._graph._update_order(node, self)
+        elif node is self or node in self.breadth_first_search():
+            raise NameError('Not a DAG')
         self._ancestors.add(node)
         node._descendants.add(self)
 
     ##############################################
 
+    @staticmethod
+    def _breadth_first_search(node, attribute):
+        queue = deque((node,))
+        visited = set((node,))
+        while queue:
+            node = queue.popleft()
+            yield node
+            for next_node in getattr(node, attribute):
+                if next_node not in visited:
+                    queue.append(next_node)
+                    visited.add(next_node)
+
+    ##############################################
+
     def breadth_first_search(self):
+        """Iterate over self and its descendants in breadth first order."""
+        return self._breadth_first_search(self, '_descendants')
 
-        # Fixme: Name ?
+    ##############################################
 
-        queue = [self]
-        visited = set((self,))
-        while queue:
-            node = queue.pop(0)
-            yield node
-            for descendant in node._descendants:
-                if descendant not in visited:
-                    queue.append(descendant)
-                    visited.add(descendant)
+    def ancestor_breadth_first_search(self):
+        """Iterate over self and its ancestors in breadth first order."""
+        return self._breadth_first_search(self, '_ancestors')
 
 ####################################################################################################
 
@@ -115,6 +147,12 @@ class DirectedAcyclicGraph:
 
     def __init__(self):
         self._nodes = {}
+        self._order = [] # nodes in topological order, node._rank is the index
+
+    ##############################################
+
+    def __len__(self):
+        return len(self._nodes)
 
     ##############################################
 
@@ -128,11 +166,18 @@ class DirectedAcyclicGraph:
 
     ##############################################
 
+    def __contains__(self, node_id):
+        return node_id in self._nodes
+
+    ##############################################
+
     def add_node(self, node_id, **kwargs):
 
         if node_id not in self._nodes:
-            node = DirectedAcyclicGraphNode(node_id, **kwargs)
+            node = DirectedAcyclicGraphNode(node_id, graph=self, **kwargs)
+            node._rank = len(self._order)
             self._nodes[node_id] = node
+            self._order.append(node)
             return node
         else:
             raise NameError("Node {} is already registered".format(node_id))
@@ -154,28 +199,87 @@ class DirectedAcyclicGraph:
 
     ##############################################
 
+    def _update_order(self, ancestor, descendant):
+
+        """Update the topological order before to add the edge *ancestor* -> *descendant*."""
+
+        lower_bound = descendant._rank
+        upper_bound = ancestor._rank
+        if lower_bound > upper_bound:
+            return # order is still valid
+        if ancestor is descendant:
+            raise NameError('Not a DAG')
+
+        # Find the descendants of descendant which are misplaced
+        forward = []
+        stack = [descendant]
+        visited = set(stack)
+        while stack:
+            node = stack.pop()
+            forward.append(node)
+            for next_node in node._descendants:
+                if next_node is ancestor:
+                    raise NameError('Not a DAG')
+                if next_node not in visited and next_node._rank < upper_bound:
+                    visited.add(next_node)
+                    stack.append(next_node)
+
+        # Find the ancestors of ancestor which are misplaced
+        backward = []
+        stack = [ancestor]
+        visited = set(stack)
+        while stack:
+            node = stack.pop()
+            backward.append(node)
+            for next_node in node._ancestors:
+                if next_node not in visited and lower_bound < next_node._rank:
+                    visited.add(next_node)
+                    stack.append(next_node)
+
+        # Reallocate the ranks of the affected nodes, ancestors first
+        rank_key = lambda node: node._rank
+        backward.sort(key=rank_key)
+        forward.sort(key=rank_key)
+        nodes = backward + forward
+        ranks = sorted(node._rank for node in nodes)
+        for node, rank in zip(nodes, ranks):
+            node._rank = rank
+            self._order[rank] = node
+
+    ##############################################
+
     def topological_sort(self):
+        """Return the list of nodes in topological order."""
+        return list(self._order)
 
-        sorted_list = [] # reversed
-        unmarked_nodes = set(self._nodes.values())
-        marked_nodes = set()
-        temporary_marked_nodes = set()
-
-        def visit(node):
-            if node in temporary_marked_nodes:
-                raise NameError('Not a DAG')
-            if node not in marked_nodes:
-                temporary_marked_nodes.add(node)
-                for descendant in node._descendants:
-                    visit(descendant)
-                marked_nodes.add(node)
-                temporary_marked_nodes.remove(node)
-                sorted_list.append(node)
-
-        while unmarked_nodes:
-            node = unmarked_nodes.pop()
-            visit(node)
-
-        sorted_list.reverse()
-
-        return sorted_list
+    ##############################################
+
+    def sort(self, nodes):
+        """Return *nodes* in topological order."""
+        return sorted(nodes, key=lambda node: node._rank)
+
+    ##############################################
+
+    def descendants_of(self, nodes):
+        """Return the set of the nodes reachable from *nodes*, *nodes* included."""
+        return self._closure(nodes, '_descendants')
+
+    ##############################################
+
+    def ancestors_of(self, nodes):
+        """Return the set of the nodes from which *nodes* are reachable, *nodes* included."""
+        return self._closure(nodes, '_ancestors')
+
+    ##############################################
+
+    @staticmethod
+    def _closure(nodes, attribute):
+        queue = deque(nodes)
+        visited = set(queue)
+        while queue:
+            node = queue.popleft()
+            for next_node in getattr(node, attribute):
+                if next_node not in visited:
+                    queue.append(next_node)
+                    visited.add(next_node)
+        return visited
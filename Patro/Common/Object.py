@@ -18,7 +18,7 @@
 #
 ####################################################################################################
 
-__all__ = ['ObjectNameMixin', 'ObjectGlobalIdMixin']
+__all__ = ['ObjectNameMixin', 'ObjectGlobalIdMixin', 'ObjectCkeckedIdMixin']
 
 ####################################################################################################
 
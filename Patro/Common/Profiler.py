@@ -0,0 +1,251 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2018 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+"""Module to implement an opt-in profiler to instrument the pattern engine.
+
+The instrumented code simply enters a :meth:`Profiler.region`, when the profiler is disabled it
+returns a shared no-op context manager, thus the overhead is a method call::
+
+    from Patro.Common.Profiler import profiler
+
+    profiler.enable()
+    val_file = ValFileReader(path)
+    profiler.disable()
+    profiler.write_json('profile.json')
+    profiler.write_collapsed_stacks('profile.folded') # for flamegraph.pl or speedscope
+
+"""
+
+####################################################################################################
+
+__all__ = ['Profiler', 'profiler']
+
+####################################################################################################
+
+import json
+import time
+
+####################################################################################################
+
+class ProfileEntry:
+
+    """Class to accumulate the timing of a region."""
+
+    __slots__ = ('count', 'cumulative_time', 'max_time')
+
+    ##############################################
+
+    def __init__(self):
+        self.count = 0
+        self.cumulative_time = 0
+        self.max_time = 0
+
+    ##############################################
+
+    def add(self, elapsed_time):
+        self.count += 1
+        self.cumulative_time += elapsed_time
+        if elapsed_time > self.max_time:
+            self.max_time = elapsed_time
+
+    ##############################################
+
+    def to_json(self):
+        return {
+            'count': self.count,
+            'cumulative_time': self.cumulative_time,
+            'max_time': self.max_time,
+        }
+
+####################################################################################################
+
+class ProfileRegion:
+
+    """Context manager to time a region of code."""
+
+    __slots__ = ('_profiler', '_name', '_keys', '_stack', '_start_time', '_children_time')
+
+    ##############################################
+
+    def __init__(self, profiler, name, keys):
+        self._profiler = profiler
+        self._name = name
+        self._keys = keys
+        self._children_time = 0
+
+    ##############################################
+
+    def __enter__(self):
+        self._profiler._enter(self)
+        self._start_time = time.perf_counter()
+        return self
+
+    ##############################################
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed_time = time.perf_counter() - self._start_time
+        self._profiler._exit(self, elapsed_time)
+        return False
+
+####################################################################################################
+
+class NullRegion:
+
+    """No-op context manager returned when the profiler is disabled."""
+
+    __slots__ = ()
+
+    ##############################################
+
+    def __enter__(self):
+        return self
+
+    ##############################################
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_null_region = NullRegion()
+
+####################################################################################################
+
+class Profiler:
+
+    """Class to record call counts, cumulative and max wall time per region.
+
+    A region is identified by a name, e.g. ``SketchOperation.eval``, and timings are also recorded per
+    key, e.g. ``cls=AlongLinePoint`` and ``id=42``.  The self time of the stack of regions is
+    accumulated for flame graphs.
+
+    The profiler is not thread safe.
+
+    """
+
+    ##############################################
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    ##############################################
+
+    def reset(self):
+        self._stats = {}
+        self._stack = []
+        self._stack_times = {}
+
+    ##############################################
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    ##############################################
+
+    def region(self, name, **keys):
+        """Return a context manager to time a region, or a no-op one if the profiler is disabled"""
+        if self.enabled:
+            return ProfileRegion(self, name, keys)
+        else:
+            return _null_region
+
+    ##############################################
+
+    @staticmethod
+    def _frame_name(region):
+        cls = region._keys.get('cls', None)
+        if cls is not None:
+            return '{}:{}'.format(region._name, cls)
+        else:
+            return region._name
+
+    ##############################################
+
+    def _enter(self, region):
+        if self._stack:
+            region._stack = self._stack[-1]._stack + ';' + self._frame_name(region)
+        else:
+            region._stack = self._frame_name(region)
+        self._stack.append(region)
+
+    ##############################################
+
+    def _exit(self, region, elapsed_time):
+
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1]._children_time += elapsed_time
+        stack = region._stack
+        self._stack_times[stack] = self._stack_times.get(stack, 0) + elapsed_time - region._children_time
+
+        stats = self._stats.setdefault(region._name, {'total': ProfileEntry()})
+        stats['total'].add(elapsed_time)
+        for key, value in region._keys.items():
+            entries = stats.setdefault(key, {})
+            entry = entries.get(value, None)
+            if entry is None:
+                entry = entries[value] = ProfileEntry()
+            entry.add(elapsed_time)
+
+    ##############################################
+
+    @property
+    def stats(self):
+        return self._stats
+
+    ##############################################
+
+    def to_json(self):
+        """Return the profile as a JSON compatible dictionary"""
+        return {
+            name: {
+                key: (entries.to_json() if key == 'total'
+                      else {str(value): entry.to_json() for value, entry in entries.items()})
+                for key, entries in stats.items()
+            }
+            for name, stats in self._stats.items()
+        }
+
+    ##############################################
+
+    def write_json(self, path):
+        with open(path, 'w') as fh:
+            json.dump(self.to_json(), fh, indent=2)
+
+    ##############################################
+
+    def collapsed_stacks(self):
+        """Return the self time in microseconds per stack, using the collapsed stack format of flamegraph.pl"""
+        return ''.join(
+            '{} {}\n'.format(stack, int(elapsed_time * 1e6))
+            for stack, elapsed_time in sorted(self._stack_times.items())
+        )
+
+    ##############################################
+
+    def write_collapsed_stacks(self, path):
+        with open(path, 'w') as fh:
+            fh.write(self.collapsed_stacks())
+
+####################################################################################################
+
+profiler = Profiler()
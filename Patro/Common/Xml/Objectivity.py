@@ -207,12 +207,53 @@ class StringAttribute(Attribute):
 
 class XmlObjectAdaptatorMetaClass(type):
 
-    """Metaclass to collect attributes from super-classes and define a property for each attribute"""
+    """Metaclass to collect attributes from super-classes and define a property for each attribute.
+
+    The attribute values are stored in slots and the tables used to decode XML elements are
+    computed at class creation.
+
+    """
 
     _logger = _module_logger.getChild('XmlObjectAdaptatorMetaClass')
 
     ##############################################
 
+    @staticmethod
+    def _collect_attributes(super_classes):
+
+        """Collect attributes from super-classes"""
+
+        # Fixme: use set ???
+
+        super_attributes = []
+        for super_class in super_classes:
+            # __mro__ = [cls, ..., object]
+            super_attributes += XmlObjectAdaptatorMetaClass._collect_attributes(super_class.__mro__[1:-1]) # super_class.__subclasses__()
+            if hasattr(super_class, '__attributes__'):
+                super_attributes += list(super_class.__attributes__)
+        return super_attributes
+
+    ##############################################
+
+    def __new__(mcls, class_name, super_classes, class_attribute_dict):
+
+        # Define a slot for each new attribute
+        attributes = mcls._collect_attributes(super_classes) + list(class_attribute_dict.get('__attributes__', ()))
+        super_slots = set()
+        for super_class in super_classes:
+            for cls in super_class.__mro__:
+                super_slots.update(cls.__dict__.get('__slots__', ()))
+        slots = list(class_attribute_dict.get('__slots__', ()))
+        for attribute in attributes:
+            slot = attribute.py_cls_attribute
+            if slot not in super_slots and slot not in slots and slot not in class_attribute_dict:
+                slots.append(slot)
+        class_attribute_dict['__slots__'] = tuple(slots)
+
+        return super().__new__(mcls, class_name, super_classes, class_attribute_dict)
+
+    ##############################################
+
     def __init__(cls, class_name, super_classes, class_attribute_dict):
 
         # cls._logger.info(str((cls, class_name, super_classes, class_attribute_dict)))
@@ -227,21 +268,22 @@ class XmlObjectAdaptatorMetaClass(type):
             # cls._logger.info('Register {}'.format(attribute))
             attribute.set_property(cls)
 
+        # Tables of (name, converter, slot, default) used to decode XML elements and kwargs,
+        # an attribute can be collected several times, the last one wins
+        xml_decoder = {}
+        py_decoder = {}
+        for attribute in cls.__attributes__:
+            slot = attribute.py_cls_attribute
+            xml_decoder[slot] = (attribute.xml_attribute, attribute.from_xml, slot, attribute.default)
+            py_decoder[slot] = (attribute.py_attribute, attribute.from_xml, slot, attribute.default)
+        cls.__xml_decoder__ = tuple(xml_decoder.values())
+        cls.__py_decoder__ = tuple(py_decoder.values())
+
     ##############################################
 
     def register_from_super_class(cls, super_classes):
-
         """Collect attributes from super-classes"""
-
-        # Fixme: use set ???
-
-        super_attributes = []
-        for super_class in super_classes:
-            # __mro__ = [cls, ..., object]
-            super_attributes += cls.register_from_super_class(super_class.__mro__[1:-1]) # super_class.__subclasses__()
-            if hasattr(super_class, '__attributes__'):
-                super_attributes += list(super_class.__attributes__)
-        return super_attributes
+        return cls._collect_attributes(super_classes)
 
 ####################################################################################################
 
@@ -249,6 +291,9 @@ class XmlObjectAdaptator(metaclass=XmlObjectAdaptatorMetaClass):
 
     """Class to implement an object oriented adaptor for XML elements."""
 
+    # Sub-classes can define other attributes, the dict is only allocated when it is used
+    __slots__ = ('__dict__',)
+
     __tag__ = None # XML tag
     __attributes__ = ()
 
@@ -263,6 +308,25 @@ class XmlObjectAdaptator(metaclass=XmlObjectAdaptatorMetaClass):
 
     ##############################################
 
+    @classmethod
+    def from_xml_elements(cls, xml_elements):
+
+        """Return a list of instances for a list of XML elements."""
+
+        if cls.__init__ is not XmlObjectAdaptator.__init__:
+            return [cls(xml_element) for xml_element in xml_elements]
+
+        objects = []
+        new = cls.__new__
+        init_from_xml = cls._init_from_xml
+        for xml_element in xml_elements:
+            obj = new(cls)
+            init_from_xml(obj, xml_element)
+            objects.append(obj)
+        return objects
+
+    ##############################################
+
     def __repr__(self):
         return '{} {}'.format(self.__class__.__name__, self.to_dict())
 
@@ -270,28 +334,22 @@ class XmlObjectAdaptator(metaclass=XmlObjectAdaptatorMetaClass):
 
     def _init_from_xml(self, xml_element):
 
-        xml_attributes = xml_element.attrib
-        for attribute in self.__attributes__:
-            xml_attribute = attribute.xml_attribute
-            if xml_attribute in xml_attributes:
-                value = attribute.from_xml(xml_attributes[xml_attribute])
-            else:
-                value = attribute.default
-            attribute.set_attribute(self, value)
+        get = xml_element.attrib.get
+        for xml_attribute, from_xml, slot, default in self.__xml_decoder__:
+            value = get(xml_attribute)
+            setattr(self, slot, default if value is None else from_xml(value))
 
     ##############################################
 
     def _init_from_kwargs(self, kwargs):
 
-        for attribute in self.__attributes__:
-            py_attribute = attribute.py_attribute
-            # Fixme: duplicated code
+        for py_attribute, from_xml, slot, default in self.__py_decoder__:
             if py_attribute in kwargs:
                 # Fixme: see VitFormat.py StrokeStyleAttribute !!!
-                value = attribute.from_xml(kwargs[py_attribute])
+                value = from_xml(kwargs[py_attribute])
             else:
-                value = attribute.default
-            attribute.set_attribute(self, value)
+                value = default
+            setattr(self, slot, value)
 
     ##############################################
 
@@ -20,6 +20,7 @@
 
 ####################################################################################################
 
+import io
 import logging
 from pathlib import Path
 
@@ -55,23 +56,46 @@ class XmlFileMixin:
 
     ##############################################
 
+    def _data_to_bytes(self):
+        data = self._data
+        if isinstance(data, bytes):
+            return data
+        else:
+            return bytes(str(data).strip(), 'utf-8')
+
+    ##############################################
+
     def parse(self):
         """Parse a XML file and return the etree"""
 
-        data = self._data
-        if data is None:
+        if self._data is None:
             with open(str(self._path), 'rb') as f:
                 source = f.read()
         else:
-            if isinstance(data, bytes):
-               source = data
-            else:
-                source = bytes(str(self._data).strip(), 'utf-8')
+            source = self._data_to_bytes()
 
         return etree.fromstring(source)
 
     ##############################################
 
+    def iterparse(self, events=('end',), tag=None):
+
+        """Parse incrementally a XML file and return an iterator on (event, element).
+
+        The file is read by chunks, thus the caller should clear the elements once they are
+        processed in order to bound the memory usage.
+
+        """
+
+        if self._data is None:
+            source = str(self._path)
+        else:
+            source = io.BytesIO(self._data_to_bytes())
+
+        return etree.iterparse(source, events=events, tag=tag, remove_comments=True, huge_tree=True)
+
+    ##############################################
+
     @staticmethod
     def get_xpath_elements(root, path):
         """Utility function to get elements from a xpath and a root"""
@@ -0,0 +1,138 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2017 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+"""Load YAML data files through a binary cache.
+
+The cache is stored next to the data file and is invalidated when the file is modified, it is
+silently skipped when the directory is read-only.
+
+"""
+
+####################################################################################################
+
+__all__ = ['load_yaml']
+
+####################################################################################################
+
+from pathlib import Path
+import hashlib
+import logging
+import os
+import pickle
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+####################################################################################################
+
+_module_logger = logging.getLogger(__name__)
+
+####################################################################################################
+
+CACHE_SUFFIX = '.cache'
+CACHE_VERSION = 1
+
+####################################################################################################
+
+def cache_path_of(path: Path) -> Path:
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+####################################################################################################
+
+def _hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+####################################################################################################
+
+def _read_cache(cache_path: Path, stat: os.stat_result, path: Path):
+
+    """Return the cached data or :obj:`None` if the cache is missing or stale"""
+
+    touched = False
+    try:
+        with open(cache_path, 'rb') as fh:
+            # the header is pickled first so as to check it without loading the data
+            header = pickle.load(fh)
+            if header.get('version') != CACHE_VERSION:
+                return None
+            if (header['mtime'], header['size']) != (stat.st_mtime_ns, stat.st_size):
+                # the file was touched, check its content
+                with open(path, 'rb') as data_fh:
+                    if header['hash'] != _hash(data_fh.read()):
+                        return None
+                touched = True
+            data = pickle.load(fh)
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        return None
+    if touched:
+        # store the new stat so as to not hash the file at each load
+        _write_cache(cache_path, stat, header['hash'], data)
+    return data
+
+####################################################################################################
+
+def _write_cache(cache_path: Path, stat: os.stat_result, digest: str, data) -> None:
+
+    header = dict(
+        version=CACHE_VERSION,
+        mtime=stat.st_mtime_ns,
+        size=stat.st_size,
+        hash=digest,
+    )
+    tmp_path = cache_path.with_name(cache_path.name + '.{}'.format(os.getpid()))
+    try:
+        with open(tmp_path, 'wb') as fh:
+            pickle.dump(header, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        # atomic, concurrent processes can write the cache
+        os.replace(tmp_path, cache_path)
+    except OSError as exception:
+        _module_logger.debug('Cannot write cache {}: {}'.format(cache_path, exception))
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+####################################################################################################
+
+def load_yaml(path: str | Path, use_cache: bool = True):
+
+    """Load a YAML file using the C loader if available and a binary cache"""
+
+    path = Path(path)
+    stat = path.stat()
+    cache_path = cache_path_of(path)
+
+    if use_cache:
+        data = _read_cache(cache_path, stat, path)
+        if data is not None:
+            return data
+
+    _module_logger.info('Load {}'.format(path))
+    with open(path, 'rb') as fh:
+        content = fh.read()
+    data = yaml.load(content, Loader=SafeLoader)
+    if use_cache:
+        _write_cache(cache_path, stat, _hash(content), data)
+    return data
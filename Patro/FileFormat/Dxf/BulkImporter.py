@@ -0,0 +1,391 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2017 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+"""Module to import large DXF files.
+
+:class:`DxfImporter` creates one primitive per entity, which results in a soup of unconnected
+items.  :class:`DxfBulkImporter` loads the entities in NumPy arrays, welds the end points which are
+closer than a tolerance and reconstructs the contours, i.e. the pieces of a digitised pattern.
+
+An edge is a chain of vertexes with a bulge for each span, cf. DXF LWPOLYLINE: a line is an edge
+with a zero bulge and an arc is an edge with a bulge equal to the tangent of a quarter of the arc
+angle.
+
+"""
+
+####################################################################################################
+
+__all__ = ['DxfBulkImporter', 'weld_points']
+
+####################################################################################################
+
+import logging
+import math
+
+import numpy as np
+
+import ezdxf # Python packahe to read/write DXF
+from ezdxf.addons import iterdxf
+
+from Patro.GeometryEngine.Conic import Circle2D
+from Patro.GeometryEngine.Path import Path2D
+from Patro.GeometryEngine.Polygon import Polygon2D
+from Patro.GeometryEngine.Polyline import Polyline2D
+from Patro.GeometryEngine.Vector import Vector2D
+
+####################################################################################################
+
+_module_logger = logging.getLogger(__name__)
+
+####################################################################################################
+
+def weld_points(points, tolerance):
+
+    """Return an array of vertex indexes for an array of points, such that points closer than
+    *tolerance* share the same vertex.
+
+    Points are hashed on a grid whose cell size is the tolerance, thus each point is only compared
+    to the points of its cell and of the adjacent cells.  Welding is transitive, i.e. a chain of
+    close points share the same vertex.
+
+    """
+
+    points = np.asarray(points, dtype=np.float64)
+    number_of_points = len(points)
+    if not number_of_points:
+        return np.zeros(0, dtype=np.int64)
+
+    # hash the cells, with a margin for the neighbours
+    cells = np.floor(points / tolerance).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    width = int(cells[:,1].max()) + 2
+    keys = cells[:,0] * width + cells[:,1]
+
+    order = np.argsort(keys, kind='stable')
+    cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    sorted_points = points[order]
+    point_cells = np.repeat(np.arange(len(cell_keys)), counts)
+
+    # find the pairs of close points in the same or an adjacent cell
+    tolerance2 = tolerance**2
+    pairs = []
+    for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1), (1, -1)):
+        neighbour_keys = cell_keys + dx * width + dy
+        neighbours = np.minimum(np.searchsorted(cell_keys, neighbour_keys), len(cell_keys) - 1)
+        found = cell_keys[neighbours] == neighbour_keys
+        point_neighbours = neighbours[point_cells]
+        number_of_candidates = np.where(found[point_cells], counts[point_neighbours], 0)
+        first_points = np.repeat(np.arange(number_of_points), number_of_candidates)
+        shifts = np.arange(len(first_points)) - np.repeat(np.cumsum(number_of_candidates) - number_of_candidates,
+                                                          number_of_candidates)
+        second_points = np.repeat(starts[point_neighbours], number_of_candidates) + shifts
+        if dx == 0 and dy == 0:
+            mask = first_points < second_points
+            first_points, second_points = first_points[mask], second_points[mask]
+        deltas = sorted_points[first_points] - sorted_points[second_points]
+        close = np.sum(deltas**2, axis=1) <= tolerance2
+        pairs.append(np.stack((first_points[close], second_points[close]), axis=1))
+    pairs = order[np.concatenate(pairs)]
+
+    # union-find on points
+    parent = list(range(number_of_points))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs.tolist():
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    roots = np.array([find(i) for i in range(number_of_points)], dtype=np.int64)
+    _, vertexes = np.unique(roots, return_inverse=True)
+    return vertexes.reshape(-1)
+
+####################################################################################################
+
+class DxfBulkImporter:
+
+    """Class to implement a bulk DXF importer.
+
+    Entities are loaded in arrays:
+
+    * :attr:`lines` is an array of *x0, y0, x1, y1*,
+    * :attr:`arcs` is an array of *center x, center y, radius, start angle, end angle*,
+    * :attr:`circles` is an array of *center x, center y, radius*,
+    * :attr:`polylines` is a list of (*x, y, bulge* array, closed) for LWPOLYLINE, and flattened
+      SPLINE and ELLIPSE.
+
+    The reconstructed geometry is available in :attr:`contours` and :attr:`open_paths`.  If
+    *streaming* is set, entities are read using the ezdxf iterdxf add-on, thus the drawing is never
+    loaded in memory.
+
+    """
+
+    _logger = _module_logger.getChild('DxfBulkImporter')
+
+    ##############################################
+
+    def __init__(self, path, tolerance=1e-3, streaming=False):
+
+        self._path = str(path)
+        self._tolerance = float(tolerance)
+
+        self._contours = []
+        self._open_paths = []
+
+        self._read(streaming)
+        self._reconstruct()
+
+    ##############################################
+
+    @property
+    def tolerance(self):
+        return self._tolerance
+
+    @property
+    def lines(self):
+        return self._lines
+
+    @property
+    def arcs(self):
+        return self._arcs
+
+    @property
+    def circles(self):
+        return self._circles
+
+    @property
+    def polylines(self):
+        return self._polylines
+
+    @property
+    def contours(self):
+        return self._contours
+
+    @property
+    def open_paths(self):
+        return self._open_paths
+
+    ##############################################
+
+    def __len__(self):
+        return len(self._contours) + len(self._open_paths)
+
+    def __iter__(self):
+        yield from self._contours
+        yield from self._open_paths
+
+    ##############################################
+
+    def _iter_entities(self, streaming):
+        if streaming:
+            return iterdxf.modelspace(self._path)
+        else:
+            return iter(ezdxf.readfile(self._path).modelspace())
+
+    ##############################################
+
+    def _read(self, streaming):
+
+        lines = []
+        arcs = []
+        circles = []
+        polylines = []
+
+        for item in self._iter_entities(streaming):
+            dxf_type = item.dxftype()
+            item_dxf = item.dxf
+            if dxf_type == 'LINE':
+                start, end = item_dxf.start, item_dxf.end
+                lines.append((start[0], start[1], end[0], end[1]))
+            elif dxf_type == 'ARC':
+                center = item_dxf.center
+                arcs.append((center[0], center[1], item_dxf.radius, item_dxf.start_angle, item_dxf.end_angle))
+            elif dxf_type == 'CIRCLE':
+                center = item_dxf.center
+                circles.append((center[0], center[1], item_dxf.radius))
+            elif dxf_type == 'LWPOLYLINE':
+                points = np.array(item.get_points('xyb'), dtype=np.float64)
+                polylines.append((points, bool(item.closed)))
+            elif dxf_type in ('SPLINE', 'ELLIPSE'):
+                points = np.array([(point.x, point.y) for point in item.flattening(self._tolerance)], dtype=np.float64)
+                points = np.hstack((points, np.zeros((len(points), 1))))
+                closed = np.sum((points[0,:2] - points[-1,:2])**2) <= self._tolerance**2
+                if closed:
+                    points = points[:-1]
+                polylines.append((points, bool(closed)))
+            # else skip
+
+        self._lines = np.array(lines, dtype=np.float64).reshape(-1, 4)
+        self._arcs = np.array(arcs, dtype=np.float64).reshape(-1, 5)
+        self._circles = np.array(circles, dtype=np.float64).reshape(-1, 3)
+        self._polylines = polylines
+        self._logger.info('Read {} lines, {} arcs, {} circles, {} polylines'.format(
+            len(self._lines), len(self._arcs), len(self._circles), len(self._polylines)))
+
+    ##############################################
+
+    def _two_point_edges(self):
+
+        """Return an array of *x0, y0, x1, y1, bulge* for lines and arcs"""
+
+        lines = np.hstack((self._lines, np.zeros((len(self._lines), 1))))
+
+        arcs = self._arcs
+        center = arcs[:,:2]
+        radius = arcs[:,2:3]
+        start_angle = np.radians(arcs[:,3])
+        stop_angle = np.radians(arcs[:,4])
+        # DXF arcs are counterclockwise
+        sweep = np.mod(stop_angle - start_angle, 2*math.pi)
+        start = center + radius * np.column_stack((np.cos(start_angle), np.sin(start_angle)))
+        stop = center + radius * np.column_stack((np.cos(stop_angle), np.sin(stop_angle)))
+        bulge = np.tan(sweep / 4)
+        arcs = np.column_stack((start, stop, bulge))
+
+        return np.vstack((lines, arcs))
+
+    ##############################################
+
+    def _reconstruct(self):
+
+        for x, y, radius in self._circles.tolist():
+            self._contours.append(Circle2D(Vector2D(x, y), radius))
+
+        # Edges are two point edges followed by open polylines
+        two_point_edges = self._two_point_edges()
+        open_polylines = []
+        for points, closed in self._polylines:
+            if closed:
+                self._contours.append(self._to_geometry(points[:,:2].tolist(), points[:,2].tolist(), True))
+            else:
+                open_polylines.append(points)
+        number_of_two_point_edges = len(two_point_edges)
+        number_of_edges = number_of_two_point_edges + len(open_polylines)
+        if not number_of_edges:
+            return
+
+        # Weld end points
+        end_points = np.vstack([two_point_edges[:,:2], two_point_edges[:,2:4]] +
+                               [polyline[[0,-1],:2] for polyline in open_polylines])
+        vertexes = weld_points(end_points, self._tolerance)
+        start_vertexes = np.concatenate((vertexes[:number_of_two_point_edges],
+                                         vertexes[2*number_of_two_point_edges::2]))
+        stop_vertexes = np.concatenate((vertexes[number_of_two_point_edges:2*number_of_two_point_edges],
+                                        vertexes[2*number_of_two_point_edges+1::2]))
+        start_vertexes = start_vertexes.tolist()
+        stop_vertexes = stop_vertexes.tolist()
+
+        incidences = {}
+        for edge in range(number_of_edges):
+            incidences.setdefault(start_vertexes[edge], []).append(edge)
+            incidences.setdefault(stop_vertexes[edge], []).append(edge)
+
+        two_point_edges = two_point_edges.tolist()
+        def edge_data(edge, reverse):
+            if edge < number_of_two_point_edges:
+                x0, y0, x1, y1, bulge = two_point_edges[edge]
+                points, bulges = [(x0, y0), (x1, y1)], [bulge, 0]
+            else:
+                polyline = open_polylines[edge - number_of_two_point_edges]
+                points, bulges = polyline[:,:2].tolist(), polyline[:,2].tolist()
+            if reverse:
+                # the bulge of a span is stored on its first vertex
+                points = points[::-1]
+                bulges = [-bulge for bulge in bulges[-2::-1]] + [0]
+            return points, bulges
+
+        visited = [False] * number_of_edges
+        def walk(edge, vertex):
+            # Follow a chain of edges starting at vertex until a branch, an end or a loop
+            start_vertex = vertex
+            points, bulges = [], []
+            while True:
+                visited[edge] = True
+                reverse = start_vertexes[edge] != vertex
+                edge_points, edge_bulges = edge_data(edge, reverse)
+                if points:
+                    # drop the duplicated junction point
+                    points.pop()
+                    bulges.pop()
+                points += edge_points
+                bulges += edge_bulges
+                vertex = start_vertexes[edge] if reverse else stop_vertexes[edge]
+                if vertex == start_vertex:
+                    points.pop()
+                    return points, bulges[:len(points)], True
+                next_edges = [next_edge for next_edge in incidences[vertex] if not visited[next_edge]]
+                if len(incidences[vertex]) != 2 or not next_edges:
+                    return points, bulges, False
+                edge = next_edges[0]
+
+        # Start from the ends and the branches, then the remaining edges form loops
+        for vertex, edges in incidences.items():
+            if len(edges) != 2:
+                for edge in edges:
+                    if not visited[edge]:
+                        self._add_chain(*walk(edge, vertex))
+        for edge in range(number_of_edges):
+            if not visited[edge]:
+                self._add_chain(*walk(edge, start_vertexes[edge]))
+
+        self._logger.info('Found {} contours and {} open paths'.format(len(self._contours), len(self._open_paths)))
+
+    ##############################################
+
+    def _add_chain(self, points, bulges, closed):
+        geometry = self._to_geometry(points, bulges, closed)
+        if closed:
+            self._contours.append(geometry)
+        else:
+            self._open_paths.append(geometry)
+
+    ##############################################
+
+    @staticmethod
+    def _to_geometry(points, bulges, closed):
+
+        """Return a polygon, a polyline or a path for a chain of vertexes"""
+
+        vertexes = [Vector2D(x, y) for x, y in points]
+        if not any(bulges):
+            if closed:
+                return Polygon2D(*vertexes)
+            else:
+                return Polyline2D(*vertexes)
+
+        path = Path2D(vertexes[0])
+        number_of_spans = len(vertexes) if closed else len(vertexes) - 1
+        for i in range(number_of_spans):
+            point = vertexes[(i + 1) % len(vertexes)]
+            bulge = bulges[i]
+            if bulge:
+                # radius = chord * (1 + bulge**2) / (4 * |bulge|)
+                chord = (point - vertexes[i]).magnitude
+                radius = chord * (1 + bulge**2) / (4 * abs(bulge))
+                path.arc_to(point, radius, radius, 0, abs(bulge) > 1, bulge > 0, absolute=True)
+            elif closed and i == number_of_spans - 1:
+                path.close()
+            else:
+                path.line_to(point, absolute=True)
+        return path
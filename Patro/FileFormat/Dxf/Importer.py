@@ -69,7 +69,7 @@ class DxfImporter:
 
     @staticmethod
     def _to_vector(point):
-        return Vector2D(point[:2])
+        return Vector2D(point[0], point[1])
 
     @classmethod
     def _to_vectors(cls, points):
@@ -32,6 +32,9 @@ Import Algorithm:
 
 ####################################################################################################
 
+import contextlib
+import copy
+import gzip
 import logging
 
 from lxml import etree
@@ -50,11 +53,26 @@ _module_logger = logging.getLogger(__name__)
 
 class RenderState:
 
+    """Class to store the presentation attributes which apply to an item.
+
+    A render state is shared by the items of a group, thus it must be considered as immutable:
+    :meth:`merge` returns a new state if an item overrides a property, else the state itself.
+
+    """
+
     # Fixme: convert type !!!
 
     STATES = [name for name in SvgFormat.PresentationAttributes.__dict__.keys()
               if not name.startswith('_')]
 
+    STYLE_CACHE_SIZE = 4096
+    MERGE_CACHE_SIZE = 256
+
+    # raw style string -> tuple of (state, value)
+    _style_cache = {}
+    # item class -> states defined by the class
+    _item_states = {}
+
     ##############################################
 
     @classmethod
@@ -79,6 +97,61 @@ class RenderState:
 
     ##############################################
 
+    @classmethod
+    def parse_style(cls, style):
+
+        """Parse a style string and return a tuple of (state, value).
+
+        The result is cached using the string as key, thus similarly styled items share the same
+        values.
+
+        """
+
+        states = cls._style_cache.get(style)
+        if states is None:
+            states = []
+            for pair in style.split(';'):
+                if not pair.strip():
+                    continue
+                state, value = [x.strip() for x in pair.split(':', 1)]
+                state = state.replace('-', '_')
+                if state == 'transform':
+                    value = SvgFormat.TransformAttribute.from_xml(value)
+                else:
+                    value = cls.to_python(value)
+                states.append((state, value))
+            states = tuple(states)
+            if len(cls._style_cache) >= cls.STYLE_CACHE_SIZE:
+                cls._style_cache.clear()
+            cls._style_cache[style] = states
+        return states
+
+    ##############################################
+
+    @classmethod
+    def states_of(cls, item_cls):
+        """Return the states defined by an item class"""
+        states = cls._item_states.get(item_cls)
+        if states is None:
+            states = tuple(state for state in cls.STATES
+                           if state != 'style' and hasattr(item_cls, state))
+            cls._item_states[item_cls] = states
+        return states
+
+    ##############################################
+
+    @staticmethod
+    def compose_transform(transform, item_transform):
+        # Transform matrix is composed from top to item thus left to right
+        if item_transform.is_identity:
+            return transform
+        elif transform.is_identity:
+            return item_transform
+        else:
+            return transform * item_transform
+
+    ##############################################
+
     def __init__(self, item=None):
 
         # Init from item else use default value
@@ -88,11 +161,14 @@ class RenderState:
             else:
                 value = getattr(SvgFormat.PresentationAttributes, state)
             setattr(self, state, value)
+        self._merge_cache = {}
 
     ##############################################
 
     def clone(self):
-        return self.__class__(self)
+        obj = copy.copy(self)
+        obj._merge_cache = {}
+        return obj
 
     ##############################################
 
@@ -112,31 +188,64 @@ class RenderState:
 
     def merge(self, item):
 
-        for state in self.STATES:
-            if hasattr(item, state):
-                value = getattr(item, state)
-                if state == 'transform':
-                    if value is not None:
-                        # Transform matrix is composed from top to item
-                        # thus left to right
-                        self.transform = self.transform * value
-                elif state == 'style':
-                    pass
-                else:
-                    setattr(self, state, self.to_python(value))
+        """Return the state of an item or a group in this state.
+
+        Properties which are not defined by the item are inherited.  The state is not modified.
+
+        """
+
+        changes = {}
+        transforms = []
+        for state in self.states_of(item.__class__):
+            value = getattr(item, state)
+            if value is None or value == 'inherit':
+                continue
+            if state == 'transform':
+                transforms.append(value)
+            else:
+                changes[state] = self.to_python(value)
 
-        # Merge style
         style = getattr(item, 'style', None)
-        if style is not None:
-            for pair in style.split(';'):
-                state, value = [x.strip() for x in pair.split(':')]
-                state = state.replace('-', '_')
+        if style:
+            for state, value in self.parse_style(style):
                 if state == 'transform':
-                    self.transform = self.transform * value
+                    transforms.append(value)
                 else:
-                    setattr(self, state, self.to_python(value))
+                    changes[state] = value
+
+        if transforms:
+            transform = self.transform
+            for item_transform in transforms:
+                transform = self.compose_transform(transform, item_transform)
+            if transform is not self.transform:
+                changes['transform'] = transform
+            return self._new_state(changes)
+
+        # Items having the same style share their state
+        key = tuple(changes.items())
+        try:
+            state = self._merge_cache.get(key)
+        except TypeError:
+            # unhashable value
+            return self._new_state(changes)
+        if state is None:
+            state = self._new_state(changes)
+            if len(self._merge_cache) >= self.MERGE_CACHE_SIZE:
+                self._merge_cache.clear()
+            self._merge_cache[key] = state
+        return state
 
-        return self
+    ##############################################
+
+    def _new_state(self, changes):
+        changes = {state:value for state, value in changes.items()
+                   if getattr(self, state, None) != value}
+        if not changes:
+            return self
+        obj = self.clone()
+        for state, value in changes.items():
+            setattr(obj, state, value)
+        return obj
 
     ##############################################
 
@@ -161,10 +270,9 @@ class RenderStateStack:
 
     ##############################################
 
-    def push(self, kwargs):
-        new_state = self.state.clone()
-        new_state.merge(kwargs)
-        self._stack.append(new_state)
+    def push(self, group):
+        # the state and thus the transform of a group is computed once
+        self._stack.append(self.state.merge(group))
 
     ##############################################
 
@@ -282,6 +390,7 @@ class SvgDispatcher:
         # self._logger.info('State:\n' + str(self.state))
 
         self.on_root(element)
+        self._state_stack.pop()
 
     ##############################################
 
@@ -291,6 +400,54 @@ class SvgDispatcher:
         # self._logger.info('Item: {}\n{}'.format(item.id, item))
         self._reader.on_graphic_item(item)
 
+    ##############################################
+
+    @staticmethod
+    def _clear_element(element):
+        # Free the element and the previous siblings which are already processed
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+    ##############################################
+
+    def iter_events(self, events):
+
+        """Dispatch the (event, element) pairs returned by :meth:`XmlFileMixin.iterparse` and yield
+        (item, render state) for each graphic item.
+
+        Events must be 'start' and 'end'.  A graphic item is processed when it is closed, then the
+        element is cleared, thus the tree is never fully loaded in memory.  Like :meth:`on_root`,
+        the elements which are not a group or a graphic item are skipped with their children.
+
+        """
+
+        skip_depth = 0
+        for event, element in events:
+            tag = self.element_tag(element)
+            if event == 'start':
+                if skip_depth:
+                    skip_depth += 1
+                elif tag == 'svg' and element.getparent() is None:
+                    self._reader.on_svg_root(self.from_xml(element))
+                elif tag == 'g':
+                    group = self.from_xml(element)
+                    self._reader.on_group(group)
+                    self._state_stack.push(group)
+                elif tag not in self.__TAGS_TO_READ__:
+                    skip_depth = 1
+            else:
+                if skip_depth:
+                    skip_depth -= 1
+                elif tag == 'g':
+                    self._state_stack.pop()
+                elif tag in self.__TAGS_TO_READ__:
+                    item = self.from_xml(element)
+                    yield item, self.state.merge(item)
+                self._clear_element(element)
+
 ####################################################################################################
 
 class SvgFileMixin:
@@ -300,6 +457,30 @@ class SvgFileMixin:
     SVG_xmlns_xlink = 'http://www.w3.org/1999/xlink'
     SVG_version = '1.1'
 
+    COMMENT = 'Pattern created with Patro (https://github.com/FabriceSalvaire/Patro)'
+
+    ##############################################
+
+    @classmethod
+    def _nsmap(cls):
+        return {
+            None: cls.SVG_xmlns,
+            'xlink': cls.SVG_xmlns_xlink,
+        }
+
+    ##############################################
+
+    @classmethod
+    def _root_attributes(cls, paper):
+        # Set document dimension and user space unit to mm
+        # see https://mpetroff.net/2013/08/analysis-of-svg-units
+        return {
+            'version': cls.SVG_version,
+            'width': '{:.3f}mm'.format(paper.width),
+            'height': '{:.3f}mm'.format(paper.height),
+            'viewBox': '0 0 {:.3f} {:.3f}'.format(paper.width, paper.height),
+        }
+
 ####################################################################################################
 
 class SvgFileInternal(XmlFileMixin, SvgFileMixin):
@@ -312,14 +493,20 @@ class SvgFileInternal(XmlFileMixin, SvgFileMixin):
 
     ##############################################
 
-    def __init__(self, path, data=None):
+    def __init__(self, path, data=None, streaming=False):
+
+        """If *streaming* is set, the file is not read at initialisation, and the geometry must be
+        retrieved using :meth:`iter_geometry`.
+
+        """
 
         super().__init__(path, data)
 
         # Fixme: API
         #  purpose of dispatcher, where must be state ???
         self._dispatcher = self.__dispatcher_cls__(self)
-        self._read()
+        if not streaming:
+            self._read()
 
     ##############################################
 
@@ -342,6 +529,34 @@ class SvgFileInternal(XmlFileMixin, SvgFileMixin):
 
     ##############################################
 
+    def iter_items(self):
+
+        """Read incrementally the file and yield (item, render state) for each graphic item.
+
+        The memory usage doesn't depend on the file size.
+
+        """
+
+        self._dispatcher.reset()
+        events = self.iterparse(events=('start', 'end'))
+        yield from self._dispatcher.iter_events(events)
+
+    ##############################################
+
+    def iter_geometry(self):
+
+        """Read incrementally the file and yield the geometry of each graphic item, the transformation
+        of the item and its groups is applied.
+
+        """
+
+        for item, state in self.iter_items():
+            geometry = item.geometry
+            if geometry is not None:
+                yield geometry.transform(state.transform)
+
+    ##############################################
+
     @property
     def view_box(self):
         return self._view_box
@@ -372,7 +587,7 @@ class SvgFileInternal(XmlFileMixin, SvgFileMixin):
     def on_graphic_item(self, item):
 
         self._logger.info('Item: {}\n{}'.format(item.id, item))
-        state = self._dispatcher.state.clone().merge(item)
+        state = self._dispatcher.state.merge(item)
         self._logger.info('Item State:\n' + str(state))
 
 ####################################################################################################
@@ -383,8 +598,6 @@ class SvgFileWriter(SvgFileMixin):
 
     _logger = _module_logger.getChild('SvgFileWriter')
 
-    COMMENT = 'Pattern created with Patro (https://github.com/FabriceSalvaire/Patro)'
-
     ##############################################
 
     def __init__(self, path, paper, root_tree, transformation=None):
@@ -398,18 +611,7 @@ class SvgFileWriter(SvgFileMixin):
     @classmethod
     def _new_root(cls, paper):
 
-        nsmap = {
-            None: cls.SVG_xmlns,
-            'xlink': cls.SVG_xmlns_xlink,
-        }
-        root = etree.Element('svg', nsmap=nsmap)
-        attrib = root.attrib
-        attrib['version'] = cls.SVG_version
-        # Set document dimension and user space unit to mm
-        # see https://mpetroff.net/2013/08/analysis-of-svg-units
-        attrib['width'] = '{:.3f}mm'.format(paper.width)
-        attrib['height'] = '{:.3f}mm'.format(paper.height)
-        attrib['viewBox'] = '0 0 {:.3f} {:.3f}'.format(paper.width, paper.height)
+        root = etree.Element('svg', cls._root_attributes(paper), nsmap=cls._nsmap())
 
         # Fixme: from conf
         root.append(etree.Comment(cls.COMMENT))
@@ -444,6 +646,201 @@ class SvgFileWriter(SvgFileMixin):
 
 ####################################################################################################
 
+class SvgStreamWriter(SvgFileMixin):
+
+    """Class to write incrementally a SVG file.
+
+    Elements are written to the file as soon as they are added using :class:`lxml.etree.xmlfile`.
+    Consecutive lines and curves having the same style are merged in a single path element.
+    Coordinates are rounded to *precision* digits and written in a compact form.  The file is
+    gzipped if *compress* is set or if the path has a ``.svgz`` suffix.
+
+    Usage::
+
+        with SvgStreamWriter(path, paper) as writer:
+            writer.write(SvgFormat.Text(x=0, y=0, text='foo'))
+            writer.line(point1, point2, stroke='black')
+
+    """
+
+    _logger = _module_logger.getChild('SvgStreamWriter')
+
+    # to bound the memory usage, a path is flushed after this number of commands
+    MAX_PATH_COMMANDS = 10000
+
+    ##############################################
+
+    @staticmethod
+    def format_number(value, precision):
+
+        """Format a number using the shortest form, e.g. 0.500 -> .5"""
+
+        string = '{:.{}f}'.format(value, precision)
+        if '.' in string:
+            string = string.rstrip('0').rstrip('.')
+        if string.startswith('0.'):
+            string = string[1:]
+        elif string.startswith('-0.'):
+            string = '-' + string[2:]
+        elif string == '-0':
+            string = '0'
+        return string
+
+    ##############################################
+
+    def __init__(self, path, paper, transformation=None, precision=3, compress=None):
+
+        self._path = str(path)
+        self._paper = paper
+        self._transformation = transformation
+        self._precision = int(precision)
+        if compress is None:
+            compress = self._path.endswith('.svgz')
+        self._compress = compress
+
+        self._xml_file = None
+        self._exit_stack = None
+        self._reset_path()
+
+    ##############################################
+
+    @property
+    def precision(self):
+        return self._precision
+
+    ##############################################
+
+    def __enter__(self):
+
+        with contextlib.ExitStack() as stack:
+            if self._compress:
+                output = stack.enter_context(gzip.open(self._path, 'wb'))
+            else:
+                output = self._path
+            xml_file = stack.enter_context(etree.xmlfile(output, encoding='utf-8'))
+            xml_file.write_declaration(standalone=False)
+            xml_file.write_doctype(self.SVG_DOCTYPE)
+            stack.enter_context(xml_file.element('svg', self._root_attributes(self._paper), nsmap=self._nsmap()))
+            xml_file.write(etree.Comment(self.COMMENT), '\n')
+            if self._transformation:
+                transform = SvgFormat.TransformAttribute.to_xml(self._transformation)
+                stack.enter_context(xml_file.element('g', transform=transform))
+            self._exit_stack = stack.pop_all()
+
+        self._xml_file = xml_file
+        return self
+
+    ##############################################
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self._xml_file = None
+            self._reset_path()
+            exit_stack, self._exit_stack = self._exit_stack, None
+            exit_stack.__exit__(exc_type, exc_value, traceback)
+
+    ##############################################
+
+    def write(self, element):
+        """Write a :mod:`SvgFormat` element"""
+        self.flush()
+        self._xml_file.write(element.to_xml(), '\n')
+
+    ##############################################
+
+    def _reset_path(self):
+        self._path_style = None
+        self._path_data = []
+        self._number_of_commands = 0
+        self._current_point = None
+        self._current_command = None
+        self._last_number = None
+
+    ##############################################
+
+    def flush(self):
+
+        """Write the pending path"""
+
+        if self._path_data:
+            # path data is passed as string to to_xml to skip the Path2D conversion
+            path = SvgFormat.Path(fill='none', **self._path_style)
+            self._xml_file.write(path.to_xml(d=''.join(self._path_data)), '\n')
+        self._reset_path()
+
+    ##############################################
+
+    def _append_numbers(self, numbers):
+
+        # A separator is not required before a minus sign or a dot following a decimal number
+        data = self._path_data
+        last_number = self._last_number
+        for number in numbers:
+            if last_number is not None and not (
+                    number[0] == '-' or (number[0] == '.' and '.' in last_number)):
+                data.append(' ')
+            data.append(number)
+            last_number = number
+        self._last_number = last_number
+
+    ##############################################
+
+    def _append_command(self, command, points):
+
+        if command != self._current_command:
+            self._path_data.append(command)
+            self._current_command = command
+            self._last_number = None
+        self._append_numbers([number for point in points for number in point])
+        self._number_of_commands += 1
+
+    ##############################################
+
+    def _add_to_path(self, command, points, style):
+
+        precision = self._precision
+        format_number = self.format_number
+        points = [(format_number(point[0], precision), format_number(point[1], precision))
+                  for point in points]
+
+        if style != self._path_style or self._number_of_commands >= self.MAX_PATH_COMMANDS:
+            self.flush()
+            self._path_style = style
+
+        start_point, *points = points
+        if start_point != self._current_point:
+            # a move to is never repeated, else it would be interpreted as a line to
+            self._current_command = None
+            self._append_command('M', (start_point,))
+        self._append_command(command, points)
+        self._current_point = points[-1]
+
+    ##############################################
+
+    def line(self, point1, point2, **style):
+        self._add_to_path('L', (point1, point2), style)
+
+    ##############################################
+
+    def polyline(self, points, **style):
+        self._add_to_path('L', points, style)
+
+    ##############################################
+
+    def quadratic(self, point1, point2, point3, **style):
+        self._add_to_path('Q', (point1, point2, point3), style)
+
+    ##############################################
+
+    def cubic(self, point1, point2, point3, point4, **style):
+        self._add_to_path('C', (point1, point2, point3, point4), style)
+
+####################################################################################################
+
 class SvgFile:
 
     ##############################################
@@ -67,6 +67,9 @@ __all__ = [
 ####################################################################################################
 
 import logging
+import re
+
+import numpy as np
 
 from Patro.Common.Xml.Objectivity import (
     # BoolAttribute,
@@ -78,7 +81,11 @@ from Patro.Common.Xml.Objectivity import (
 )
 
 # Fixme: should we mix SVG format and ... ???
+from Patro.GeometryEngine.Conic import Circle2D, Ellipse2D
 from Patro.GeometryEngine.Path import Path2D
+from Patro.GeometryEngine.Polygon import Polygon2D
+from Patro.GeometryEngine.Polyline import Polyline2D
+from Patro.GeometryEngine.Segment import Segment2D
 from Patro.GeometryEngine.Transformation import AffineTransformation2D
 from Patro.GeometryEngine.Vector import Vector2D
 
@@ -434,28 +441,52 @@ class TransformAttribute(StringAttribute):
         'translate'
     )
 
+    CACHE_SIZE = 4096
+
+    # raw string -> AffineTransformation2D
+    _cache = {}
+
     ##############################################
 
     @classmethod
     def from_xml(cls, value):
 
+        """Return the transformation for a transform attribute.
+
+        The transformations are cached using the string as key, thus they are shared and must not
+        be modified.
+
+        """
+
         if isinstance(value, AffineTransformation2D):
             # Python value
             return value
-        else:
-            transforms = []
-            for transform in split_space_list(value):
-                pos0 = value.find('(')
-                pos1 = value.find(')')
-                if pos0 == -1 or pos1 != len(value) -1:
-                    raise ValueError
-                transform_type = value[:pos0]
-                values = [float(x) for x in value[pos0+1:-1].split(',')]
-                transforms.append((transform_type, values))
-                # Fixme:
-
-            # return transforms
-            return cls.to_python(transforms, concat=True)
+        transform = cls._cache.get(value)
+        if transform is None:
+            transform = cls._from_xml(value)
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.clear()
+            cls._cache[value] = transform
+        return transform
+
+    ##############################################
+
+    @classmethod
+    def _from_xml(cls, value):
+
+        transforms = []
+        for transform in split_space_list(value):
+            pos0 = value.find('(')
+            pos1 = value.find(')')
+            if pos0 == -1 or pos1 != len(value) -1:
+                raise ValueError
+            transform_type = value[:pos0]
+            values = [float(x) for x in value[pos0+1:-1].split(',')]
+            transforms.append((transform_type, values))
+            # Fixme:
+
+        # return transforms
+        return cls.to_python(transforms, concat=True)
 
     ##############################################
 
@@ -680,6 +711,12 @@ class Circle(CenterMixin, PathMixin, SvgElementMixin, XmlObjectAdaptator):
         FloatAttribute('r'), # circle's radius. Required.
     )
 
+    ##############################################
+
+    @property
+    def geometry(self):
+        return Circle2D(Vector2D(self.cx, self.cy), self.r)
+
 ####################################################################################################
 
 class ClipPath(XmlObjectAdaptator):
@@ -749,6 +786,12 @@ class Ellipse(CenterMixin, PathMixin, StyleMixin, XmlObjectAdaptator):
         FloatAttribute('ry'),
     )
 
+    ##############################################
+
+    @property
+    def geometry(self):
+        return Ellipse2D(Vector2D(self.cx, self.cy), self.rx, self.ry)
+
 ####################################################################################################
 
 class FeBlend(XmlObjectAdaptator):
@@ -805,6 +848,12 @@ class Line(PathMixin, SvgElementMixin, XmlObjectAdaptator):
         FloatAttribute('y2'),
     )
 
+    ##############################################
+
+    @property
+    def geometry(self):
+        return Segment2D(Vector2D(self.x1, self.y1), Vector2D(self.x2, self.y2))
+
 ####################################################################################################
 
 class LinearGradient(IdMixin, XmlObjectAdaptator):
@@ -944,64 +993,184 @@ class PathDataAttribute(StringAttribute):
         'c':6,
         's':4,
         'q':4,
-        't':3,
+        't':2,
         'a':7,
         'z':0,
         }
 
     COMMANDS = ''.join(NUMBER_OF_ARGS.keys())
 
+    # A command letter followed by its arguments
+    COMMAND_RE = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])([^MmLlHhVvCcSsQqTtAaZz]*)')
+    # Number grammar, e.g. "10-5" is 10 -5 and ".5.5" is .5 .5
+    NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+    SEPARATOR_RE = re.compile(r'[\s,]*')
+
     _logger = _module_logger.getChild('PathDataAttribute')
 
     ##############################################
 
     @classmethod
     def from_xml(cls, svg_path):
-
         # cls._logger.info('SVG path:\n'+ svg_path)
+        return cls.to_geometry(cls.iter_commands(svg_path))
 
-        # Replace comma separator by space
-        cleaned_svg_path = svg_path.replace(',', ' ')
-        # Add space after letter
-        data_path = ''
-        for c in cleaned_svg_path:
-            data_path += c
-            if c.isalpha:
-                data_path += ' '
-        # Convert float values
-        parts = []
-        for part in split_space_list(cleaned_svg_path):
-            if not(len(part) == 1 and part.isalpha()):
-                part = float(part)
-            parts.append(part)
-
-        commands = []
-        command = None # last command
-        number_of_args = None
-        i = 0
-        while i < len(parts):
-            part = parts[i]
-            if isinstance(part, str):
-                command = part
-                command_lower = command.lower()
-                if command_lower not in cls.COMMANDS:
-                    raise ValueError("Invalid path instruction: '{}' in\n{}".format(command, svg_path))
-                number_of_args = cls.NUMBER_OF_ARGS[command_lower]
-                i += 1 # move to first arg
-            # else repeated instruction
-            next_i = i + number_of_args
-            args = parts[i:next_i]
-            commands.append((command, args))
-            i = next_i
-            # for implicit line to
-            if command == 'm':
-                command = 'l'
-            elif command == 'M':
-                command = 'L'
-
-        # return commands
-        # Fixme: do later ???
-        return cls.to_geometry(commands)
+    ##############################################
+
+    @classmethod
+    def _parse_args(cls, svg_path, text):
+
+        # The numbers and the separators must cover the whole text, e.g. "1 - 2" and "2e" are invalid
+
+        args = []
+        position = 0
+        length = len(text)
+        while True:
+            position = cls.SEPARATOR_RE.match(text, position).end()
+            if position == length:
+                break
+            match = cls.NUMBER_RE.match(text, position)
+            if match is None:
+                raise ValueError("Invalid path data: '{}' in\n{}".format(text, svg_path))
+            args.append(float(match.group()))
+            position = match.end()
+        return args
+
+    ##############################################
+
+    @classmethod
+    def _parse_arc_args(cls, svg_path, text):
+
+        # Flags are a single digit and can be followed by a number without separator,
+        # e.g. "a25 25 0 1050 0" is a 25 25 0 1 0 50 0
+
+        args = []
+        position = 0
+        length = len(text)
+        while True:
+            position = cls.SEPARATOR_RE.match(text, position).end()
+            if position == length:
+                break
+            if len(args) % 7 in (3, 4):
+                flag = text[position]
+                if flag not in '01':
+                    raise ValueError("Invalid arc flag in path:\n{}".format(svg_path))
+                args.append(float(flag))
+                position += 1
+            else:
+                match = cls.NUMBER_RE.match(text, position)
+                if match is None:
+                    raise ValueError("Invalid number in path:\n{}".format(svg_path))
+                args.append(float(match.group()))
+                position = match.end()
+        return args
+
+    ##############################################
+
+    @classmethod
+    def iter_commands(cls, svg_path):
+
+        """Tokenize a path data string and yield ``(command, args)`` where *args* is a list of float.
+
+        Repeated commands are split, i.e. ``L 1 2 3 4`` yields ``('L', [1, 2])`` and
+        ``('L', [3, 4])``, and implicit line to after a move to are made explicit.
+
+        """
+
+        position = 0
+        for match in cls.COMMAND_RE.finditer(svg_path):
+            if svg_path[position:match.start()].strip():
+                raise ValueError("Invalid path data: '{}' in\n{}".format(
+                    svg_path[position:match.start()], svg_path))
+            position = match.end()
+
+            command, text = match.groups()
+            command_lower = command.lower()
+            number_of_args = cls.NUMBER_OF_ARGS[command_lower]
+            if command_lower == 'a':
+                args = cls._parse_arc_args(svg_path, text)
+            else:
+                args = cls._parse_args(svg_path, text)
+
+            if number_of_args == 0:
+                if args:
+                    raise ValueError("Path command {} doesn't take arguments in\n{}".format(command, svg_path))
+                yield command, args
+                continue
+            number_of_values = len(args)
+            if not number_of_values or number_of_values % number_of_args:
+                raise ValueError("Wrong number of arguments for path command {} in\n{}".format(command, svg_path))
+            for i in range(0, number_of_values, number_of_args):
+                yield command, args[i:i+number_of_args]
+                # for implicit line to
+                if command == 'm':
+                    command = 'l'
+                elif command == 'M':
+                    command = 'L'
+
+        if svg_path[position:].strip():
+            raise ValueError("Invalid path data: '{}' in\n{}".format(svg_path[position:], svg_path))
+
+    ##############################################
+
+    @classmethod
+    def polyline_coordinates(cls, svg_path):
+
+        """Fast path for paths made of straight lines.
+
+        Return a list of absolute coordinates arrays with shape (N, 2), one for each sub-path, a
+        closed sub-path repeats its first point.  Raise :obj:`ValueError` if the path contains a
+        curve.
+
+        """
+
+        polylines = []
+        coordinates = []
+        append = coordinates.append
+        start_x = start_y = x = y = 0.
+        for match in cls.COMMAND_RE.finditer(svg_path):
+            command, text = match.groups()
+            command_lower = command.lower()
+            if command_lower not in 'mlhvz':
+                raise ValueError('Path contains a curve')
+            values = cls._parse_args(svg_path, text)
+            relative = command == command_lower
+            if command_lower == 'z':
+                if values:
+                    raise ValueError("Path command {} doesn't take arguments in\n{}".format(command, svg_path))
+                x, y = start_x, start_y
+                append((x, y))
+                continue
+            if command_lower in 'ml':
+                if len(values) % 2 or not values:
+                    raise ValueError("Wrong number of arguments for path command {} in\n{}".format(command, svg_path))
+                if command_lower == 'm':
+                    if len(coordinates) > 1:
+                        polylines.append(np.array(coordinates))
+                    coordinates = []
+                    append = coordinates.append
+                for i in range(0, len(values), 2):
+                    if relative:
+                        x += values[i]
+                        y += values[i+1]
+                    else:
+                        x = values[i]
+                        y = values[i+1]
+                    append((x, y))
+                if command_lower == 'm':
+                    start_x, start_y = coordinates[0]
+            elif command_lower == 'h':
+                for value in values:
+                    x = x + value if relative else value
+                    append((x, y))
+            else: # v
+                for value in values:
+                    y = y + value if relative else value
+                    append((x, y))
+
+        if len(coordinates) > 1:
+            polylines.append(np.array(coordinates))
+        return polylines
 
     ##############################################
 
@@ -1050,18 +1219,18 @@ class PathDataAttribute(StringAttribute):
                     path.horizontal_to(*args, absolute=False)
                 elif command == 'H':
                     path.absolute_horizontal_to(*args)
-                elif command_lower == 'v':
-                    path.vertical_to(*args, absolute=absolute)
+                elif command == 'v':
+                    path.vertical_to(*args, absolute=False)
                 elif command == 'V':
                     path.absolute_vertical_to(*args)
                 elif command_lower == 'c':
                     path.cubic_to(*cls.as_vector(args), absolute=absolute)
                 elif command_lower == 's':
-                    path.stringed_quadratic_to(*cls.as_vector(args), absolute=absolute)
+                    path.stringed_cubic_to(*cls.as_vector(args), absolute=absolute)
                 elif command_lower == 'q':
                     path.quadratic_to(*cls.as_vector(args), absolute=absolute)
                 elif command_lower == 't':
-                    path.stringed_cubic_to(*cls.as_vector(args), absolute=absolute)
+                    path.stringed_quadratic_to(*cls.as_vector(args), absolute=absolute)
                 elif command_lower == 'a':
                     radius_x, radius_y, angle, large_arc, sweep, x, y = args
                     point = Vector2D(x, y)
@@ -1085,6 +1254,12 @@ class Path(PathMixin, SvgElementMixin, XmlObjectAdaptator):
         # this value
     )
 
+    ##############################################
+
+    @property
+    def geometry(self):
+        return self.path_data
+
 ####################################################################################################
 
 class Pattern(IdMixin, PositionMixin, SizeMixin, XmlObjectAdaptator):
@@ -1115,13 +1290,32 @@ class Polyline(PointsMixin, PathMixin, SvgElementMixin, XmlObjectAdaptator):
 
     __tag__ = 'polyline'
 
+    ##############################################
+
+    @property
+    def vertexes(self):
+        values = [float(x) for x in PathDataAttribute.NUMBER_RE.findall(self.points)]
+        return [Vector2D(values[i], values[i+1]) for i in range(0, len(values) -1, 2)]
+
+    ##############################################
+
+    @property
+    def geometry(self):
+        return Polyline2D(*self.vertexes)
+
 ####################################################################################################
 
 class Polygon(Polyline, XmlObjectAdaptator):
 
     """Defines any shape that consists of only straight lines"""
 
-    __tag__ = 'polyline'
+    __tag__ = 'polygon'
+
+    ##############################################
+
+    @property
+    def geometry(self):
+        return Polygon2D(*self.vertexes)
 
     # fill-rule="part of the FillStroke presentation attributes"
 
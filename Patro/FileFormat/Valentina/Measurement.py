@@ -106,11 +106,10 @@ class VitFileInternal(XmlFileMixin):
 
         elements = self.get_xpath_element(tree, 'body-measurements')
         for element in elements:
-             if element.tag == XmlMeasurement.__tag__:
-                 xml_measurement = XmlMeasurement(element)
-                 measurements.add(**xml_measurement.to_dict())
-             else:
+             if element.tag != XmlMeasurement.__tag__:
                  raise NotImplementedError
+        for xml_measurement in XmlMeasurement.from_xml_elements(elements):
+            measurements.add(**xml_measurement.to_dict())
 
 ####################################################################################################
 
@@ -29,6 +29,7 @@ from pathlib import Path
 
 from lxml import etree
 
+from Patro.Common.Profiler import profiler
 from Patro.Common.Xml.XmlFile import XmlFileMixin
 from Patro.Pattern.Pattern import Pattern
 from .Measurement import VitFile
@@ -56,6 +57,17 @@ VAL_VERSION = '0.7.10'
 
 ####################################################################################################
 
+def find_measurements_path(val_path, measurements_path):
+    """Return the path of a measurements file referenced in a val file"""
+    measurements_path = Path(measurements_path)
+    if not measurements_path.exists():
+        measurements_path = Path(val_path).parent.joinpath(measurements_path)
+    if not measurements_path.exists():
+        raise NameError("Cannot find {}".format(measurements_path))
+    return measurements_path
+
+####################################################################################################
+
 class Modeling:
 
     """Class to implement a modeling mapper."""
@@ -192,13 +204,18 @@ _detail_dispatcher = DetailDispatcher()
 
 class ValFileReaderInternal(XmlFileMixin):
 
-    """Class to read val file."""
+    """Class to read val file.
+
+    If *lazy* is set, a scope is only read and evaluated on first access, see
+    :meth:`PatternScope.sketch`.  If *scopes* is a list of names, the other scopes are skipped.
+
+    """
 
     _logger = _module_logger.getChild('ValFileReader')
 
     ##############################################
 
-    def __init__(self, path):
+    def __init__(self, path, lazy=False, scopes=None):
 
         XmlFileMixin.__init__(self, path)
 
@@ -206,6 +223,9 @@ class ValFileReaderInternal(XmlFileMixin):
         self.attribute = {}
         self.vit_file = None
         self.pattern = None
+        self._lazy = lazy
+        self._scope_filter = set(scopes) if scopes is not None else None
+        self._pieces = {} # scope name -> draw element
 
         self.read()
 
@@ -260,7 +280,30 @@ class ValFileReaderInternal(XmlFileMixin):
         self.pattern = Pattern(self.measurements, self.attribute['unit'])
 
         for piece in self.get_xpath_elements(self.root, 'draw'):
-            self.read_piece(piece)
+            piece_name = piece.attrib['name']
+            self._pieces[piece_name] = piece
+            if self._scope_filter is not None and piece_name not in self._scope_filter:
+                continue
+            self._logger.info('Create scope "{}"'.format(piece_name))
+            if self._lazy:
+                self.pattern.add_scope(piece_name, loader=self._make_loader(piece))
+            else:
+                scope = self.pattern.add_scope(piece_name)
+                self.read_piece(piece, scope)
+
+    ##############################################
+
+    def _make_loader(self, piece):
+        def loader(scope):
+            self.read_piece(piece, scope)
+        return loader
+
+    ##############################################
+
+    @property
+    def scope_names(self):
+        """Return the names of all the scopes in the file, including the skipped ones"""
+        return list(self._pieces.keys())
 
     ##############################################
 
@@ -268,11 +311,7 @@ class ValFileReaderInternal(XmlFileMixin):
 
         measurements_path = self.get_xpath_element(self.root, 'measurements').text
         if measurements_path is not None:
-            measurements_path = Path(measurements_path)
-            if not measurements_path.exists():
-                measurements_path = self.path.parent.joinpath(measurements_path)
-            if not measurements_path.exists():
-                raise NameError("Cannot find {}".format(measurements_path))
+            measurements_path = find_measurements_path(self.path, measurements_path)
             self.vit_file = VitFile(measurements_path)
         else:
             self.vit_file = None
@@ -299,39 +338,43 @@ class ValFileReaderInternal(XmlFileMixin):
 
     ##############################################
 
-    def read_piece(self, piece):
+    def read_piece(self, piece, scope):
+
+        with profiler.region('ValFileReaderInternal.read_piece', piece=piece.attrib['name']):
+            sketch = scope.sketch
+            for element in self.get_xpath_element(piece, 'calculation'):
+                try:
+                    with profiler.region('ValFileReaderInternal.read_calculation', tag=element.tag):
+                        xml_calculation = _calculation_dispatcher.from_xml(element)
+                        operation = xml_calculation.to_operation(sketch)
+                    self._logger.info('Add operation {}'.format(operation))
+                except NotImplementedError:
+                    self._logger.warning('Not implemented calculation\n' +  str(etree.tostring(element)))
+            sketch.eval()
 
-        piece_name = piece.attrib['name']
-        self._logger.info('Create scope "{}"'.format(piece_name))
-        scope = self.pattern.add_scope(piece_name)
+    ##############################################
 
-        sketch = scope.sketch
-        for element in self.get_xpath_element(piece, 'calculation'):
-            try:
-                xml_calculation = _calculation_dispatcher.from_xml(element)
-                operation = xml_calculation.to_operation(sketch)
-                self._logger.info('Add operation {}'.format(operation))
-            except NotImplementedError:
-                self._logger.warning('Not implemented calculation\n' +  str(etree.tostring(element)))
-        sketch.eval()
+    def read_details(self, scope_name):
+
+        """Read the modeling and the details of a scope on demand and return the list of details"""
+
+        piece = self._pieces[scope_name]
 
         modeling = Modeling()
         for element in self.get_xpath_element(piece, 'modeling'):
             xml_modeling_item = _modeling_dispatcher.from_xml(element)
             modeling.add(xml_modeling_item)
-            self._logger.info('Modeling {}'.format(xml_modeling_item))
+            self._logger.debug('Modeling {}'.format(xml_modeling_item))
 
-        # details = []
-        for detail_element in self.get_xpath_element(piece, 'details'):
-            self.read_detail(scope, modeling, detail_element)
-            # details.append(xml_detail)
+        return [self.read_detail(modeling, detail_element)
+                for detail_element in self.get_xpath_element(piece, 'details')]
 
     ##############################################
 
-    def read_detail(self, scope, modeling, detail_element):
+    def read_detail(self, modeling, detail_element):
 
         xml_detail = Detail(modeling, detail_element)
-        self._logger.info('Detail {}'.format(xml_detail))
+        self._logger.debug('Detail {}'.format(xml_detail))
         for element in detail_element:
             if element.tag == 'nodes':
                 for node in element:
@@ -340,22 +383,50 @@ class ValFileReaderInternal(XmlFileMixin):
             else:
                 xml_modeling_item = _detail_dispatcher.from_xml(element)
                 # Fixme: xml_detail. = xml_modeling_item
-                print(xml_modeling_item)
+                self._logger.debug('Detail item {}'.format(xml_modeling_item))
 
-        for node, modeling_item in xml_detail.iter_on_nodes():
-            # print(node.object_id, '->', modeling_item, '->', modeling_item.object_id)
-            print(node, '->\n', modeling_item, '->\n', scope.sketch.get_operation(modeling_item.object_id))
+        return xml_detail
 
 ####################################################################################################
 
 class ValFileReader:
 
-    """Class to read val file."""
+    """Class to read val file.
+
+    If a :class:`.PatternCache.PatternCache` instance is given, the evaluated pattern is loaded from
+    the cache when the val and vit files are unchanged.
+
+    If *lazy* is set, scopes are only read and evaluated on first access.  If *scopes* is a list of
+    names, only these scopes are loaded.  Details are only read by :meth:`read_details`.
+
+    The cache stores fully evaluated patterns, thus it cannot be used with *lazy* or *scopes*.
+
+    """
+
+    ##############################################
+
+    def __init__(self, path, cache=None, lazy=False, scopes=None):
+        if cache is not None:
+            if lazy or scopes is not None:
+                raise ValueError('A pattern cache cannot be used with lazy or scopes')
+            self._internal = cache.load(path)
+            if self._internal is None:
+                # all the scopes must be evaluated to be stored
+                self._internal = ValFileReaderInternal(path)
+                cache.store(path, self._internal)
+        else:
+            self._internal = ValFileReaderInternal(path, lazy, scopes)
+
+    ##############################################
+
+    @property
+    def scope_names(self):
+        return self._internal.scope_names
 
     ##############################################
 
-    def __init__(self, path):
-        self._internal = ValFileReaderInternal(path)
+    def read_details(self, scope_name):
+        return self._internal.read_details(scope_name)
 
     ##############################################
 
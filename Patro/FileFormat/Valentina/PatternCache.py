@@ -0,0 +1,359 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2018 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+"""Module to implement a persistent cache of evaluated Valentina patterns.
+
+The cache stores the scopes, the operations, the evaluated point coordinates and the measurements
+of a pattern in a compressed pickle of plain Python objects.  An entry is keyed by a hash of the
+val file, the vit file and the Patro version, thus an entry is never invalidated but evicted when
+the cache exceeds its size, least recently used first.
+
+"""
+
+####################################################################################################
+
+__all__ = ['PatternCache']
+
+####################################################################################################
+
+from io import BytesIO
+from pathlib import Path
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import zlib
+
+from lxml import etree
+
+from Patro import __version__ as PATRO_VERSION
+from Patro.GeometryEngine.Vector import Vector2D
+from Patro.Measurement.ValentinaMeasurement import ValentinaMeasurements
+from Patro.Pattern.Calculator import Expression
+from Patro.Pattern.Pattern import Pattern
+from Patro.Pattern.SketchOperation import SketchOperation
+from .Measurement import VitFile
+from .Pattern import find_measurements_path, ValFileReaderInternal
+
+####################################################################################################
+
+_module_logger = logging.getLogger(__name__)
+
+####################################################################################################
+
+# Bump when the layout of a cache entry changes
+CACHE_FORMAT_VERSION = 1
+
+####################################################################################################
+
+class CachedValFile:
+
+    """Class to implement the :class:`ValFileReader` interface for a cached pattern."""
+
+    ##############################################
+
+    def __init__(self, path, attribute, measurements_path, measurements, pattern):
+
+        self.path = Path(path)
+        self.attribute = attribute
+        self._measurements_path = measurements_path
+        self._vit_file = None
+        self.measurements = measurements
+        self.pattern = pattern
+
+    ##############################################
+
+    @property
+    def scope_names(self):
+        return self.pattern.scope_names()
+
+    ##############################################
+
+    def read_details(self, scope_name):
+        # details are not cached, only parse the file
+        return ValFileReaderInternal(self.path, lazy=True).read_details(scope_name)
+
+    ##############################################
+
+    @property
+    def vit_file(self):
+        # The vit file is only loaded on demand
+        if self._vit_file is None and self._measurements_path is not None:
+            self._vit_file = VitFile(self._measurements_path)
+        return self._vit_file
+
+####################################################################################################
+
+class PatternCache:
+
+    """Class to implement a size bounded cache of evaluated patterns in a directory.
+
+    Usage::
+
+        cache = PatternCache('~/.cache/patro')
+        val_file = ValFileReader(path, cache=cache)
+
+    """
+
+    _logger = _module_logger.getChild('PatternCache')
+
+    SUFFIX = '.patro-cache'
+
+    ##############################################
+
+    def __init__(self, path, max_size=256*1024**2):
+
+        self._path = Path(path).expanduser()
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._max_size = int(max_size)
+
+    ##############################################
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    ##############################################
+
+    def _entry_paths(self):
+        return [path for path in self._path.iterdir() if path.suffix == self.SUFFIX]
+
+    ##############################################
+
+    @property
+    def size(self):
+        return sum(path.stat().st_size for path in self._entry_paths())
+
+    ##############################################
+
+    def clear(self):
+        for path in self._entry_paths():
+            path.unlink()
+
+    ##############################################
+
+    @staticmethod
+    def _read_measurements_path(val_path, data):
+
+        # only parse the beginning of the file
+        for event, element in etree.iterparse(BytesIO(data), tag='measurements'):
+            if element.text:
+                return find_measurements_path(val_path, element.text)
+            else:
+                return None
+        return None
+
+    ##############################################
+
+    def _key(self, val_path):
+
+        """Return the key of the entry and the path of the measurements file"""
+
+        val_path = Path(val_path)
+        with open(val_path, 'rb') as fh:
+            val_data = fh.read()
+        measurements_path = self._read_measurements_path(val_path, val_data)
+
+        digest = hashlib.sha256()
+        digest.update('{} {}\0'.format(PATRO_VERSION, CACHE_FORMAT_VERSION).encode('utf-8'))
+        digest.update(val_data)
+        if measurements_path is not None:
+            digest.update(b'\0')
+            with open(measurements_path, 'rb') as fh:
+                digest.update(fh.read())
+        return digest.hexdigest(), measurements_path
+
+    ##############################################
+
+    def _entry_path(self, key):
+        return self._path.joinpath(key + self.SUFFIX)
+
+    ##############################################
+
+    def load(self, val_path):
+
+        """Return a :class:`CachedValFile` instance or None if the pattern is not cached"""
+
+        key, measurements_path = self._key(val_path)
+        entry_path = self._entry_path(key)
+        if not entry_path.exists():
+            return None
+
+        try:
+            with open(entry_path, 'rb') as fh:
+                data = pickle.loads(zlib.decompress(fh.read()))
+            val_file = self._decode(val_path, measurements_path, data)
+        except Exception as exception:
+            # corrupted or incompatible entry
+            self._logger.warning('Remove corrupted cache entry {}: {}'.format(entry_path, exception))
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+            return None
+
+        os.utime(entry_path) # for LRU
+        self._logger.info('Load pattern "{}" from cache'.format(val_path))
+        return val_file
+
+    ##############################################
+
+    def store(self, val_path, val_file):
+
+        """Store a :class:`ValFileReaderInternal` instance"""
+
+        key, measurements_path = self._key(val_path)
+        data = zlib.compress(pickle.dumps(self._encode(val_file), protocol=pickle.HIGHEST_PROTOCOL))
+
+        # write atomically, a concurrent reader must not see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self._path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+        self._evict()
+
+    ##############################################
+
+    def _evict(self):
+
+        """Remove the least recently used entries to fit in the maximum size"""
+
+        entries = []
+        for path in self._entry_paths():
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        # keep the most recent entry
+        for mtime, entry_size, path in sorted(entries)[:-1]:
+            if size <= self._max_size:
+                break
+            self._logger.info('Evict cache entry {}'.format(path))
+            path.unlink()
+            size -= entry_size
+
+    ##############################################
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, SketchOperation):
+            return value.id
+        elif isinstance(value, Expression):
+            return str(value)
+        elif isinstance(value, Vector2D):
+            return (value.x, value.y)
+        else:
+            return value
+
+    ##############################################
+
+    @staticmethod
+    def _decode_value(value):
+        if isinstance(value, tuple):
+            return Vector2D(value)
+        else:
+            return value
+
+    ##############################################
+
+    @classmethod
+    def _encode_measurements(cls, measurements):
+
+        if measurements is None:
+            return None
+
+        items = []
+        for measurement in measurements._unique_measurements():
+            expression = measurement.expression
+            if not isinstance(expression, (int, float)):
+                expression = str(expression)
+            items.append((measurement.valentina_name, expression,
+                          measurement.full_name, measurement.description))
+
+        return {
+            'unit': measurements.unit,
+            'pattern_making_system': measurements.pattern_making_system,
+            'personal': measurements.personal,
+            'measurements': items,
+        }
+
+    ##############################################
+
+    @classmethod
+    def _encode(cls, val_file):
+
+        pattern = val_file.pattern
+        encode = cls._encode_value
+        scopes = []
+        for scope in pattern.scopes:
+            operations = []
+            states = []
+            dependencies = []
+            for operation in scope.sketch.operations:
+                kwargs = {name:encode(value) for name, value in operation.init_kwargs().items()}
+                operations.append((operation.__class__.__name__, operation.id, kwargs))
+                states.append({name:encode(value) for name, value in operation.evaluated_state().items()})
+                dependencies.append([dependency.id for dependency in operation.dependencies])
+            scopes.append((scope.name, operations, states, dependencies))
+
+        return {
+            'attribute': val_file.attribute,
+            'unit': pattern.unit,
+            'measurements': cls._encode_measurements(val_file.measurements),
+            'scopes': scopes,
+        }
+
+    ##############################################
+
+    @classmethod
+    def _decode(cls, val_path, measurements_path, data):
+
+        measurements_data = data['measurements']
+        if measurements_data is not None:
+            measurements = ValentinaMeasurements(
+                unit=measurements_data['unit'],
+                pattern_making_system=measurements_data['pattern_making_system'],
+                personal_data=measurements_data['personal'],
+            )
+            for args in measurements_data['measurements']:
+                measurements.add(*args)
+        else:
+            measurements = None
+
+        pattern = Pattern(measurements, data['unit'])
+        decode = cls._decode_value
+        for name, operations, states, dependencies in data['scopes']:
+            sketch = pattern.add_scope(name).sketch
+            for cls_name, id, kwargs in operations:
+                kwargs = {name:decode(value) for name, value in kwargs.items()}
+                getattr(sketch, cls_name)(id=id, **kwargs)
+            states = [{name:decode(value) for name, value in state.items()} for state in states]
+            sketch.restore_evaluation(states, dependencies)
+
+        return CachedValFile(val_path, data['attribute'], measurements_path, measurements, pattern)
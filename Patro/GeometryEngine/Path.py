@@ -753,7 +753,7 @@ class CubicBezierSegment(PathPart, ThreePointMixin):
 
 ####################################################################################################
 
-class StringedQuadtraticBezierSegment(PathPart, TwoPointMixin):
+class StringedQuadraticBezierSegment(PathPart, TwoPointMixin):
 
     ##############################################
 
@@ -107,6 +107,25 @@ class Primitive:
 
     ##############################################
 
+    def transform(self, transformation, clone=False):
+        """Apply a transformation to the primitive.
+
+        If *clone* is set then the primitive is cloned.
+
+        """
+        obj = self.clone() if clone else self
+        if not transformation.is_identity:
+            obj.apply_transformation(transformation)
+        return obj
+
+    ##############################################
+
+    def apply_transformation(self, transformation):
+        """Apply a transformation to the primitive inplace."""
+        raise NotImplementedError
+
+    ##############################################
+
     @property
     def bounding_box(self):
         """Bounding box of the primitive.
@@ -260,19 +279,6 @@ class PointPrimitive(Primitive):
 
     ##############################################
 
-    def transform(self, transformation, clone=False):
-        """Apply a transformation to the primitive.
-
-        If *clone* is set then the primitive is cloned.
-
-        """
-        obj = self.clone() if clone else self
-        if not transformation.is_identity:
-            obj.apply_transformation(transformation)
-        return obj
-
-    ##############################################
-
     def apply_transformation(self, transformation):
         """Apply a transformation to the primitive.
 
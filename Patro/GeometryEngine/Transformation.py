@@ -359,6 +359,12 @@ class AffineTransformation(Transformation):
     def translation_part(self):
         return self._m[:self.__dimension__,-1]
 
+    ##############################################
+
+    def transform_array(self, points):
+        """Transform an array of points having a shape (N, dimension)"""
+        return np.matmul(points, self.matrix_part.T) + self.translation_part
+
 ####################################################################################################
 
 class AffineTransformation2D(AffineTransformation):
@@ -0,0 +1,213 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+"""Module to implement a display list.
+
+A display list is a flat representation of a graphic scene which is compiled once and shared by the
+painters.  The positions of the items are cast and transformed to scene coordinates and stored in a
+contiguous array.
+
+"""
+
+####################################################################################################
+
+__all__ = ['DisplayList']
+
+####################################################################################################
+
+import logging
+
+import numpy as np
+
+from Patro.GeometryEngine.Vector import Vector2D
+from .GraphicItemMixin import GraphicItem
+
+####################################################################################################
+
+_module_logger = logging.getLogger(__name__)
+
+####################################################################################################
+
+class DisplayList:
+
+    """Class to implement a display list.
+
+    Each command is defined by an opcode, which is the index of the item class in
+    :attr:`GraphicItem.__subclasses__`, a range in the coordinate array and a style index.
+
+    The display list is valid for the scene version it was compiled from.
+
+    """
+
+    _logger = _module_logger.getChild('DisplayList')
+
+    ##############################################
+
+    @staticmethod
+    def opcode_of(item_cls) -> int:
+        return GraphicItem.__subclasses__.index(item_cls)
+
+    ##############################################
+
+    def __init__(self, scene) -> None:
+
+        self._logger.info('Compile display list')
+
+        self._version = scene.version
+
+        opcodes = {}   # item_cls -> opcode
+        style_indexes = {}   # id(style) -> index
+
+        self._items = []
+        self._indexes = {}   # item_id -> index
+        self._styles = []
+        opcode_array = []
+        style_array = []
+        offsets = [0]
+        coordinates = []
+        number_of_positions = 0
+
+        # cast positions are cached by the scene for each item
+        casted_coordinates = scene.casted_coordinates
+        for item in scene.z_value_iter():
+            item_cls = item.__class__
+            opcode = opcodes.get(item_cls)
+            if opcode is None:
+                opcode = opcodes[item_cls] = self.opcode_of(item_cls)
+
+            path_style = getattr(item, 'path_style', None)
+            if path_style is None:
+                style_index = -1
+            else:
+                style_index = style_indexes.get(id(path_style))
+                if style_index is None:
+                    style_index = style_indexes[id(path_style)] = len(self._styles)
+                    self._styles.append(path_style)
+
+            item_coordinates = casted_coordinates(item)
+            coordinates.append(item_coordinates)
+            number_of_positions += len(item_coordinates)
+
+            self._indexes[id(item)] = len(self._items)
+            self._items.append(item)
+            opcode_array.append(opcode)
+            style_array.append(style_index)
+            offsets.append(number_of_positions)
+
+        self._opcodes = np.array(opcode_array, dtype=np.int16)
+        self._style_indexes = np.array(style_array, dtype=np.int32)
+        self._offsets = np.array(offsets, dtype=np.int64)
+        if coordinates:
+            self._coordinates = np.concatenate(coordinates)
+        else:
+            self._coordinates = np.zeros((0, 2), dtype=np.float64)
+        # computed on demand
+        self._extents = None
+
+    ##############################################
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def items(self) -> list[GraphicItem]:
+        return self._items
+
+    @property
+    def styles(self) -> list:
+        """Interned path styles"""
+        return self._styles
+
+    @property
+    def opcodes(self) -> np.ndarray:
+        return self._opcodes
+
+    @property
+    def style_indexes(self) -> np.ndarray:
+        return self._style_indexes
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Offsets of the commands in the coordinate array, the last one is the array length"""
+        return self._offsets
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        return self._coordinates
+
+    @property
+    def extents(self) -> np.ndarray:
+        """Size of the bounding box of the positions of each command, i.e. the maximum of its width and
+        height, it is zero for a command having a single position.
+
+        """
+        if self._extents is None:
+            offsets = self._offsets
+            extents = np.zeros(len(self), dtype=np.float64)
+            non_empty = np.diff(offsets) > 0
+            if non_empty.any():
+                # the coordinates of the non empty commands are contiguous
+                starts = offsets[:-1][non_empty]
+                maxima = np.maximum.reduceat(self._coordinates, starts, axis=0)
+                minima = np.minimum.reduceat(self._coordinates, starts, axis=0)
+                extents[non_empty] = (maxima - minima).max(axis=1)
+            self._extents = extents
+        return self._extents
+
+    ##############################################
+
+    def indexes_of(self, item_ids) -> list[int]:
+        """Return the sorted indexes of the commands for the given item ids, hidden items are skipped"""
+        indexes = self._indexes
+        return sorted(indexes[item_id] for item_id in item_ids if item_id in indexes)
+
+    ##############################################
+
+    def coordinates_of(self, index: int) -> np.ndarray:
+        return self._coordinates[self._offsets[index]:self._offsets[index+1]]
+
+    ##############################################
+
+    def gather(self, indexes) -> tuple[np.ndarray, np.ndarray]:
+
+        """Return the coordinates of the commands given by their indexes as a contiguous array and
+        their offsets in this array.
+
+        """
+
+        if len(indexes) == len(self) and np.array_equal(indexes, range(len(self))):
+            return self._coordinates, self._offsets
+        indexes = np.asarray(indexes, dtype=np.int64)
+        starts = self._offsets[indexes]
+        counts = self._offsets[indexes + 1] - starts
+        offsets = np.zeros(len(indexes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # position in the display list of each gathered coordinate
+        positions = np.arange(offsets[-1]) + np.repeat(starts - offsets[:-1], counts)
+        return self._coordinates[positions], offsets
+
+    ##############################################
+
+    def positions_of(self, index: int) -> list[Vector2D]:
+        return [Vector2D(x, y) for x, y in self.coordinates_of(index).tolist()]
@@ -37,6 +37,7 @@ from Patro.GeometryEngine.Polygon import Polygon2D
 from Patro.GeometryEngine.Polyline import Polyline2D
 from Patro.GeometryEngine.Rectangle import Rectangle2D
 from Patro.GeometryEngine.Segment import Segment2D
+from Patro.GeometryEngine.Vector import Vector2D
 
 from .GraphicItemMixin import (
     FourPositionMixin,
@@ -69,6 +70,17 @@ class CoordinateItem(PositionMixin):
     def name(self) -> str:
         return self._name
 
+    ##############################################
+
+    @property
+    def position(self) -> Vector2D:
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2D) -> None:
+        # use GraphicSceneScope.set_coordinate to update the items
+        self._position = value
+
 ####################################################################################################
 
 class TextItem(PositionMixin, GraphicItem):
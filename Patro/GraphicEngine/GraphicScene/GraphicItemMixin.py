@@ -40,7 +40,7 @@ __all__ = [
 
 from typing import Any
 
-from Path.GeometryEngine.Vector import Vector2D
+from Patro.GeometryEngine.Vector import Vector2D
 from .GraphicStyle import GraphicPathStyle
 # from .Scene import GraphicScene
 
@@ -59,7 +59,7 @@ class GraphicItem:
 
     ##############################################
 
-    def __init__(self, scene: GraphicScene, user_data: Any) -> None:
+    def __init__(self, scene: 'GraphicScene', user_data: Any) -> None:
         self._scene = scene
         self._user_data = user_data
 
@@ -75,7 +75,7 @@ class GraphicItem:
     ##############################################
 
     @property
-    def scene(self) -> GraphicScene:
+    def scene(self) -> 'GraphicScene':
         return self._scene
 
     @property
@@ -93,9 +93,14 @@ class GraphicItem:
     def z_value(self) -> float:
         return self._z_value
 
+    # The scene is notified so as to update its z-order index and selection
+
     @z_value.setter
     def z_value(self, value: float) -> None:
-        self._z_value = value
+        if value != self._z_value:
+            old_z_value = self._z_value
+            self._z_value = value
+            self._scene.item_z_value_changed(self, old_z_value)
 
     @property
     def visible(self) -> bool:
@@ -103,7 +108,10 @@ class GraphicItem:
 
     @visible.setter
     def visible(self, value: bool) -> None:
-        self._visible = bool(value)
+        value = bool(value)
+        if value != self._visible:
+            self._visible = value
+            self._scene.item_visibility_changed(self)
 
     @property
     def selected(self) -> bool:
@@ -111,7 +119,10 @@ class GraphicItem:
 
     @selected.setter
     def selected(self, value: bool) -> None:
-        self._selected = bool(value)
+        value = bool(value)
+        if value != self._selected:
+            self._selected = value
+            self._scene.item_selection_changed(self)
 
     ##############################################
 
@@ -123,8 +134,9 @@ class GraphicItem:
 
     @property
     def casted_positions(self) -> list[Vector2D]:
-        cast = self._scene.cast_position
-        return [cast(position) for position in self.positions]
+        # cached by the scene
+        coordinates = self._scene.casted_coordinates(self)
+        return [Vector2D(x, y) for x, y in coordinates.tolist()]
 
     ##############################################
 
@@ -136,10 +148,11 @@ class GraphicItem:
     def dirty(self, value: bool) -> None:
         if bool(value):
             self._dirty = True
-        else:
-            self._dirty = True
             self._geometry = None
             self._bounding_box = None
+            self._scene.item_changed(self)
+        else:
+            self._dirty = False
 
     ##############################################
 
@@ -177,7 +190,7 @@ class PathStyleItemMixin(GraphicItem):
 
     ##############################################
 
-    def __init__(self, scene: GraphicScene, path_style: GraphicPathStyle, user_data: Any) -> None:
+    def __init__(self, scene: 'GraphicScene', path_style: GraphicPathStyle, user_data: Any) -> None:
         GraphicItem.__init__(self, scene, user_data)
         self._path_style = path_style
 
@@ -270,7 +283,7 @@ class ThreePositionMixin(TwoPositionMixin):
         return self._position3
 
     @property
-    def positions(self) -> list(Vector2D, Vector2D, Vector2D):
+    def positions(self) -> list[Vector2D]:
         return (self._position1, self._position2, self._position3)
 
 ####################################################################################################
@@ -66,6 +66,12 @@ class GraphicPathStyle:
 
         :param cap_style: defaults to :const:`CapStyle.SquareCap`
         :param join_style: defaults to :const:`JoinStyle.BevelJoin`
+
+        Level of detail settings used by the interactive painter:
+
+        :param min_scale: scale in pixel per scene unit below which the item is hidden, defaults to `None`
+        :param min_size: size in pixel below which the item is hidden, defaults to 1.0
+        :param flatness: tolerance in pixel to flatten the curves, defaults to 0.25
         """
         self.stroke_style = kwargs.get('stroke_style', StrokeStyle.SolidLine)
         self.line_width = kwargs.get('line_width', 1.0)
@@ -79,6 +85,10 @@ class GraphicPathStyle:
         self.cap_style = kwargs.get('cap_style', CapStyle.SquareCap)
         self.join_style = kwargs.get('join_style', JoinStyle.BevelJoin)
 
+        self.min_scale = kwargs.get('min_scale', None)
+        self.min_size = kwargs.get('min_size', 1.0)
+        self.flatness = kwargs.get('flatness', .25)
+
     ##############################################
 
     def _dict_keys(self) -> list:
@@ -87,6 +97,9 @@ class GraphicPathStyle:
             'line_width',
             'stroke_color',
             'fill_color',
+            'min_scale',
+            'min_size',
+            'flatness',
         )
 
     ##############################################
@@ -183,6 +196,35 @@ class GraphicPathStyle:
     def join_style(self, value: str) -> None:
         self._join_style = JoinStyle(value)
 
+    ##############################################
+
+    @property
+    def min_scale(self) -> float | None:
+        return self._min_scale
+
+    @min_scale.setter
+    def min_scale(self, value: float | None) -> None:
+        self._min_scale = None if value is None else float(value)
+
+    @property
+    def min_size(self) -> float:
+        return self._min_size
+
+    @min_size.setter
+    def min_size(self, value: float) -> None:
+        self._min_size = float(value)
+
+    @property
+    def flatness(self) -> float:
+        return self._flatness
+
+    @flatness.setter
+    def flatness(self, value: float) -> None:
+        value = float(value)
+        if value <= 0:
+            raise ValueError('Invalid flatness {}'.format(value))
+        self._flatness = value
+
 ####################################################################################################
 
 class GraphicBezierStyle(GraphicPathStyle):
@@ -236,6 +278,8 @@ class Font:
 
     ##############################################
 
-    def __init__(self, family: str, point_size: int | float) -> None:
+    def __init__(self, family: str, point_size: int | float, min_scale: float | None = None) -> None:
+        """*min_scale* is the scale in pixel per scene unit below which the texts are hidden"""
         self.family = family
         self.point_size = point_size
+        self.min_scale = min_scale
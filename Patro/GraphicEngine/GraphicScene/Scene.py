@@ -32,9 +32,14 @@ __all__ = [
 
 ####################################################################################################
 
+import bisect
+import collections
+import itertools
 import logging
 from typing import Any, Iterator
 
+from IntervalArithmetic import Interval2D
+import numpy as np
 import rtree
 
 from Patro.GeometryEngine import (
@@ -52,6 +57,7 @@ from Patro.GeometryEngine import (
 from Patro.GeometryEngine.Transformation import AffineTransformation2D
 from Patro.GeometryEngine.Vector import Vector2D
 from . import GraphicItem
+from .DisplayList import DisplayList
 from .GraphicItem import CoordinateItem
 from .GraphicStyle import GraphicPathStyle
 
@@ -79,6 +85,9 @@ class GraphicSceneScope:
         'text': GraphicItem.TextItem,
     }
 
+    # number of damaged areas kept for the tile caches
+    MAX_DAMAGES = 1024
+
     _logger = _module_logger.getChild('GraphicSceneScope')
 
     ##############################################
@@ -91,9 +100,31 @@ class GraphicSceneScope:
         self._coordinates = {}
         self._items = {}   # id(item) -> item, e.g. for rtree query
 
+        # Visible items sorted by z value then by inserting order
+        self._item_counter = itertools.count()
+        self._item_order = {}   # item_id -> inserting order
+        self._z_values = []   # sorted
+        self._z_layers = {}   # z_value -> list of items sorted by inserting order
+        self._selected_items = {}   # item_id -> item
+
+        # incremented each time the scene is modified
+        self._version = 0
+        # compiled on demand and shared by the painters
+        self._display_list = None
+        # item_id -> array of cast positions
+        self._casted_coordinates = {}
+        # coordinate name -> set of item_id, the items which must be updated when a coordinate is moved
+        self._coordinate_users = {}
+
+        # (counter, bounding box or item) for each change which affects the rendering
+        self._damage_counter = 0
+        self._damages = collections.deque()
+
         self._user_data_map = {}
 
-        self._rtree = rtree.index.Index()
+        # The rtree is bulk loaded on the first query, then only dirty items are updated
+        self._rtree = None
+        self._dirty_items = set()   # item_id
         # item_id -> bounding_box, used to delete item in rtree (cf. rtree api)
         self._item_bounding_box_cache = {}
 
@@ -124,24 +155,157 @@ class GraphicSceneScope:
 
     ##############################################
 
-    def z_value_iter(self) -> None:
-        # Fixme: cache ???
-        # Group by z_value and keep inserting order
-        z_map = {}
-        for item in self._items.values():
+    def _order_key(self, item: GraphicItem) -> int:
+        return self._item_order[id(item)]
+
+    ##############################################
+
+    def _insert_in_z_layer(self, item: GraphicItem) -> None:
+        z_value = item.z_value
+        layer = self._z_layers.get(z_value)
+        if layer is None:
+            layer = self._z_layers[z_value] = []
+            bisect.insort(self._z_values, z_value)
+        bisect.insort(layer, item, key=self._order_key)
+
+    ##############################################
+
+    def _remove_from_z_layer(self, item: GraphicItem, z_value: float) -> None:
+        layer = self._z_layers[z_value]
+        index = bisect.bisect_left(layer, self._order_key(item), key=self._order_key)
+        del layer[index]
+        if not layer:
+            del self._z_layers[z_value]
+            self._z_values.remove(z_value)
+
+    ##############################################
+
+    def z_value_iter(self, bounding_box=None) -> None:
+
+        """Iterate over the visible items by z value and inserting order, if *bounding_box* is given then
+        only the items which intersect it are returned.
+
+        """
+
+        if bounding_box is None:
+            # take a snapshot of each layer, items can be modified during the iteration
+            for z_value in tuple(self._z_values):
+                layer = self._z_layers.get(z_value)
+                if layer:
+                    yield from tuple(layer)
+        else:
+            item_ids = self.item_ids_in_bounding_box(bounding_box)
+            items = [self._items[item_id] for item_id in item_ids]
+            items = [item for item in items if item.visible]
+            item_order = self._item_order
+            items.sort(key=lambda item: (item.z_value, item_order[id(item)]))
+            yield from items
+
+    ##############################################
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _changed(self) -> None:
+        self._version += 1
+
+    ##############################################
+
+    @property
+    def display_list(self) -> DisplayList:
+        if self._display_list is None or self._display_list.version != self._version:
+            self._display_list = DisplayList(self)
+        return self._display_list
+
+    def invalidate_display_list(self) -> None:
+        self._changed()
+        # the damaged areas are unknown
+        self._damage_counter += 1
+        self._damages.clear()
+
+    ##############################################
+
+    @property
+    def damage_counter(self) -> int:
+        return self._damage_counter
+
+    def _damage(self, item: GraphicItem, moved: bool = True) -> None:
+        """Record the area of an item, before and after its modification"""
+        self._damage_counter += 1
+        if moved:
+            old_bounding_box = self._item_bounding_box_cache.get(id(item))
+            if old_bounding_box is not None:
+                self._damages.append((self._damage_counter, old_bounding_box))
+        self._damages.append((self._damage_counter, item))
+        damages = self._damages
+        while len(damages) > self.MAX_DAMAGES:
+            # evict whole counters, else the old area of a damage could be lost but not the new one
+            oldest_counter = damages[0][0]
+            while damages and damages[0][0] == oldest_counter:
+                damages.popleft()
+
+    ##############################################
+
+    def damaged_areas(self, counter: int) -> list | None:
+
+        """Return the bounding boxes of the areas which were modified since the damage *counter*, return
+        :obj:`None` if the information is lost and the whole scene must be considered as damaged.
+
+        """
+
+        if counter == self._damage_counter:
+            return []
+        # be conservative, the older damages could have been dropped
+        if not self._damages or self._damages[0][0] > counter:
+            return None
+        areas = []
+        for damage_counter, damage in self._damages:
+            if damage_counter > counter:
+                if isinstance(damage, tuple):
+                    areas.append(damage)
+                else:
+                    # the bounding box of the item as it is now
+                    areas.append(damage.bounding_box.bounding_box)
+        return areas
+
+    ##############################################
+
+    def item_z_value_changed(self, item: GraphicItem, old_z_value: float) -> None:
+        if id(item) in self._items and item.visible:
+            self._remove_from_z_layer(item, old_z_value)
+            self._insert_in_z_layer(item)
+            self._damage(item)
+            self._changed()
+
+    ##############################################
+
+    def item_visibility_changed(self, item: GraphicItem) -> None:
+        if id(item) in self._items:
+            self._damage(item)
+            self._changed()
             if item.visible:
-                items = z_map.setdefault(item.z_value, [])
-                items.append(item)
-        for z_value in sorted(z_map.keys()):
-            for item in z_map[z_value]:
-                yield item
+                self._insert_in_z_layer(item)
+            else:
+                self._remove_from_z_layer(item, item.z_value)
+
+    ##############################################
+
+    def item_selection_changed(self, item: GraphicItem) -> None:
+        item_id = id(item)
+        if item_id in self._items:
+            if item.selected:
+                self._selected_items[item_id] = item
+            else:
+                self._selected_items.pop(item_id, None)
+            # selected items are painted with another style
+            self._damage(item, moved=False)
 
     ##############################################
 
     @property
     def selected_items(self) -> list[GraphicItem]:
-        # Fixme: cache ?
-        return [item for item in self._items.values() if item.selected]
+        return list(self._selected_items.values())
 
     ##############################################
 
@@ -154,12 +318,32 @@ class GraphicSceneScope:
     def add_coordinate(self, name: str, position) -> CoordinateItem:
         item = CoordinateItem(name, position)
         self._coordinates[name] = item
+        self._coordinate_changed(name)
+        self._changed()
         return item
 
     ##############################################
 
     def remove_coordinate(self, name: str) -> None:
         del self._coordinates[name]
+        self._coordinate_changed(name)
+        self._changed()
+
+    ##############################################
+
+    def set_coordinate(self, name: str, position: Vector2D) -> None:
+        """Move a coordinate, only the items which reference it are updated"""
+        self._coordinates[name].position = position
+        self._coordinate_changed(name)
+        self._changed()
+
+    ##############################################
+
+    def _coordinate_changed(self, name: str) -> None:
+        for item_id in self._coordinate_users.pop(name, ()):
+            item = self._items.get(item_id)
+            if item is not None:
+                item.dirty = True
 
     ##############################################
 
@@ -168,6 +352,34 @@ class GraphicSceneScope:
 
     ##############################################
 
+    def casted_coordinates(self, item: GraphicItem) -> np.ndarray:
+
+        """Return the positions of an item cast and transformed as an array of shape (N, 2), the array
+        is cached until the item or a coordinate it references changes.
+
+        """
+
+        item_id = id(item)
+        coordinates = self._casted_coordinates.get(item_id)
+        if coordinates is None:
+            positions = item.positions
+            # PositionMixin returns a single position
+            if isinstance(positions, (str, Vector2D)):
+                positions = (positions,)
+            vectors = []
+            for position in positions:
+                if isinstance(position, str):
+                    self._coordinate_users.setdefault(position, set()).add(item_id)
+                    position = self._coordinates[position].position
+                vectors.append((position.x, position.y))
+            coordinates = np.array(vectors, dtype=np.float64).reshape((-1, 2))
+            coordinates = self._transformation.transform_array(coordinates)
+            if item_id in self._items:
+                self._casted_coordinates[item_id] = coordinates
+        return coordinates
+
+    ##############################################
+
     def cast_position(self, position: str | Vector2D) -> Vector2D:
         """Cast coordinate and apply scope transformation, *position* can be a coordinate name string of a
         :class:`Patro.GeometryEngine.Vector.Vector2D`.
@@ -190,6 +402,15 @@ class GraphicSceneScope:
 
         item_id = id(item)   # Fixme: hash ???
         self._items[item_id] = item
+        self._item_order[item_id] = next(self._item_counter)
+        if item.visible:
+            self._insert_in_z_layer(item)
+        if item.selected:
+            self._selected_items[item_id] = item
+        if self._rtree is not None:
+            self._dirty_items.add(item_id)
+        self._damage(item)
+        self._changed()
 
         user_data = item.user_data
         if user_data is not None:
@@ -202,13 +423,23 @@ class GraphicSceneScope:
     ##############################################
 
     def remove_item(self, item: GraphicItem) -> None:
-        self.update_rtree(item, insert=False)
+        item_id = id(item)
+        self._damage(item)
+        self._dirty_items.discard(item_id)
+        if self._rtree is not None:
+            self.update_rtree_item(item, insert=False)
 
         items = self.item_for_user_data(item.user_data)
         if items:
             items.remove(item)
 
-        del self._items[item]
+        if item.visible:
+            self._remove_from_z_layer(item, item.z_value)
+        self._selected_items.pop(item_id, None)
+        del self._item_order[item_id]
+        del self._items[item_id]
+        self._casted_coordinates.pop(item_id, None)
+        self._changed()
 
     ##############################################
 
@@ -218,14 +449,49 @@ class GraphicSceneScope:
 
     ##############################################
 
+    def item_changed(self, item: GraphicItem) -> None:
+        """Mark the item to be updated in the rtree and the display list"""
+        item_id = id(item)
+        self._casted_coordinates.pop(item_id, None)
+        if item_id in self._items:
+            self._damage(item)
+        if self._rtree is not None:
+            self._dirty_items.add(item_id)
+        self._changed()
+
+    ##############################################
+
+    def _build_rtree(self) -> None:
+
+        """Build the rtree using bulk loading"""
+
+        self._logger.info('Build rtree for {} items'.format(len(self._items)))
+        cache = self._item_bounding_box_cache
+        cache.clear()
+        for item_id, item in self._items.items():
+            cache[item_id] = item.bounding_box.bounding_box   # Fixme: name
+        if cache:
+            # Stream loading requires a non empty stream
+            stream = ((item_id, bounding_box, None) for item_id, bounding_box in cache.items())
+            self._rtree = rtree.index.Index(stream)
+        else:
+            self._rtree = rtree.index.Index()
+        self._dirty_items.clear()
+
+    ##############################################
+
     def update_rtree(self) -> None:
-        for item in self._items.values():
-            if item.dirty:
-                self.update_rtree_item(item)
+        if self._rtree is None:
+            self._build_rtree()
+        elif self._dirty_items:
+            items = self._items
+            for item_id in self._dirty_items:
+                self.update_rtree_item(items[item_id])
+            self._dirty_items.clear()
 
     ##############################################
 
-    def update_rtree_item(self: GraphicItem, item, insert=True) -> None:
+    def update_rtree_item(self, item: GraphicItem, insert: bool = True) -> None:
         item_id = id(item)
         old_bounding_box = self._item_bounding_box_cache.pop(item_id, None)
         if old_bounding_box is not None:
@@ -242,14 +508,22 @@ class GraphicSceneScope:
 
     ##############################################
 
+    def item_ids_in_bounding_box(self, bounding_box) -> set:
+        """Return the set of item ids which intersect the bounding box, *bounding_box* can be an
+        :class:`Interval2D` or a tuple (x_inf, y_inf, x_sup, y_sup).
+
+        """
+        if isinstance(bounding_box, Interval2D):
+            bounding_box = bounding_box.bounding_box
+        self.update_rtree()
+        return set(self._rtree.intersection(bounding_box))
+
+    ##############################################
+
     def item_in_bounding_box(self, bounding_box) -> None:
-        # Fixme: Interval2D ok ?
         # print('item_in_bounding_box', bounding_box)
-        item_ids = self._rtree.intersection(bounding_box)
-        if item_ids:
-            return [self._items[item_id] for item_id in item_ids]
-        else:
-            return None
+        item_ids = self.item_ids_in_bounding_box(bounding_box)
+        return [self._items[item_id] for item_id in item_ids]
 
     ##############################################
 
@@ -400,7 +674,7 @@ class GraphicSceneScope:
 
         """
 
-        item = self.add_item(GraphicItem.PathItem, path.p0, path_style: GraphicPathStyle, user_data)
+        item = self.add_item(GraphicItem.PathItem, path.p0, path_style, user_data)
 
         # cf. add_as_path_segments
         for segment in path:
@@ -414,7 +688,7 @@ class GraphicSceneScope:
                 item.cubic_to(segment.point1, segment.point2, segment.point3)
             elif isinstance(segment, Path.ArcSegment):
                 pass
-            elif isinstance(segment, Path.StringedQuadtraticBezierSegment):
+            elif isinstance(segment, Path.StringedQuadraticBezierSegment):
                 pass
             elif isinstance(segment, Path.StringedCubicBezierSegment):
                 pass
@@ -504,7 +778,7 @@ class GraphicSceneScope:
                 add_cubic(segment)
             elif isinstance(segment, Path.ArcSegment):
                 add_ellipse(segment)
-            elif isinstance(segment, Path.StringedQuadtraticBezierSegment):
+            elif isinstance(segment, Path.StringedQuadraticBezierSegment):
                 pass
             elif isinstance(segment, Path.StringedCubicBezierSegment):
                 pass
@@ -97,19 +97,52 @@ class EzdxfPainter(DxfPainterBase):
         # for line_type in self._drawing.linetypes:
         #     print('{}: {}'.format(line_type.dxf.name, line_type.dxf.description))
 
+        # dxfattribs are shared by the items having the same style
+        self._style_cache = {}
+        # connected segments having the same style are merged in a polyline
+        self._chain_points = []
+        self._chain_style = None
+
         self.paint()
         self._drawing.saveas(path)
 
     ##############################################
 
-    def cast_position(self, position):
-        return super().cast_position(position) * 10 # Fixme: cm -> mm
+    def paint(self, clip=None):
+        super().paint(clip)
+        self._flush_chain()
+
+    ##############################################
+
+    def scene_to_painter(self, position):
+        return position * 10 # Fixme: cm -> mm
+
+    def scene_to_painter_array(self, coordinates):
+        return coordinates * 10
 
     ##############################################
 
     def _graphic_style(self, item):
-        # cf. https://ezdxf.readthedocs.io/en/latest/graphic_base_class.html#common-dxf-attributes-for-dxf-r13-or-later
+
+        """Return the dxfattribs for the style of an item.
+
+        The returned dict is cached and thus must not be modified.
+
+        """
+
         path_style = item.path_style
+        stroke_color = path_style.stroke_color
+        key = (None if stroke_color is None else stroke_color.name, path_style.stroke_style)
+        dxfattribs = self._style_cache.get(key)
+        if dxfattribs is None:
+            dxfattribs = self._make_graphic_style(path_style)
+            self._style_cache[key] = dxfattribs
+        return dxfattribs
+
+    ##############################################
+
+    def _make_graphic_style(self, path_style):
+        # cf. https://ezdxf.readthedocs.io/en/latest/graphic_base_class.html#common-dxf-attributes-for-dxf-r13-or-later
         if path_style.stroke_color is None:
             return {'linetype': 'PHANTOM', 'color': 2} # Fixme:
         color = self.__COLOR__[path_style.stroke_color.name] # see also true_color color_name (AutoCAD R2004)
@@ -120,30 +153,95 @@ class EzdxfPainter(DxfPainterBase):
 
     ##############################################
 
+    def _flush_chain(self):
+
+        """Write the pending chain of segments"""
+
+        points = self._chain_points
+        if len(points) < 2:
+            self._chain_points = []
+            self._chain_style = None
+            return
+        dxfattribs = self._chain_style
+        if len(points) == 2:
+            self._model_space.add_line(*points, dxfattribs=dxfattribs)
+        else:
+            closed = points[0] == points[-1]
+            if closed:
+                points.pop()
+            self._model_space.add_lwpolyline(points, format='xy', close=closed, dxfattribs=dxfattribs)
+        self._chain_points = []
+        self._chain_style = None
+
+    ##############################################
+
+    def _symbol_block(self, name, builder):
+
+        """Return the name of the block for a symbol, the block is created by calling *builder* with
+        the block layout the first time.
+
+        """
+
+        blocks = self._drawing.blocks
+        if name not in blocks:
+            builder(blocks.new(name=name))
+        return name
+
+    ##############################################
+
+    def _insert_symbol(self, name, builder, position, dxfattribs):
+        self._flush_chain()
+        self._symbol_block(name, builder)
+        self._model_space.add_blockref(name, position, dxfattribs=dxfattribs)
+
+    ##############################################
+
     def paint_TextItem(self, item):
-        position = self.cast_position(item.position)
+        self._flush_chain()
+        position = self.cast_item_position(item)
         # Fixme: anchor position
         # https://ezdxf.readthedocs.io/en/latest/tutorials/text.html
         self._model_space.add_text(item.text).set_pos(list(position), align='CENTER')
 
     ##############################################
 
+    POINT_BLOCK = 'PATRO_POINT'
+    POINT_RADIUS = 1 # mm
+
+    @classmethod
+    def _build_point_block(cls, block):
+        # color and linetype are set by the INSERT
+        block.add_circle((0, 0), cls.POINT_RADIUS, dxfattribs={'color': 0, 'linetype': 'BYBLOCK'})
+
     def paint_CircleItem(self, item):
-        # in fact a graphic dot
-        pass # skipped for DXF
+        # in fact a graphic dot, the symbol is defined once as a block
+        if item.is_closed:
+            position = tuple(self.cast_item_position(item))
+            self._insert_symbol(self.POINT_BLOCK, self._build_point_block, position, self._graphic_style(item))
 
     ##############################################
 
     def paint_SegmentItem(self, item):
-        positions = self.cast_item_coordinates(item)
-        self._model_space.add_line(
-            *positions,
-            dxfattribs=self._graphic_style(item),
-        )
+        point1, point2 = [tuple(position) for position in self.cast_item_positions(item)]
+        dxfattribs = self._graphic_style(item)
+        points = self._chain_points
+        if dxfattribs is self._chain_style and len(points) >= 2 and points[-2:] == [point2, point1]:
+            # back and forth on the last segment which is already written, don't make a zero area polyline
+            self._flush_chain()
+            self._chain_points = [point2]
+            self._chain_style = dxfattribs
+            return
+        if dxfattribs is not self._chain_style or not points or points[-1] != point1:
+            self._flush_chain()
+            points = self._chain_points
+            points.append(point1)
+            self._chain_style = dxfattribs
+        points.append(point2)
 
     ##############################################
 
     def paint_CubicBezierItem(self, item):
+        self._flush_chain()
         positions = self.cast_item_coordinates(item)
         for position in positions:
             position.append(0)
@@ -93,14 +93,14 @@ class MplPainter(Painter):
 
     def paint_TextItem(self, item):
 
-        position = self.cast_position(item.position)
+        position = self.cast_item_position(item)
         # Fixme: anchor position
         self._axes.text(position.x, position.y, item.text)
 
     ##############################################
 
     def paint_CircleItem(self, item):
-        center = list(self.cast_position(item.position))
+        center = list(self.cast_item_position(item))
         circle = plt.Circle(center, .5, color='black')
         self._axes.add_artist(circle)
 
@@ -88,11 +88,20 @@ class Painter:
             except AttributeError:
                 pass
         cls.__paint_method__ = paint_method
+        # indexed by the display list opcodes
+        cls.__paint_opcode__ = tuple(paint_method.get(item_cls) for item_cls in GraphicItem.__subclasses__)
 
     ##############################################
 
     def __init__(self, scene):
         self._scene = scene
+        self._number_of_painted_items = 0
+        self._number_of_culled_items = 0
+        # command being painted
+        self._painter_coordinates = None   # coordinates of the painted commands in the painter coordinate system
+        self._item = None
+        self._item_index = None
+        self._item_offsets = None   # (start, stop) in _painter_coordinates
 
     ##############################################
 
@@ -106,17 +115,94 @@ class Painter:
 
     ##############################################
 
-    def paint(self):
+    @property
+    def number_of_painted_items(self):
+        """Number of items painted by the last call to :meth:`paint`"""
+        return self._number_of_painted_items
+
+    @property
+    def number_of_culled_items(self):
+        """Number of items skipped by the last call to :meth:`paint`, hidden or outside the clip region"""
+        return self._number_of_culled_items
+
+    ##############################################
+
+    def paint(self, clip=None):
+
+        """Paint the scene, if *clip* is an :class:`Interval2D` then only the items which intersect this
+        region are painted.
+
+        """
 
         if self._scene is None:
             return
 
         # Fixme: GraphicItemScope
-        for item in self._scene.z_value_iter():
-            try:
-                self.__paint_method__[item.__class__](self, item)
-            except KeyError:
-                raise NotImplementedError('{} is not implemented in painter'.format(item.__class__))
+        # The display list is shared by the painters and only compiled when the scene changes
+        display_list = self._scene.display_list
+        if clip is None:
+            indexes = range(len(display_list))
+        else:
+            indexes = display_list.indexes_of(self._scene.item_ids_in_bounding_box(clip))
+
+        self.paint_commands(display_list, indexes)
+
+        self._number_of_painted_items = len(indexes)
+        self._number_of_culled_items = len(self._scene) - len(indexes)
+
+    ##############################################
+
+    def paint_commands(self, display_list, indexes):
+
+        """Paint the commands of a display list given by their indexes.
+
+        The positions are read from the compiled display list, which is never modified, thus it can be
+        painted in another thread.
+
+        """
+
+        items = display_list.items
+        opcodes = display_list.opcodes.tolist()
+        paint_opcode = self.__paint_opcode__
+        # convert at once the positions of the painted commands only
+        coordinates, offsets = display_list.gather(indexes)
+        self._painter_coordinates = self.scene_to_painter_array(coordinates).tolist()
+        offsets = offsets.tolist()
+        try:
+            for i, index in enumerate(indexes):
+                item = items[index]
+                method = paint_opcode[opcodes[index]]
+                if method is None:
+                    raise NotImplementedError('{} is not implemented in painter'.format(item.__class__))
+                self._item = item
+                self._item_index = index
+                self._item_offsets = (offsets[i], offsets[i+1])
+                method(self, item)
+        finally:
+            self._painter_coordinates = None
+            self._item = None
+            self._item_index = None
+            self._item_offsets = None
+
+    ##############################################
+
+    def scene_to_painter(self, position):
+        """Convert a position in scene coordinates to the painter coordinate system"""
+        return position
+
+    def scene_to_painter_array(self, coordinates):
+        """Vectorised :meth:`scene_to_painter` for an array of shape (N, 2)"""
+        return coordinates
+
+    def make_position(self, x, y):
+        """Return a position in the painter coordinate system"""
+        return Vector2D(x, y)
+
+    ##############################################
+
+    def _item_coordinates(self):
+        start, stop = self._item_offsets
+        return self._painter_coordinates[start:stop]
 
     ##############################################
 
@@ -125,12 +211,26 @@ class Painter:
         *position* can be a coordinate name string of a:class:`Vector2D`.
 
         """
-        return self._scene.cast_position(position)
+        return self.scene_to_painter(self._scene.cast_position(position))
 
     ##############################################
 
     def cast_item_positions(self, item):
-        return [self.cast_position(position) for position in item.positions]
+        if item is self._item:
+            # positions are already cast in the display list
+            make_position = self.make_position
+            return [make_position(x, y) for x, y in self._item_coordinates()]
+        else:
+            return [self.cast_position(position) for position in item.positions]
+
+    ##############################################
+
+    def cast_item_position(self, item):
+        """Return the position of an item having a single position"""
+        if item is self._item:
+            return self.make_position(*self._item_coordinates()[0])
+        else:
+            return self.cast_position(item.position)
 
     ##############################################
 
@@ -111,8 +111,11 @@ class ReportlabPainter(PdfPainterBase):
 
     ##############################################
 
-    def cast_position(self, position):
-        return super().cast_position(position) * cm * .7 # Fixme:
+    def scene_to_painter(self, position):
+        return position * cm * .7 # Fixme:
+
+    def scene_to_painter_array(self, coordinates):
+        return coordinates * (cm * .7)
 
     ##############################################
 
@@ -128,14 +131,14 @@ class ReportlabPainter(PdfPainterBase):
     ##############################################
 
     def paint_TextItem(self, item):
-        position = self.cast_position(item.position)
+        position = self.cast_item_position(item)
         # Fixme: anchor position
         self._canvas.drawString(position.x, position.y, item.text)
 
     ##############################################
 
     def paint_CircleItem(self, item):
-        position = self.cast_position(item.position)
+        position = self.cast_item_position(item)
         self._canvas.saveState()
         self._canvas.setFillColor('black')
         self._canvas.circle(position.x, position.y, 2*mm, fill=1)
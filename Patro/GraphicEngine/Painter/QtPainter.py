@@ -33,15 +33,21 @@ from IntervalArithmetic import Interval2D
 
 from QtShim.QtCore import (
     Property, Signal, Slot, QObject,
-    QRectF, QSize, QSizeF, QPointF, Qt,
+    QLineF, QRectF, QSize, QSizeF, QPointF, Qt,
+    QRunnable, QThread, QThreadPool,
 )
-from QtShim.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPainterPath, QBrush, QPen
+from QtShim.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPainterPath, QBrush, QPen, QTransform
 # from QtShim.QtQml import qmlRegisterType
 from QtShim.QtQuick import QQuickPaintedItem
 
 from .Painter import Painter
+from .TileCache import TileCache
 from Patro.GeometryEngine.Vector import Vector2D
-from Patro.GraphicEngine.GraphicScene.GraphicItem import LinearSegment, QuadraticSegment, CubicSegment
+from Patro.GraphicEngine.GraphicScene.DisplayList import DisplayList
+from Patro.GraphicEngine.GraphicScene.GraphicItem import (
+    LinearSegment, QuadraticSegment, CubicSegment,
+    SegmentItem, PolylineItem, PolygonItem, QuadraticBezierItem, CubicBezierItem, TextItem,
+)
 from Patro.GraphicEngine.GraphicScene.Scene import GraphicScene
 from Patro.GraphicStyle import StrokeStyle, CapStyle, JoinStyle
 
@@ -65,6 +71,67 @@ class QtScene(QObject, GraphicScene):
 
 ####################################################################################################
 
+class QtPaintCache:
+
+    """Class to cache the Qt objects which can be reused from one paint to another.
+
+    Paths are built in scene coordinates, thus they are independent of the viewport and can be
+    shared by the tile renderers.
+
+    """
+
+    ##############################################
+
+    def __init__(self):
+        self._fonts = {}   # (family, point_size) -> QFont
+        self._paths = {}   # item_id -> (item class, level of detail, coordinates, QPainterPath)
+
+    ##############################################
+
+    def font(self, font):
+        key = (font.family, font.point_size)
+        qfont = self._fonts.get(key)
+        if qfont is None:
+            qfont = self._fonts[key] = QFont(font.family, font.point_size) # weight, italic = False
+        return qfont
+
+    ##############################################
+
+    def get_path(self, item, coordinates, lod=0):
+        """Return the cached path of an item if its coordinates and level of detail didn't change,
+        else None.
+
+        """
+        entry = self._paths.get(id(item))
+        if entry is not None:
+            item_cls, cached_lod, cached_coordinates, path = entry
+            if (item_cls is item.__class__ and cached_lod == lod
+                and np.array_equal(cached_coordinates, coordinates)):
+                return path
+        return None
+
+    def add_path(self, item, coordinates, path, lod=0):
+        # coordinates can be a view on the display list
+        self._paths[id(item)] = (item.__class__, lod, coordinates.copy(), path)
+
+    ##############################################
+
+    def prune(self, display_list):
+        """Remove the paths of the items which are no longer in the display list"""
+        if len(self._paths) > len(display_list):
+            alive = set(id(item) for item in display_list.items)
+            for item_id in list(self._paths):
+                if item_id not in alive:
+                    self._paths.pop(item_id, None)
+
+    ##############################################
+
+    def clear(self):
+        self._fonts.clear()
+        self._paths.clear()
+
+####################################################################################################
+
 class QtPainter(Painter):
 
     """Class to implement a Qt painter."""
@@ -91,14 +158,41 @@ class QtPainter(Painter):
         JoinStyle.SvgMiterJoin: Qt.SvgMiterJoin,
     }
 
+    # Level of detail
+
+    # items whose positions enclose the geometry, thus they can be culled using the display list extents
+    __EXTENT_ITEMS__ = (SegmentItem, PolylineItem, PolygonItem, QuadraticBezierItem, CubicBezierItem)
+
+    # control polygons smaller than this size in pixel are not drawn
+    LOD_CONTROL_MIN_SIZE = 20
+    # curves requiring more segments are flattened by Qt
+    LOD_MAX_CURVE_SEGMENTS = 256
+
     _logger = _module_logger.getChild('QtPainter')
 
     ##############################################
 
-    def __init__(self, scene=None):
+    def __init__(self, scene=None, paint_cache=None):
         super().__init__(scene)
         self._show_grid = True
 
+        # hide the details which cannot be seen at the current scale
+        self._use_lod = True
+        self._lod_scale = None   # pixel per scene unit
+        self._number_of_hidden_items = 0
+
+        if paint_cache is None:
+            paint_cache = QtPaintCache()
+        self._paint_cache = paint_cache
+        # (id(path_style), selected) -> (pen, brush), built once per paint
+        self._pens = {}
+        self._painted_display_list = None
+        # consecutive items sharing the same style are drawn at once
+        self._batch_key = None
+        self._batch_style = None
+        self._batch_lines = []   # segments in viewport coordinates
+        self._batch_paths = []   # paths in scene coordinates
+
         # self._paper = paper
         # self._translation = QPointF(0, 0)
         # self._scale = 1
@@ -156,14 +250,28 @@ class QtPainter(Painter):
 
     ##############################################
 
-    def paint(self, painter):
+    def paint(self, painter, clip=None):
+
+        """Paint the scene, if *clip* is an :class:`Interval2D` then only this part of the visible area
+        is repainted.
+
+        """
+
         if bool(self):
             self._logger.info('Start painting')
             self._painter = painter
-            if self._show_grid:
-                self._paint_grid()
-            super().paint()
-            self._logger.info('Paint done')
+            area = self.scene_area
+            if area is not None and clip is not None:
+                if not area.intersect(clip):
+                    return
+                area = area & clip
+            if self._show_grid and area is not None:
+                # the grid step must not depend on the clip
+                self._paint_grid(area, self._grid_step(self.scene_area))
+            # only paint the items within the visible area
+            super().paint(area)
+            self._logger.info('Paint done: {} items, {} culled, {} hidden'.format(
+                self.number_of_painted_items, self.number_of_culled_items, self._number_of_hidden_items))
         else:
             # Fixme: also protected in _paint_grid
             self._logger.warning('Scene is undefined')
@@ -190,67 +298,238 @@ class QtPainter(Painter):
 
     ##############################################
 
-    def cast_position(self, position):
-        """Cast coordinate, apply scope transformation and convert scene to viewport, *position* can be a
-        coordinate name string of a:class:`Vector2D`.
+    def scene_to_viewport_transform(self):
+        """Return the :class:`QTransform` from scene to viewport coordinates"""
+        return QTransform.fromScale(self._scale, self._scale)
 
-        """
-        position = super().cast_position(position)
+    ##############################################
+
+    def scene_to_painter(self, position):
         return self.scene_to_viewport(position)
 
+    def scene_to_painter_array(self, coordinates):
+        return coordinates * self._scale
+
+    def make_position(self, x, y):
+        return QPointF(x, y)
+
     ##############################################
 
-    def _set_pen(self, item):
+    def paint_commands(self, display_list, indexes):
+        self._pens = {}
+        self._painted_display_list = display_list
+        self._number_of_hidden_items = 0
+        if self._use_lod:
+            self._lod_scale = self.length_scene_to_viewport(1.)
+            indexes = self._lod_filter(display_list, indexes)
+        try:
+            super().paint_commands(display_list, indexes)
+            self._flush_batch()
+        finally:
+            self._pens = {}
+            self._painted_display_list = None
+            self._lod_scale = None
+            self._reset_batch()
+
+    ##############################################
+
+    def _lod_filter(self, display_list, indexes):
+
+        """Return the indexes of the commands which are visible at the current scale.
+
+        A command is hidden if the scale is below the *min_scale* of its style, or if its extent in
+        pixel is below the *min_size* of its style.
+
+        """
+
+        if not len(indexes):
+            return indexes
+
+        scale = self._lod_scale
+        indexes = np.asarray(indexes, dtype=np.int64)
+
+        # the last entry is used by the items without path style
+        styles = display_list.styles
+        min_scales = np.array([style.min_scale or 0 for style in styles] + [0], dtype=np.float64)
+        min_sizes = np.array([style.min_size for style in styles] + [0], dtype=np.float64)
+        style_indexes = display_list.style_indexes[indexes]
+
+        hidden = scale < min_scales[style_indexes]
+        extent_opcodes = [DisplayList.opcode_of(item_cls) for item_cls in self.__EXTENT_ITEMS__]
+        has_extent = np.isin(display_list.opcodes[indexes], extent_opcodes)
+        hidden |= has_extent & (display_list.extents[indexes] * scale < min_sizes[style_indexes])
+
+        self._number_of_hidden_items = int(np.count_nonzero(hidden))
+        return indexes[~hidden].tolist()
+
+    ##############################################
+
+    def _is_too_small(self, item, size):
+        """Test if an item having a size in pixel is hidden by the level of detail"""
+        return self._lod_scale is not None and size < item.path_style.min_size
+
+    ##############################################
+
+    def _make_pen(self, path_style, selected):
 
-        path_syle = item.path_style
-        # print('_set_pen', item, path_syle)
-        if item.selected:
+        if selected:
             color = QColor('red') # Fixme: style
         else:
-            color = path_syle.stroke_color
+            color = path_style.stroke_color
             if color is not None:
                 color = QColor(str(color))
-                color.setAlphaF(path_syle.stroke_alpha)
+                color.setAlphaF(path_style.stroke_alpha)
             else:
                 color = None
-        line_style = self.__STROKE_STYLE__[path_syle.stroke_style]
-        line_width = path_syle.line_width_as_float
+        line_style = self.__STROKE_STYLE__[path_style.stroke_style]
+        line_width = path_style.line_width_as_float
 
         # Fixme: selection style
-        if item.selected:
+        if selected:
             line_width *= 4
 
-        fill_color = path_syle.fill_color
+        fill_color = path_style.fill_color
         if fill_color is not None:
-            color = QColor(str(fill_color))
-            color.setAlphaF(path_syle.fill_alpha)
-            self._painter.setBrush(color)
-            # return None
+            fill_color = QColor(str(fill_color))
+            fill_color.setAlphaF(path_style.fill_alpha)
+            brush = QBrush(fill_color)
         else:
-            self._painter.setBrush(Qt.NoBrush)
+            brush = QBrush(Qt.NoBrush)
 
-        # print(item, color, line_style)
-        if color is None or line_style is StrokeStyle.NoPen:
+        if color is None or line_style == Qt.NoPen:
             # invisible item
-            pen = QPen(Qt.NoPen)
-            # print('Warning Pen:', item, item.user_data, color, line_style)
-            return None
+            pen = None
         else:
             pen = QPen(
                 QBrush(color),
                 line_width,
                 line_style,
-                self.__CAP_STYLE__[path_syle.cap_style],
-                self.__JOIN_STYLE__[path_syle.join_style],
+                self.__CAP_STYLE__[path_style.cap_style],
+                self.__JOIN_STYLE__[path_style.join_style],
             )
+            # the line width is in pixel when a path is drawn in scene coordinates
+            pen.setCosmetic(True)
+
+        return pen, brush
+
+    ##############################################
+
+    def _apply_style(self, path_style, selected):
+
+        """Set the pen and the brush for a style, return the pen or None if the stroke is invisible.
+
+        Pens and brushes are built once per style during a paint.
+
+        """
+
+        key = (id(path_style), selected)
+        pen_brush = self._pens.get(key)
+        if pen_brush is None:
+            pen_brush = self._pens[key] = self._make_pen(path_style, selected)
+        pen, brush = pen_brush
+        self._painter.setBrush(brush)
+        if pen is None:
+            self._painter.setPen(Qt.NoPen)
+        else:
             self._painter.setPen(pen)
-            return pen
+        return pen
 
     ##############################################
 
-    def _paint_grid(self):
+    def _set_pen(self, item):
+        self._flush_batch()
+        return self._apply_style(item.path_style, item.selected)
 
-        area = self.scene_area
+    ##############################################
+
+    def _reset_batch(self):
+        self._batch_key = None
+        self._batch_style = None
+        self._batch_lines = []
+        self._batch_paths = []
+
+    ##############################################
+
+    def _start_batch(self, item):
+
+        """Flush the pending batch if the style of *item* is different"""
+
+        path_style = item.path_style
+        key = (id(path_style), item.selected)
+        if key != self._batch_key:
+            self._flush_batch()
+            self._batch_key = key
+            self._batch_style = (path_style, item.selected)
+
+    ##############################################
+
+    def _flush_batch(self):
+
+        """Draw the pending items sharing the same style"""
+
+        if self._batch_key is None:
+            return
+        pen = self._apply_style(*self._batch_style)
+        if pen is not None:
+            if self._batch_lines:
+                self._painter.drawLines(self._batch_lines)
+            if self._batch_paths:
+                self._draw_scene_paths(self._batch_paths)
+        self._reset_batch()
+
+    ##############################################
+
+    def _draw_scene_paths(self, paths):
+        painter = self._painter
+        painter.save()
+        painter.setTransform(self.scene_to_viewport_transform(), True)
+        for path in paths:
+            painter.drawPath(path)
+        painter.restore()
+
+    ##############################################
+
+    def _item_scene_coordinates(self, item):
+        if item is self._item and self._painted_display_list is not None:
+            return self._painted_display_list.coordinates_of(self._item_index)
+        else:
+            return self._scene.casted_coordinates(item)
+
+    ##############################################
+
+    def _scene_path(self, item, closed=False):
+
+        """Return a path in scene coordinates joining the positions of an item, the path is reused as
+        long as the item is unchanged.
+
+        """
+
+        coordinates = self._item_scene_coordinates(item)
+        path = self._paint_cache.get_path(item, coordinates)
+        if path is None:
+            path = QPainterPath()
+            vertices = coordinates.tolist()
+            path.moveTo(*vertices[0])
+            for x, y in vertices[1:]:
+                path.lineTo(x, y)
+            if closed:
+                path.closeSubpath()
+            self._paint_cache.add_path(item, coordinates, path)
+        return path
+
+    ##############################################
+
+    @staticmethod
+    def _grid_step(area):
+        length = min(area.x.length, area.y.length)
+        return max(10**int(math.log10(length)), 10)
+
+    ##############################################
+
+    def _paint_grid(self, area=None, step=None):
+
+        if area is None:
+            area = self.scene_area
         # Fixme:
         if area is None:
             return
@@ -265,7 +544,8 @@ class QtPainter(Painter):
         self._painter.setPen(pen)
         self._painter.setBrush(Qt.NoBrush)
 
-        step = max(10**int(math.log10(length)), 10)
+        if step is None:
+            step = self._grid_step(area)
         small_step = step // 10
         self._logger.info('Grid of {}/{} for {:.1f} mm'.format(step, small_step, length))
         self._paint_axis_grid(xinf, xsup, yinf, ysup, True, step)
@@ -324,8 +604,10 @@ class QtPainter(Painter):
 
     def paint_CircleItem(self, item):
 
-        center = self.cast_position(item.position)
         radius = self.length_scene_to_viewport(item.radius)
+        if self._is_too_small(item, 2*radius):
+            return
+        center = self.cast_item_position(item)
 
         pen = self._set_pen(item)
 
@@ -335,9 +617,11 @@ class QtPainter(Painter):
 
     def paint_EllipseItem(self, item):
 
-        center = self.cast_position(item.position)
         radius_x = self.length_scene_to_viewport(item.radius_x)
         radius_y = self.length_scene_to_viewport(item.radius_y)
+        if self._is_too_small(item, 2*max(radius_x, radius_y)):
+            return
+        center = self.cast_item_position(item)
 
         pen = self._set_pen(item)
 
@@ -346,17 +630,91 @@ class QtPainter(Painter):
 
     ##############################################
 
-    def _paint_cubic(self, item, vertices):
+    @staticmethod
+    def _flattening_segments(points, tolerance):
+        """Return the number of segments to flatten a cubic Bézier curve given by an array of shape
+        (4, 2) within *tolerance*, using Wang's formula.
 
-        pen = self._set_pen(item)
-        path = QPainterPath()
-        path.moveTo(vertices[0])
-        path.cubicTo(*vertices[1:])
-        self._painter.drawPath(path)
+        """
+        second_differences = points[:-2] - 2*points[1:-1] + points[2:]
+        deviation = np.sqrt((second_differences**2).sum(axis=1)).max()
+        # n = sqrt(d(d-1)/8 * deviation / tolerance) for a curve of degree d
+        return max(1, math.ceil(math.sqrt(.75 * deviation / tolerance)))
+
+    ##############################################
+
+    @staticmethod
+    def _cubic_points(points, number_of_segments):
+        """Evaluate a cubic Bézier curve at evenly spaced parameters"""
+        t = np.linspace(0, 1, number_of_segments + 1)[:, np.newaxis]
+        u = 1 - t
+        p0, p1, p2, p3 = points
+        return u**3*p0 + 3*u**2*t*p1 + 3*u*t**2*p2 + t**3*p3
+
+    ##############################################
+
+    def _curve_scene_path(self, item):
+
+        """Return a path in scene coordinates for a quadratic or cubic Bézier curve.
+
+        If the level of detail is enabled, the curve is flattened to a polyline whose tolerance matches
+        the screen resolution.
+
+        """
+
+        coordinates = self._item_scene_coordinates(item)
+        points = coordinates
+        if len(points) == 3:
+            # elevate to a cubic
+            p0, p1, p2 = points
+            points = np.array((p0, p0 + (p1 - p0)*2/3, p2 + (p1 - p2)*2/3, p2))
+
+        number_of_segments = 0
+        if self._lod_scale is not None:
+            tolerance = item.path_style.flatness / self._lod_scale
+            number_of_segments = self._flattening_segments(points, tolerance)
+            if number_of_segments > self.LOD_MAX_CURVE_SEGMENTS:
+                number_of_segments = 0
+
+        path = self._paint_cache.get_path(item, coordinates, number_of_segments)
+        if path is None:
+            path = QPainterPath()
+            path.moveTo(*points[0].tolist())
+            if number_of_segments:
+                for x, y in self._cubic_points(points, number_of_segments)[1:].tolist():
+                    path.lineTo(x, y)
+            else:
+                path.cubicTo(*[QPointF(x, y) for x, y in points[1:].tolist()])
+            self._paint_cache.add_path(item, coordinates, path, number_of_segments)
+        return path
+
+    ##############################################
+
+    def _paint_curve(self, item):
+        path = self._curve_scene_path(item)
+        path_style = item.path_style
+        show_control = getattr(path_style, 'show_control', False)
+        if path_style.fill_color is None and not show_control:
+            self._start_batch(item)
+            self._batch_paths.append(path)
+        else:
+            self._set_pen(item)
+            self._draw_scene_paths((path,))
+            if show_control:
+                self._paint_control(item, self.cast_item_positions(item))
+
+    ##############################################
+
+    def _paint_control(self, item, vertices):
 
         path_style = item.path_style
         # if path_style.show_control:
         if getattr(path_style, 'show_control', False):
+            if self._lod_scale is not None:
+                xs = [vertex.x() for vertex in vertices]
+                ys = [vertex.y() for vertex in vertices]
+                if max(max(xs) - min(xs), max(ys) - min(ys)) < self.LOD_CONTROL_MIN_SIZE:
+                    return
             color = QColor(str(path_style.control_color))
             brush = QBrush(color)
             pen = QPen(brush, 1) # Fixme
@@ -378,20 +736,18 @@ class QtPainter(Painter):
     ##############################################
 
     def paint_QuadraticBezierItem(self, item):
-
-        vertices = [self.cast_position(position) for position in item.cubic_positions]
-        self._paint_cubic(item, vertices)
+        self._paint_curve(item)
 
     ##############################################
 
     def paint_CubicBezierItem(self, item):
-        vertices = self.cast_item_positions(item)
-        self._paint_cubic(item, vertices)
+        self._paint_curve(item)
 
     ##############################################
 
     def paint_ImageItem(self, item):
 
+        self._flush_batch()
         vertices = self.cast_item_positions(item)
         rec = QRectF(vertices[0], vertices[1])
 
@@ -405,34 +761,35 @@ class QtPainter(Painter):
     ##############################################
 
     def paint_SegmentItem(self, item):
-        self._set_pen(item)
-        vertices = self.cast_item_positions(item)
-        self._painter.drawLine(*vertices)
+        # segments are drawn by a single drawLines call per style
+        self._start_batch(item)
+        self._batch_lines.append(QLineF(*self.cast_item_positions(item)))
 
     ##############################################
 
     def paint_PolylineItem(self, item):
-        self._set_pen(item)
-        vertices = self.cast_item_positions(item)
-        path = QPainterPath()
-        path.moveTo(vertices[0])
-        for vertex in vertices[1:]:
-            path.lineTo(vertex)
-        self._painter.drawPath(path)
+        path = self._scene_path(item)
+        if item.path_style.fill_color is None:
+            self._start_batch(item)
+            self._batch_paths.append(path)
+        else:
+            # a filled path cannot be merged
+            self._set_pen(item)
+            self._draw_scene_paths((path,))
 
     ##############################################
 
     def paint_PolygonItem(self, item):
+        path = self._scene_path(item, closed=True)
         self._set_pen(item)
-        vertices = self.cast_item_positions(item)
         # Fixme: fill ???
-        self._painter.drawPolygon(*vertices) # API is like this
+        self._draw_scene_paths((path,))
 
     ##############################################
 
     def paint_PathItem(self, item):
         self._set_pen(item)
-        position = self.cast_position(item.position)
+        position = self.cast_item_position(item)
         path = QPainterPath()
         path.moveTo(position)
         for segment in item:
@@ -458,10 +815,13 @@ class QtPainter(Painter):
     ##############################################
 
     def paint_TextItem(self, item):
-        position = self.cast_position(item.position)
-
         font = item.font
-        qfont = QFont(font.family, font.point_size) # weight, italic = False
+        if self._lod_scale is not None and font.min_scale is not None and self._lod_scale < font.min_scale:
+            return
+        self._flush_batch()
+        position = self.cast_item_position(item)
+
+        qfont = self._paint_cache.font(font)
 
         # Fixme: anchor position
         # font_metrics = QFontMetrics(qfont)
@@ -635,6 +995,23 @@ class ViewportArea:
 
     ##############################################
 
+    def scene_to_viewport_array(self, coordinates):
+        """Vectorised :meth:`scene_to_viewport` for an array of shape (N, 2)"""
+        translation = np.array((self._translation.x(), self._translation.y()))
+        coordinates = (coordinates + translation) * self._scale
+        coordinates[:,1] *= -1
+        return coordinates
+
+    ##############################################
+
+    def scene_to_viewport_transform(self):
+        """Return :meth:`scene_to_viewport` as a :class:`QTransform`"""
+        scale = self._scale
+        translation = self._translation
+        return QTransform(scale, 0, 0, -scale, translation.x()*scale, -translation.y()*scale)
+
+    ##############################################
+
     def viewport_to_scene(self, position):
         point = QPointF(position.x(), -position.y())
         point /= self._scale
@@ -643,6 +1020,22 @@ class ViewportArea:
 
     ##############################################
 
+    def scene_to_viewport_rect(self, area, margin=0):
+        """Return the :class:`QRectF` of an area in scene coordinates, enlarged by *margin* pixels"""
+        top_left = self.scene_to_viewport(Vector2D(area.x.inf, area.y.sup))
+        bottom_right = self.scene_to_viewport(Vector2D(area.x.sup, area.y.inf))
+        return QRectF(top_left, bottom_right).adjusted(-margin, -margin, margin, margin)
+
+    ##############################################
+
+    def viewport_to_scene_area(self, rect):
+        """Return the area in scene coordinates of a :class:`QRectF`"""
+        x_inf, y_sup = self.viewport_to_scene(rect.topLeft())
+        x_sup, y_inf = self.viewport_to_scene(rect.bottomRight())
+        return Interval2D((x_inf, x_sup), (y_inf, y_sup))
+
+    ##############################################
+
     def length_scene_to_viewport(self, length):
         return length * self._scale
 
@@ -660,6 +1053,140 @@ class ViewportArea:
 
 ####################################################################################################
 
+class TileArea(ViewportArea):
+
+    """Class to define the area of a tile, it implements the coordinate conversions of
+    :class:`ViewportArea` for a tile image.
+
+    """
+
+    ##############################################
+
+    def __init__(self, scale, column, row, tile_cache):
+        super().__init__()
+        self._scale = scale
+        x_inf, y_inf, x_sup, y_sup = tile_cache.tile_area(scale, column, row)
+        self._area = Interval2D((x_inf, x_sup), (y_inf, y_sup))
+        self._translation = - QPointF(x_inf, y_sup)
+
+####################################################################################################
+
+class TileRenderer(QtPainter):
+
+    """Class to render a tile into a :class:`QImage`.
+
+    The renderer paints a compiled display list or the grid, thus it can run in a worker thread.
+
+    """
+
+    _logger = _module_logger.getChild('TileRenderer')
+
+    ##############################################
+
+    def __init__(self, scene, tile_area, tile_size, display_list=None, indexes=None, grid_step=None,
+                 paint_cache=None):
+        super().__init__(scene, paint_cache)
+        self._tile_area = tile_area
+        self._tile_size = tile_size
+        self._display_list = display_list
+        self._indexes = indexes
+        self._grid_step = grid_step
+
+    ##############################################
+
+    def scene_to_viewport(self, position):
+        return self._tile_area.scene_to_viewport(position)
+
+    def scene_to_painter_array(self, coordinates):
+        return self._tile_area.scene_to_viewport_array(coordinates)
+
+    def scene_to_viewport_transform(self):
+        return self._tile_area.scene_to_viewport_transform()
+
+    def length_scene_to_viewport(self, length):
+        return self._tile_area.length_scene_to_viewport(length)
+
+    def length_viewport_to_scene(self, length):
+        return self._tile_area.length_viewport_to_scene(length)
+
+    ##############################################
+
+    def render(self):
+
+        image = QImage(self._tile_size, self._tile_size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self._painter = painter
+        try:
+            if self._display_list is None:
+                self._paint_grid(self._tile_area.area, self._grid_step)
+            else:
+                self.paint_commands(self._display_list, self._indexes)
+        finally:
+            painter.end()
+            self._painter = None
+
+        return image
+
+####################################################################################################
+
+class RenderJobSignals(QObject):
+
+    # job, image
+    finished = Signal(object, object)
+
+####################################################################################################
+
+class RenderJob(QRunnable):
+
+    """Class to run a :class:`TileRenderer` in a thread pool, the image is delivered by the
+    *finished* signal.
+
+    """
+
+    _logger = _module_logger.getChild('RenderJob')
+
+    ##############################################
+
+    def __init__(self, key, renderer):
+        super().__init__()
+        # a reference is kept by the item until the job is finished
+        self.setAutoDelete(False)
+        self._key = key
+        self._renderer = renderer
+        self._cancelled = False
+        self.signals = RenderJobSignals()
+
+    ##############################################
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
+    ##############################################
+
+    def run(self):
+        if self._cancelled:
+            return
+        try:
+            image = self._renderer.render()
+        except Exception:
+            self._logger.exception('Failed to render tile {}'.format(self._key))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit(self, image)
+
+####################################################################################################
+
 class QtQuickPaintedSceneItem(QQuickPaintedItem, QtPainter):
 
     """Class to implement a painter as Qt Quick item"""
@@ -680,6 +1207,24 @@ class QtQuickPaintedSceneItem(QQuickPaintedItem, QtPainter):
 
         self._viewport_area = ViewportArea()
 
+        # The scene and the grid are rendered in tiles which are reused when the view is panned
+        self._use_tile_cache = True
+        self._tile_cache = TileCache()
+        self._damage_counter = None
+        self._tile_grid_step = None
+
+        # Tiles are rendered by a thread pool, meanwhile the last complete frame is shown
+        self._use_render_thread = True
+        self._thread_pool = QThreadPool()
+        self._thread_pool.setMaxThreadCount(max(1, QThread.idealThreadCount() - 1))
+        self._pending_jobs = {}   # key -> RenderJob
+        self._last_frame = None   # (image, scene area)
+
+        # damage counter of the last call to update_damaged_areas
+        self._update_counter = None
+        # (display list version, largest text extent in pixel)
+        self._text_extent = None
+
     ##############################################
 
     def geometryChanged(self, new_geometry, old_geometry):
@@ -707,6 +1252,12 @@ class QtQuickPaintedSceneItem(QQuickPaintedItem, QtPainter):
     def scene_to_viewport(self, position):
         return self._viewport_area.scene_to_viewport(position)
 
+    def scene_to_painter_array(self, coordinates):
+        return self._viewport_area.scene_to_viewport_array(coordinates)
+
+    def scene_to_viewport_transform(self):
+        return self._viewport_area.scene_to_viewport_transform()
+
     ##############################################
 
     def length_scene_to_viewport(self, length):
@@ -719,6 +1270,249 @@ class QtQuickPaintedSceneItem(QQuickPaintedItem, QtPainter):
 
     ##############################################
 
+    # margin in pixel to take into account the line width and the markers around a tile
+    TILE_MARGIN = 10
+
+    ##############################################
+
+    def _text_margin(self):
+
+        """Return the largest extent in pixel of the texts of the scene.
+
+        A text is indexed by its anchor point, but it is drawn with a size in pixel, thus the areas
+        around a tile or a damage must be enlarged by this margin to find the texts which overlap it.
+
+        """
+
+        display_list = self._scene.display_list
+        if self._text_extent is None or self._text_extent[0] != display_list.version:
+            extent = 0
+            items = display_list.items
+            text_opcode = DisplayList.opcode_of(TextItem)
+            for index in np.flatnonzero(display_list.opcodes == text_opcode).tolist():
+                item = items[index]
+                rect = QFontMetrics(self._paint_cache.font(item.font)).boundingRect(item.text)
+                extent = max(extent, rect.width(), rect.height())
+            self._text_extent = (display_list.version, extent)
+        return self._text_extent[1]
+
+    ##############################################
+
+    def _damage_margin(self):
+        return self.TILE_MARGIN + self._text_margin()
+
+    def _update_tile_cache(self):
+
+        """Invalidate the tiles which intersect the items modified since the last paint"""
+
+        if self._damage_counter is None:
+            areas = None
+        else:
+            areas = self._scene.damaged_areas(self._damage_counter)
+        if areas is None:
+            self._tile_cache.clear('scene')
+        else:
+            for bounding_box in areas:
+                self._tile_cache.invalidate('scene', bounding_box, self._damage_margin())
+        if areas is None or areas:
+            # running jobs paint an outdated display list
+            self._cancel_jobs([key for key in self._pending_jobs if key[0] == 'scene'])
+        self._damage_counter = self._scene.damage_counter
+
+    ##############################################
+
+    def _make_renderer(self, key):
+
+        layer, scale, column, row = key
+        tile_area = TileArea(scale, column, row, self._tile_cache)
+        tile_size = self._tile_cache.tile_size
+        if layer == 'grid':
+            return TileRenderer(self._scene, tile_area, tile_size, grid_step=self._tile_grid_step)
+        else:
+            # the display list and the rtree are only accessed in the GUI thread
+            scene = self._scene
+            display_list = scene.display_list
+            area = tile_area.area
+            # the strokes and the markers of the items around the tile can overlap it
+            margin = self.TILE_MARGIN / scale
+            indexes = set(display_list.indexes_of(scene.item_ids_in_bounding_box(area.enlarge(margin))))
+            text_margin = self._text_margin() / scale
+            if text_margin:
+                opcodes = display_list.opcodes
+                text_opcode = DisplayList.opcode_of(TextItem)
+                item_ids = scene.item_ids_in_bounding_box(area.enlarge(margin + text_margin))
+                indexes.update(index for index in display_list.indexes_of(item_ids)
+                               if opcodes[index] == text_opcode)
+            indexes = sorted(indexes)
+            return TileRenderer(self._scene, tile_area, tile_size, display_list, indexes,
+                                paint_cache=self._paint_cache)
+
+    ##############################################
+
+    def _submit_job(self, key):
+        job = RenderJob(key, self._make_renderer(key))
+        job.signals.finished.connect(self._on_tile_rendered)
+        self._pending_jobs[key] = job
+        self._thread_pool.start(job)
+
+    ##############################################
+
+    def _cancel_jobs(self, keys):
+        for key in keys:
+            job = self._pending_jobs.pop(key)
+            job.cancel()
+            self._thread_pool.tryTake(job)
+
+    ##############################################
+
+    def _on_tile_rendered(self, job, image):
+        # a cancelled job can deliver a stale image
+        if self._pending_jobs.get(job.key) is job:
+            del self._pending_jobs[job.key]
+            self._tile_cache.add(job.key, image, image.sizeInBytes())
+            layer, scale, column, row = job.key
+            tile_size = self._tile_cache.tile_size
+            rect = QRectF(self._tile_position(column, row), QSizeF(tile_size, tile_size))
+            self.update(rect.toAlignedRect())
+
+    ##############################################
+
+    def _tile_position(self, column, row):
+        """Return the position of a tile in viewport coordinates"""
+        area = self._viewport_area.area
+        scale = self._viewport_area.scale_px_by_mm
+        tile_size = self._tile_cache.tile_size
+        # the tile grid origin is at the scene origin
+        return QPointF(column*tile_size - area.x.inf*scale, row*tile_size + area.y.sup*scale)
+
+    ##############################################
+
+    def _clip_area(self, painter):
+
+        """Return the area in scene coordinates which is repainted if it is only a part of the item,
+        else None.
+
+        """
+
+        if not painter.hasClipping():
+            return None
+        rect = painter.clipBoundingRect()
+        if rect.contains(QRectF(0, 0, self.width(), self.height())):
+            return None
+        return self._viewport_area.viewport_to_scene_area(rect)
+
+    ##############################################
+
+    @Slot()
+    def update_damaged_areas(self):
+
+        """Schedule the repaint of the areas of the items modified since the last call, i.e. the union
+        of their old and new bounding boxes.  The whole item is repainted if the damages are unknown.
+
+        """
+
+        if not bool(self._scene):
+            return
+        if self._update_counter is None:
+            areas = None
+        else:
+            areas = self._scene.damaged_areas(self._update_counter)
+        self._update_counter = self._scene.damage_counter
+        if areas is None:
+            self.update()
+        else:
+            for x_inf, y_inf, x_sup, y_sup in areas:
+                area = Interval2D((x_inf, x_sup), (y_inf, y_sup))
+                rect = self._viewport_area.scene_to_viewport_rect(area, self._damage_margin())
+                self.update(rect.toAlignedRect())
+
+    ##############################################
+
+    def _paint_last_frame(self, painter):
+        frame, area = self._last_frame
+        painter.drawImage(self._viewport_area.scene_to_viewport_rect(area), frame)
+
+    ##############################################
+
+    def _save_frame(self, tiles):
+        area = self._viewport_area.area
+        if self._last_frame is not None and self._last_frame[1] == area:
+            return
+        width, height = [int(x) for x in self._viewport_area.viewport_size]
+        frame = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        frame.fill(Qt.transparent)
+        painter = QPainter(frame)
+        for position, image in tiles:
+            painter.drawImage(position, image)
+        painter.end()
+        self._last_frame = (frame, area)
+
+    ##############################################
+
+    def paint(self, painter):
+
+        # only the damaged rectangles are repainted after an edit
+        clip = self._clip_area(painter)
+
+        if not self._use_tile_cache or not bool(self._viewport_area):
+            QtPainter.paint(self, painter, clip)
+            return
+
+        self._update_tile_cache()
+        self._paint_cache.prune(self._scene.display_list)
+
+        area = self._viewport_area.area
+        scale = self._viewport_area.scale_px_by_mm
+
+        layers = []
+        if self._show_grid:
+            step = self._grid_step(area)
+            if step != self._tile_grid_step:
+                self._tile_cache.clear('grid')
+                self._cancel_jobs([key for key in self._pending_jobs if key[0] == 'grid'])
+                self._tile_grid_step = step
+            layers.append('grid')
+        layers.append('scene')
+
+        if clip is None:
+            painted_area = area
+        elif area.intersect(clip):
+            painted_area = area & clip
+        else:
+            return
+
+        tiles = []
+        keys = set()
+        complete = True
+        for layer in layers:
+            for column, row in self._tile_cache.tiles_for(painted_area.bounding_box, scale):
+                key = (layer, scale, column, row)
+                keys.add(key)
+                image = self._tile_cache.get(key)
+                if image is None:
+                    # the few damaged tiles are rendered at once so that an edit is shown immediately
+                    if self._use_render_thread and clip is None:
+                        complete = False
+                        if key not in self._pending_jobs:
+                            self._submit_job(key)
+                        continue
+                    image = self._make_renderer(key).render()
+                    self._tile_cache.add(key, image, image.sizeInBytes())
+                tiles.append((self._tile_position(column, row), image))
+
+        if clip is None:
+            # the view changed
+            self._cancel_jobs([key for key in self._pending_jobs if key not in keys])
+            if complete:
+                self._save_frame(tiles)
+        if not complete and self._last_frame is not None:
+            # show the last frame scaled until the tiles are rendered
+            self._paint_last_frame(painter)
+        for position, image in tiles:
+            painter.drawImage(position, image)
+
+    ##############################################
+
     sceneChanged = Signal()
 
     @Property(QtScene, notify=sceneChanged)
@@ -732,6 +1526,12 @@ class QtQuickPaintedSceneItem(QQuickPaintedItem, QtPainter):
             self._logger.info('set scene') # Fixme: don't print ???
             self._scene = scene
             self._viewport_area.scene = scene
+            self._cancel_jobs(list(self._pending_jobs))
+            self._tile_cache.clear()
+            self._paint_cache.clear()
+            self._damage_counter = None
+            self._update_counter = None
+            self._last_frame = None
             self._viewport_area.fit_scene()
             # self._update_transformation()
             self.update()
@@ -827,7 +1627,8 @@ class QtQuickPaintedSceneItem(QQuickPaintedItem, QtPainter):
             for pair in items[1:]:
                 distance, item = pair
                 # print('  {:6.2f} {}'.format(distance, item.user_data))
-        self.update()
+        # only repaint the items whose selection changed
+        self.update_damaged_areas()
 
 ####################################################################################################
 
@@ -33,7 +33,7 @@ __all__ = [
 import logging
 
 from Patro.FileFormat.Svg import SvgFormat
-from Patro.FileFormat.Svg.SvgFile import SvgFileWriter
+from Patro.FileFormat.Svg.SvgFile import SvgStreamWriter
 from Patro.GeometryEngine.Transformation import AffineTransformation2D
 from Patro.GeometryEngine.Vector import Vector2D
 from Patro.GraphicStyle import StrokeStyle
@@ -58,7 +58,12 @@ class SvgPainter(Painter):
 
     ##############################################
 
-    def __init__(self, path, scene, paper):
+    def __init__(self, path, scene, paper, precision=3, compress=None):
+
+        """Paint the scene to a SVG file, coordinates are rounded to *precision* digits and the file is
+        gzipped if *compress* is set or if the path has a ``.svgz`` suffix.
+
+        """
 
         super().__init__(scene)
 
@@ -69,23 +74,27 @@ class SvgPainter(Painter):
         self._transformation = AffineTransformation2D.Scale(10, -10)
         self._transformation *= AffineTransformation2D.Translation(-Vector2D(bounding_box.x.inf, bounding_box.y.sup))
 
-        self._tree = []
-        self._append(SvgFormat.Style(text='''
-        .normal { font: 12px sans-serif; }
-        '''))
-        self.paint()
-
-        self._svg_file = SvgFileWriter(path, paper, self._tree, transformation=None)
+        # elements are written as they are painted
+        with SvgStreamWriter(path, paper, precision=precision, compress=compress) as writer:
+            self._writer = writer
+            self._append(SvgFormat.Style(text='''
+            .normal { font: 12px sans-serif; }
+            '''))
+            self.paint()
+        self._writer = None
 
     ##############################################
 
-    def cast_position(self, position):
-        return self._transformation * super().cast_position(position)
+    def scene_to_painter(self, position):
+        return self._transformation * position
+
+    def scene_to_painter_array(self, coordinates):
+        return self._transformation.transform_array(coordinates)
 
     ##############################################
 
     def _append(self, element):
-        self._tree.append(element)
+        self._writer.write(element)
 
     ##############################################
 
@@ -105,7 +114,7 @@ class SvgPainter(Painter):
     ##############################################
 
     def paint_TextItem(self, item):
-        x, y = list(self.cast_position(item.position))
+        x, y = list(self.cast_item_position(item))
         # Fixme: anchor position
         text = SvgFormat.Text(x=x, y=y, text=item.text, fill='black')
         self._append(text)
@@ -113,31 +122,17 @@ class SvgPainter(Painter):
     ##############################################
 
     def paint_CircleItem(self, item):
-        x, y = self.cast_position(item.position)
-        circle = SvgFormat.Text(cx=x, cy=y, r=2, fill='black', _class='normal')
+        x, y = self.cast_item_position(item)
+        circle = SvgFormat.Circle(cx=x, cy=y, r=2, fill='black')
         self._append(circle)
 
     ##############################################
 
     def paint_SegmentItem(self, item):
-        p1, p2 = self.cast_item_positions(item)
-        line = SvgFormat.Line(
-            x1=p1.x,
-            y1=p1.y,
-            x2=p2.x,
-            y2=p2.y,
-            **self._graphic_style(item),
-        )
-        self._append(line)
+        # consecutive segments having the same style are merged in a path
+        self._writer.line(*self.cast_item_positions(item), **self._graphic_style(item))
 
     ##############################################
 
     def paint_CubicBezierItem(self, item):
-        coordinates = self.cast_item_coordinates(item, flat=True)
-        path = SvgFormat.Path(
-            path_data='M {} {} C {} {}, {} {}, {} {}'.format(*coordinates),
-            fill='none',
-            **self._graphic_style(item),
-        )
-        #!# self._append(path)
-
+        self._writer.cubic(*self.cast_item_positions(item), **self._graphic_style(item))
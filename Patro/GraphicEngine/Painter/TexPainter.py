@@ -104,10 +104,10 @@ class TexPainter(Painter):
 
     ##############################################
 
-    def paint(self):
+    def paint(self, clip=None):
         for item in self._scene.coordinates:
             self.paint_CoordinateItem(item)
-        super().paint()
+        super().paint(clip)
 
     ##############################################
 
@@ -186,4 +186,4 @@ class TexPainter(Painter):
                                 r'({0.x.sup:.2f},{0.y.sup:.2f}) -- '
                                 r'({0.x.inf:.2f},{0.y.sup:.2f}) -- cycle;'.format(interval) + '\n')
             self._content.append(Center().append(self._figure))
-            self.paint()
+            self.paint(interval)
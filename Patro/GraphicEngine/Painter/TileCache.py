@@ -0,0 +1,153 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+"""Module to implement a cache of rendered tiles.
+
+The scene is divided in square tiles of a fixed size in pixel for each scale.  A tile is identified
+by a layer name, the scale and its column and row in the grid, the row axis points downward like on
+screen.  Tiles are evicted in LRU order when the memory limit is reached.
+
+"""
+
+####################################################################################################
+
+__all__ = ['TileCache']
+
+####################################################################################################
+
+from collections import OrderedDict
+import logging
+import math
+
+####################################################################################################
+
+_module_logger = logging.getLogger(__name__)
+
+####################################################################################################
+
+class TileCache:
+
+    _logger = _module_logger.getChild('TileCache')
+
+    TILE_SIZE = 256   # px
+    MAX_MEMORY = 256 * 2**20   # bytes
+
+    ##############################################
+
+    def __init__(self, tile_size: int = TILE_SIZE, max_memory: int = MAX_MEMORY) -> None:
+        self._tile_size = int(tile_size)
+        self._max_memory = int(max_memory)
+        self._tiles = OrderedDict()   # key -> (image, size)
+        self._memory = 0
+
+    ##############################################
+
+    @property
+    def tile_size(self) -> int:
+        return self._tile_size
+
+    @property
+    def memory(self) -> int:
+        return self._memory
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._tiles
+
+    ##############################################
+
+    def tile_area(self, scale: float, column: int, row: int) -> tuple:
+        """Return the area of a tile in scene coordinates as (x_inf, y_inf, x_sup, y_sup)"""
+        size = self._tile_size / scale
+        x_inf = column * size
+        y_sup = -row * size
+        return (x_inf, y_sup - size, x_inf + size, y_sup)
+
+    ##############################################
+
+    def tiles_for(self, area: tuple, scale: float) -> list[tuple[int, int]]:
+        """Return the (column, row) of the tiles which cover *area* given as (x_inf, y_inf, x_sup, y_sup)"""
+        x_inf, y_inf, x_sup, y_sup = area
+        size = self._tile_size / scale
+        columns = range(math.floor(x_inf / size), math.floor(x_sup / size) + 1)
+        rows = range(math.floor(-y_sup / size), math.floor(-y_inf / size) + 1)
+        return [(column, row) for row in rows for column in columns]
+
+    ##############################################
+
+    def get(self, key: tuple):
+        tile = self._tiles.get(key)
+        if tile is None:
+            return None
+        self._tiles.move_to_end(key)
+        return tile[0]
+
+    ##############################################
+
+    def add(self, key: tuple, image, size: int) -> None:
+        self.remove(key)
+        self._tiles[key] = (image, size)
+        self._memory += size
+        while self._memory > self._max_memory and len(self._tiles) > 1:
+            old_key, (old_image, old_size) = self._tiles.popitem(last=False)
+            self._memory -= old_size
+
+    ##############################################
+
+    def remove(self, key: tuple) -> None:
+        tile = self._tiles.pop(key, None)
+        if tile is not None:
+            self._memory -= tile[1]
+
+    ##############################################
+
+    def clear(self, layer: str = None) -> None:
+        if layer is None:
+            self._tiles.clear()
+            self._memory = 0
+        else:
+            for key in [key for key in self._tiles if key[0] == layer]:
+                self.remove(key)
+
+    ##############################################
+
+    def invalidate(self, layer: str, bounding_box: tuple, margin: int = 0) -> int:
+
+        """Remove the tiles of *layer* which intersect the bounding box given in scene coordinates,
+        *margin* is in pixel.  Return the number of removed tiles.
+
+        """
+
+        x_inf, y_inf, x_sup, y_sup = bounding_box
+        keys = []
+        for key in self._tiles:
+            tile_layer, scale, column, row = key
+            if tile_layer != layer:
+                continue
+            tile_x_inf, tile_y_inf, tile_x_sup, tile_y_sup = self.tile_area(scale, column, row)
+            enlarge = margin / scale
+            if (x_inf - enlarge <= tile_x_sup and tile_x_inf <= x_sup + enlarge and
+                y_inf - enlarge <= tile_y_sup and tile_y_inf <= y_sup + enlarge):
+                keys.append(key)
+        for key in keys:
+            self.remove(key)
+        return len(keys)
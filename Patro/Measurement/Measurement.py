@@ -26,9 +26,11 @@ import logging
 from pathlib import Path
 from typing import Optional, Iterator
 
+import numpy as np
 import sympy
 import yaml
 
+from Patro.Common.Graph.DirectedAcyclicGraph import DirectedAcyclicGraph
 from .PersonalData import PersonalData
 
 ####################################################################################################
@@ -54,15 +56,24 @@ class Measurement:
         self._measurements = measurements
         self._full_name = str(full_name)   # for human
         self._description = str(description)   # describe the purpose of the measurement
+        self._set_expression(value)
+
+    ##############################################
+
+    def _set_expression(self, value: int | float | str) -> None:
         if isinstance(value, (int, float)):
             self._expression = value
-            self._evaluated_expression = value
+            self._dependencies = ()
             self._value = float(value)
         else:
             # https://docs.sympy.org/latest/modules/core.html#id1
             self._expression = sympy.sympify(str(value))
-            self._evaluated_expression = None
-            self._value = None
+            self._dependencies = tuple(sorted(symbol.name for symbol in self._expression.free_symbols))
+            if self._dependencies:
+                self._value = None
+            else:
+                self._value = float(self._expression)
+        self._function = None
 
     ##############################################
 
@@ -103,21 +114,40 @@ class Measurement:
     def expression(self) -> sympy.core.expr.Expr:
         return self._expression
 
+    @property
+    def dependencies(self) -> tuple[str]:
+        """Names of the measurements used by the expression"""
+        return self._dependencies
+
+    @property
+    def is_constant(self) -> bool:
+        return not self._dependencies
+
+    ##############################################
+
+    @property
+    def function(self):
+        """Return the expression compiled to a numeric function of its dependencies"""
+        if self._function is None:
+            # Fixme: modules='math' is faster for scalar but cannot vectorise
+            symbols = [sympy.Symbol(name) for name in self._dependencies]
+            self._function = sympy.lambdify(symbols, self._expression, modules='numpy')
+        return self._function
+
     ##############################################
 
     @property
     def evaluated_expression(self) -> sympy.core.expr.Expr:
-        if self._evaluated_expression is None:
-            # https://docs.sympy.org/latest/modules/core.html?highlight=subs#sympy.core.basic.Basic.subs
-            # variable order doesn't matter, sympy do the job
-            # self._evaluated_expression = self._expression.subs(self._measurements._expressions)
-            self._evaluated_expression = self._measurements.subs(self)
-        return self._evaluated_expression
+        # Only used for display, evaluation is done by MeasurementSet.eval
+        if self.is_constant:
+            return self._expression
+        values = {name: self._measurements[name].value for name in self._dependencies}
+        return self._expression.subs(values)
 
     @property
     def value(self) -> float:
         if self._value is None:
-            self._value = float(self.evaluated_expression.evalf(3))   # ensure a float or raise
+            self._measurements.eval()
         return self._value
 
     def __float__(self) -> float:
@@ -144,7 +174,9 @@ class MeasurementSet:
         self._pattern_making_system = pattern_making_system   # Fixme: purpose ???
         self._personal = PersonalData() if personal_data is None else personal_data
         self._measurements = {}   # name -> Measurement
-        self._expressions = {}   # name -> expression  for sympy substitution
+        self._dag = None   # dependency graph, built on demand
+        self._sorted_measurements = None   # in topological order
+        self._evaluated = False
 
     ##############################################
 
@@ -177,6 +209,10 @@ class MeasurementSet:
     def __iter__(self) -> Iterator[Measurement]:
         return iter(self._measurements.values())
 
+    def _unique_measurements(self) -> list[Measurement]:
+        # a measurement can be registered with several names, cf. ValentinaMeasurements
+        return list({measurement.name: measurement for measurement in self}.values())
+
     ##############################################
 
     def sorted_iter(self) -> Measurement:
@@ -201,13 +237,134 @@ class MeasurementSet:
         if measurement.name in self._measurements:
             raise NameError(f"Measurement {measurement.name} is already registered")
         self._measurements[measurement.name] = measurement
-        self._expressions[measurement.name] = measurement.expression
+        self._reset_graph()
         return measurement
 
     ##############################################
 
-    def subs(self, measurement: Measurement) -> sympy.core.expr.Expr:
-        return measurement.expression.subs(self._expressions)
+    def _reset_graph(self) -> None:
+        self._dag = None
+        self._sorted_measurements = None
+        self._evaluated = False
+
+    ##############################################
+
+    def _build_graph(self) -> None:
+
+        """Build the dependency graph of the measurements and sort it topologically"""
+
+        dag = DirectedAcyclicGraph()
+        measurements = self._unique_measurements()
+        for measurement in measurements:
+            dag.add_node(measurement.name, data=measurement)
+        for measurement in measurements:
+            node = dag[measurement.name]
+            for name in measurement.dependencies:
+                try:
+                    ancestor = self._measurements[name]
+                except KeyError:
+                    raise NameError(f'Measurement {measurement.name} depends on an undefined measurement {name}')
+                try:
+                    node.connect_ancestor(dag[ancestor.name])
+                except NameError:
+                    raise NameError('Measurements have a circular dependency')
+
+        self._dag = dag
+        self._sorted_measurements = [node.data for node in dag.topological_sort()]
+
+    ##############################################
+
+    @property
+    def sorted_measurements(self) -> list[Measurement]:
+        """Return the measurements in topological order, i.e. dependencies first"""
+        if self._sorted_measurements is None:
+            self._build_graph()
+        return self._sorted_measurements
+
+    ##############################################
+
+    def _eval_measurements(self, measurements: list[Measurement]) -> None:
+        for measurement in measurements:
+            if not measurement.is_constant:
+                args = [self._measurements[name]._value for name in measurement.dependencies]
+                measurement._value = float(measurement.function(*args))
+
+    ##############################################
+
+    def eval(self) -> None:
+        """Evaluate all the measurements in one pass"""
+        self._logger.info('Eval measurements')
+        self._eval_measurements(self.sorted_measurements)
+        self._evaluated = True
+
+    ##############################################
+
+    def update(self, values: dict[str, int | float]) -> None:
+
+        """Set the value of some measurements and only re-evaluate the measurements which depend on them.
+
+        *values* is a dict mapping measurement names to a number.
+
+        """
+
+        if self._dag is None:
+            self._build_graph()
+        changed = set()
+        graph_changed = False
+        for name, value in values.items():
+            measurement = self._measurements[name]
+            # the graph must be updated if the measurement is or was defined by an expression
+            graph_changed |= not measurement.is_constant
+            measurement._set_expression(value)
+            graph_changed |= not measurement.is_constant
+            changed.add(measurement.name)
+
+        if graph_changed:
+            self._build_graph()
+        if not self._evaluated:
+            self.eval()
+            return
+
+        dag = self._dag
+        descendants = dag.sort(dag.descendants_of([dag[name] for name in changed]))
+        self._eval_measurements([node.data for node in descendants])
+
+    ##############################################
+
+    def eval_array(self, values: dict[str, list[float] | np.ndarray]) -> dict[str, np.ndarray]:
+
+        """Evaluate the measurements for several people at once.
+
+        *values* is a dict mapping measurement names to an array of values, one per person.  The
+        other measurements are evaluated from their definition.  Return a dict mapping measurement
+        names to an array.
+
+        """
+
+        arrays = {}
+        size = None
+        for name, array in values.items():
+            array = np.asarray(array, dtype=np.float64)
+            if size is None:
+                size = array.shape
+            elif array.shape != size:
+                raise ValueError(f'Array shape mismatch for {name}: {array.shape} != {size}')
+            arrays[self._measurements[name].name] = array
+        if size is None:
+            size = (1,)
+
+        for measurement in self.sorted_measurements:
+            name = measurement.name
+            if name in arrays:
+                continue
+            if measurement.is_constant:
+                array = np.full(size, measurement.value)
+            else:
+                args = [arrays[self._measurements[dependency].name] for dependency in measurement.dependencies]
+                array = np.broadcast_to(measurement.function(*args), size).astype(np.float64)
+            arrays[name] = array
+
+        return arrays
 
     ##############################################
 
@@ -22,8 +22,8 @@
 
 import logging
 
-from .Measurement import Measurement, Measurements
-from .ValentinaStandardMeasurement import ValentinaStandardMeasurement
+from .Measurement import Measurement, MeasurementSet
+from .ValentinaStandardMeasurement import valentina_standard_measurement
 
 ####################################################################################################
 
@@ -31,10 +31,6 @@ _module_logger = logging.getLogger(__name__)
 
 ####################################################################################################
 
-_valentina_standard_measurement = ValentinaStandardMeasurement()
-
-####################################################################################################
-
 class ValentinaMeasurement(Measurement):
 
     """Class to define a Valentina measurement"""
@@ -63,7 +59,7 @@ class ValentinaMeasurement(Measurement):
         name = self.replace_custom_prefix(self._valentina_name)
         # if self.is_custom():
         #     name = name[1:]
-        #     if name in _valentina_standard_measurement:
+        #     if name in valentina_standard_measurement():
         #         name = self.CUSTOM_PREFIX + name
         value = self.replace_custom_prefix(value)
         super().__init__(measurements, name, value, full_name, description)
@@ -81,7 +77,7 @@ class ValentinaMeasurement(Measurement):
 
 ####################################################################################################
 
-class ValentinaMeasurements(Measurements):
+class ValentinaMeasurements(MeasurementSet):
 
     """Class to store a set of Valentina measurements"""
 
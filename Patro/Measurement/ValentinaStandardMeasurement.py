@@ -20,10 +20,10 @@
 
 ####################################################################################################
 
+import functools
 from pathlib import Path
 
-import yaml
-
+from Patro.Common.YamlCache import load_yaml
 from .StandardMeasurement import Measurement, StandardMeasurement
 
 ####################################################################################################
@@ -55,9 +55,15 @@ class ValentinaStandardMeasurement(StandardMeasurement):
     def __init__(self) -> None:
         super().__init__()
         yaml_path = Path(__file__).parent.joinpath('data', 'valentina-standard-measurements.yaml')
-        with open(yaml_path, 'r', encoding='utf8') as fh:
-            data = yaml.load(fh.read(), Loader=yaml.SafeLoader)
-            for topic in data.values():
-                for code, measurement_data in topic['measurements'].items():
-                    measurement = ValentinaMeasurement(code, *measurement_data)
-                    self.add(measurement)
+        data = load_yaml(yaml_path)
+        for topic in data.values():
+            for code, measurement_data in topic['measurements'].items():
+                measurement = ValentinaMeasurement(code, *measurement_data)
+                self.add(measurement)
+
+####################################################################################################
+
+@functools.lru_cache(maxsize=None)
+def valentina_standard_measurement() -> ValentinaStandardMeasurement:
+    """Return the Valentina standard measurements, they are loaded on first call"""
+    return ValentinaStandardMeasurement()
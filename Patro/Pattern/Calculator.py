@@ -27,6 +27,10 @@ import astunparse
 # import astor
 
 from Patro.Common.Graph.DirectedAcyclicGraph import DirectedAcyclicGraph
+from Patro.Common.Profiler import profiler
+
+# Rename id buitin
+pyid = id
 
 ####################################################################################################
 
@@ -72,6 +76,10 @@ class NodeVisitor(ast.NodeVisitor):
                 for arg in node.args:
                     dependence = self._calculator._name_to_point(arg.s)
                     self._dependencies.append(dependence)
+            elif function.attr in Calculator.__spline_functions__:
+                point_names = [arg.s for arg in node.args]
+                dependence = self._calculator._name_to_spline(*point_names)
+                self._dependencies.append(dependence)
 
         self.generic_visit(node)
 
@@ -83,6 +91,14 @@ class Calculator:
 
     _logger = _module_logger.getChild('Calculator')
 
+    __spline_functions__ = (
+        '_function_Angle1Spl',
+        '_function_Angle2Spl',
+        '_function_C1LengthSpl',
+        '_function_C2LengthSpl',
+        '_function_Spl',
+    )
+
     ##############################################
 
     def __init__(self, measurements):
@@ -92,6 +108,8 @@ class Calculator:
         self._dag = DirectedAcyclicGraph()
         self._cache  = {'__calculator__': self} # used to eval expressions
         self._points = {}
+        self._splines = {}
+        self._spline_metrics = {} # memo keyed on control points
         self._current_operation = None # Fixme: ???
         self._current_segment = None
 
@@ -129,11 +147,98 @@ class Calculator:
 
     ##############################################
 
+    def add_spline(self, spline):
+        key = (spline.first_point.name, spline.second_point.name)
+        self._splines[key] = spline
+
+    ##############################################
+
     def _name_to_point(self, name):
         return self._points[name]
 
     ##############################################
 
+    def _name_to_spline(self, point_name1, point_name2):
+        try:
+            return self._splines[(point_name1, point_name2)]
+        except KeyError:
+            raise NameError("Unknown spline {} {}".format(point_name1, point_name2))
+
+    ##############################################
+
+    @staticmethod
+    def _spline_key(spline):
+        return tuple(
+            (point.x, point.y)
+            for point in (spline.first_point.vector, spline.control_point1,
+                          spline.control_point2, spline.second_point.vector)
+        )
+
+    ##############################################
+
+    def clear_spline_metrics(self):
+        self._spline_metrics.clear()
+
+    ##############################################
+
+    def _get_spline_metrics(self, point_name1, point_name2):
+
+        """Return the metrics dictionary of a spline, it is shared by all the expressions which refer
+        to the same curve.
+
+        """
+
+        spline = self._name_to_spline(point_name1, point_name2)
+        key = self._spline_key(spline)
+        metrics = self._spline_metrics.get(key, None)
+        if metrics is None:
+            metrics = {'spline': spline}
+            self._spline_metrics[key] = metrics
+        return metrics
+
+    ##############################################
+
+    def _spline_metric(self, point_name1, point_name2, metric):
+
+        metrics = self._get_spline_metrics(point_name1, point_name2)
+        value = metrics.get(metric, None)
+        if value is None:
+            spline = metrics['spline']
+            if metric == 'length':
+                # arc length is the expensive one
+                value = spline.geometry().length
+            elif metric == 'angle1':
+                value = (spline.control_point1 - spline.first_point.vector).orientation % 360
+            elif metric == 'angle2':
+                value = (spline.control_point2 - spline.second_point.vector).orientation % 360
+            elif metric == 'c1_length':
+                value = (spline.control_point1 - spline.first_point.vector).magnitude
+            elif metric == 'c2_length':
+                value = (spline.control_point2 - spline.second_point.vector).magnitude
+            metrics[metric] = value
+        return value
+
+    ##############################################
+
+    def invalidate_spline(self, spline):
+
+        """Invalidate the metrics of *spline* and the expressions of the operations which depend on
+        it.
+
+        """
+
+        # the end points could have already moved, thus lookup the entry by spline
+        for key, metrics in list(self._spline_metrics.items()):
+            if metrics['spline'] is spline:
+                del self._spline_metrics[key]
+        node = self._dag[pyid(spline)]
+        for descendant in node.breadth_first_search():
+            if descendant is not node:
+                for expression in descendant.data._iter_on_expressions():
+                    expression.set_dirty()
+
+    ##############################################
+
     def _name_to_vector_point(self, name):
         return self._points[name].vector
 
@@ -152,20 +257,14 @@ class Calculator:
 
     # Fixme: special functions
     #   increments ?
-    #   Length of curve: Spl_A_B
-    #   Angle of line: AngleLine_A_B
     #   radius of arcs
-    #   Angles of curves: Angle1Spl_A_B Angle2Spl_A_B
-    #   Length of control points: C1LengthSpl_A_B C2LengthSpl_A_B
     #   functions
 
     def _function_Angle1Spl(self, point_name1, point_name2):
-        point1, point2 = self._names_to_vector_points(point_name1, point_name2)
-        return 0 # Fixme:
+        return self._spline_metric(point_name1, point_name2, 'angle1')
 
     def _function_Angle2Spl(self, point_name1, point_name2):
-        point1, point2 = self._names_to_vector_points(point_name1, point_name2)
-        return 0 # Fixme:
+        return self._spline_metric(point_name1, point_name2, 'angle2')
 
     def _function_AngleLine(self, point_name1, point_name2):
         point1, point2 = self._names_to_vector_points(point_name1, point_name2)
@@ -175,20 +274,17 @@ class Calculator:
         return self._current_segment.magnitude
 
     def _function_C1LengthSpl(self, point_name1, point_name2):
-        point1, point2 = self._names_to_vector_points(point_name1, point_name2)
-        return 0 # Fixme:
+        return self._spline_metric(point_name1, point_name2, 'c1_length')
 
     def _function_C2LengthSpl(self, point_name1, point_name2):
-        point1, point2 = self._names_to_vector_points(point_name1, point_name2)
-        return 0 # Fixme:
+        return self._spline_metric(point_name1, point_name2, 'c2_length')
 
     def _function_Line(self, point_name1, point_name2):
         point1, point2 = self._names_to_vector_points(point_name1, point_name2)
         return (point2 - point1).magnitude
 
     def _function_Spl(self, point_name1, point_name2):
-        point1, point2 = self._names_to_vector_points(point_name1, point_name2)
-        return 0 # Fixme:
+        return self._spline_metric(point_name1, point_name2, 'length')
 
 ####################################################################################################
 
@@ -244,7 +340,7 @@ class Expression:
 
         expression = self._expression
         start = expression.find(prefix, start)
-        if start is -1:
+        if start == -1:
             return None, None
         index = start + 1
         while index < len(expression):
@@ -332,10 +428,12 @@ class Expression:
     def eval(self):
 
         if self._code is None:
-            self._compile()
+            with profiler.region('Expression.compile'):
+                self._compile()
 
         try:
-            self._value = eval(self._code, self._calculator.cache)
+            with profiler.region('Expression.eval'):
+                self._value = eval(self._code, self._calculator.cache)
             self._value_error = False
         except NameError:
             self._value = None
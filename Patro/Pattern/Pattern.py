@@ -25,6 +25,7 @@
 
 import logging
 
+from Patro.Common.AtomicCounter import IdAllocator
 from Patro.Common.Object import ObjectNameMixin
 from .Sketch import Sketch
 
@@ -48,6 +49,7 @@ class Pattern:
         self._unit = unit
 
         self._scopes = [] # not a dict so as to don't manage renaming
+        self._id_allocator = IdAllocator() # for sketch operations
 
     ##############################################
 
@@ -59,6 +61,10 @@ class Pattern:
     def unit(self):
         return self._unit
 
+    @property
+    def id_allocator(self):
+        return self._id_allocator
+
     ##############################################
 
     @property
@@ -72,8 +78,9 @@ class Pattern:
 
     ##############################################
 
-    def add_scope(self, name):
-        scope = PatternScope(self, name)
+    def add_scope(self, name, loader=None):
+        """Add a scope, *loader* is a function called with the scope on first access to the sketch"""
+        scope = PatternScope(self, name, loader)
         self._scopes.append(scope)
         return scope
 
@@ -107,12 +114,16 @@ class PatternScope(ObjectNameMixin):
 
     ##############################################
 
-    def __init__(self, pattern, name):
+    def __init__(self, pattern, name, loader=None):
 
         super().__init__(name)
         self._pattern = pattern
 
-        self._sketch = Sketch(self)
+        self._loader = loader
+        if loader is None:
+            self._sketch = Sketch(self)
+        else:
+            self._sketch = None # loaded on demand
 
     ##############################################
 
@@ -124,6 +135,19 @@ class PatternScope(ObjectNameMixin):
     def unit(self):
         return self._pattern._unit
 
+    @property
+    def id_allocator(self):
+        return self._pattern.id_allocator
+
+    @property
+    def is_loaded(self):
+        return self._sketch is not None
+
     @property
     def sketch(self):
+        if self._sketch is None:
+            self._logger.info('Load scope "{}"'.format(self.name))
+            self._sketch = Sketch(self)
+            loader, self._loader = self._loader, None
+            loader(self)
         return self._sketch
@@ -25,6 +25,7 @@
 
 import logging
 
+from Patro.Common.Profiler import profiler
 from Patro.GeometryEngine.Vector import Vector2D
 from Patro.GraphicEngine.GraphicScene.GraphicStyle import GraphicPathStyle
 from Patro.GraphicEngine.GraphicScene.Scene import GraphicScene
@@ -72,6 +73,10 @@ class Sketch:
     def calculator(self):
         return self._calculator
 
+    @property
+    def id_allocator(self):
+        return self._pattern.id_allocator
+
     @property
     def unit(self):
         return self._pattern.unit
@@ -108,15 +113,39 @@ class Sketch:
     def eval(self):
 
         self._logger.info('Eval all operations')
-        for operation in self._operations:
+        with profiler.region('Sketch.eval'):
+            self._calculator.clear_spline_metrics()
+            for operation in self._operations:
+                if isinstance(operation, SketchOperation.Point):
+                    self._calculator.add_point(operation)
+                    operation.eval()
+                elif isinstance(operation, SketchOperation.SimpleInteractiveSpline):
+                    operation.eval() # for control points
+                    self._calculator.add_spline(operation)
+                else:
+                    pass
+                with profiler.region('SketchOperation.connect_ancestor',
+                                     cls=operation.__class__.__name__, id=operation.id):
+                    operation.connect_ancestor_for_expressions()
+
+    ##############################################
+
+    def restore_evaluation(self, states, dependencies):
+
+        """Restore an evaluated sketch without evaluation.
+
+        *states* is a list of :meth:`SketchOperation.evaluated_state` and *dependencies* a list of
+        operation ids, in the order of the operations.
+
+        """
+
+        for operation, state, operation_dependencies in zip(self._operations, states, dependencies):
+            operation.restore_evaluated_state(state)
             if isinstance(operation, SketchOperation.Point):
                 self._calculator.add_point(operation)
-                operation.eval()
             elif isinstance(operation, SketchOperation.SimpleInteractiveSpline):
-                operation.eval() # for control points
-            else:
-                pass
-            operation.connect_ancestor_for_expressions()
+                self._calculator.add_spline(operation)
+            operation._connect_ancestor(*[self.get_operation(id) for id in operation_dependencies])
 
     ##############################################
 
@@ -171,6 +200,13 @@ class Sketch:
         Scene class can be customised using the *scene_cls* parameter.
         """
 
+        with profiler.region('Sketch.detail_scene'):
+            return self._detail_scene(scene_cls, style)
+
+    ##############################################
+
+    def _detail_scene(self, scene_cls, style):
+
         scene = scene_cls()
         # Fixme: scene bounding box
         scene.bounding_box = self.bounding_box
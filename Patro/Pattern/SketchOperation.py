@@ -29,7 +29,8 @@ A sketch operation must be build from the corresponding method of the Pattern cl
 
 import logging
 
-from Patro.Common.Object import ObjectGlobalIdMixin
+from Patro.Common.Object import ObjectCkeckedIdMixin
+from Patro.Common.Profiler import profiler
 from Patro.GeometryEngine.Bezier import CubicBezier2D
 from Patro.GeometryEngine.Conic import Circle2D
 from Patro.GeometryEngine.Line import Line2D
@@ -65,12 +66,15 @@ def quote(x):
 ####################################################################################################
 
 # metaclass = SketchOperationMetaClass
-class SketchOperation(ObjectGlobalIdMixin):
+class SketchOperation(ObjectCkeckedIdMixin):
 
     """Baseclass for sketch operation"""
 
     _logger = _module_logger.getChild('SketchOperation')
 
+    # attributes computed by eval_internal, cf. evaluated_state
+    __evaluated_attributes__ = ()
+
     ##############################################
 
     def __init__(self, sketch, id=None):
@@ -80,6 +84,7 @@ class SketchOperation(ObjectGlobalIdMixin):
         # Valentina set an incremental integer id for each calculation (entity)
         # id is used to identify operation, see _get_operation
         # A calculation which generate a point has also a name
+        # Ids are allocated by the pattern, thus patterns are independent
         try:
             super().__init__(id)
         except ValueError:
@@ -90,6 +95,16 @@ class SketchOperation(ObjectGlobalIdMixin):
 
     ##############################################
 
+    def new_id(self):
+        return self._sketch.id_allocator.new_id()
+
+    ##############################################
+
+    def check_id(self, id):
+        self._sketch.id_allocator.reserve(id)
+
+    ##############################################
+
     @property
     def sketch(self):
         return self._sketch
@@ -121,7 +136,8 @@ class SketchOperation(ObjectGlobalIdMixin):
 
     def eval(self):
         self._logger.debug('Eval {}'.format(self))
-        self.eval_internal()
+        with profiler.region('SketchOperation.eval', cls=self.__class__.__name__, id=self.id):
+            self.eval_internal()
 
     ##############################################
 
@@ -135,20 +151,41 @@ class SketchOperation(ObjectGlobalIdMixin):
 
         # cf. to_python
 
-        args = self.__init__.__code__.co_varnames
+        code = self.__init__.__code__
+        args = code.co_varnames[:code.co_argcount]
         args = args[2:-1] # remove self, sketch, id
         return args
 
     ##############################################
 
+    def init_kwargs(self):
+        """Return the arguments to rebuild the operation"""
+        return {arg:getattr(self, arg) for arg in self._init_args()}
+
+    ##############################################
+
+    def evaluated_state(self):
+        """Return the internal states computed by :meth:`eval_internal`"""
+        return {name:getattr(self, name) for name in self.__evaluated_attributes__}
+
+    ##############################################
+
+    def restore_evaluated_state(self, state):
+        """Restore the internal states without evaluation, cf. :meth:`evaluated_state`"""
+        for name in self.__evaluated_attributes__:
+            setattr(self, name, state[name])
+
+    ##############################################
+
     def to_python(self):
 
         """Return the Python code for the operation"""
 
-        args = self._init_args()
+        kwargs = self.init_kwargs()
+        args = list(kwargs.keys())
         values = []
         for arg in args:
-            value = getattr(self, arg)
+            value = kwargs[arg]
             # if arg == 'sketch':
             #     value_str = 'sketch'
             # if isinstance(value, Sketch):
@@ -366,6 +403,8 @@ class Point(SketchOperation):
 
     """Base class for point."""
 
+    __evaluated_attributes__ = ('_vector',)
+
     ##############################################
 
     def __init__(self, sketch, name, label_offset, id=None):
@@ -726,6 +765,8 @@ class SimpleInteractiveSpline(SketchOperation, LinePropertiesMixin, FirstSecondP
 
     """"Construct a quadratic Bezier curve from two extremity points and two control points"""
 
+    __evaluated_attributes__ = ('_control_point1', '_control_point2')
+
     ##############################################
 
     def __init__(self, sketch,
@@ -785,8 +826,13 @@ class SimpleInteractiveSpline(SketchOperation, LinePropertiesMixin, FirstSecondP
 
         control_point1_offset = Vector2D.from_angle(self._angle1.value)*self._length1.value
         control_point2_offset = Vector2D.from_angle(self._angle2.value)*self._length2.value
-        self._control_point1 = self.first_point.vector + control_point1_offset
-        self._control_point2 = self.second_point.vector + control_point2_offset
+        control_point1 = self.first_point.vector + control_point1_offset
+        control_point2 = self.second_point.vector + control_point2_offset
+        if (self._control_point1 is not None
+            and (control_point1 != self._control_point1 or control_point2 != self._control_point2)):
+            self._sketch.calculator.invalidate_spline(self)
+        self._control_point1 = control_point1
+        self._control_point2 = control_point2
         # self._logger.debug("Control points : {} {}".format(self._control_point1, self._control_point2))
 
     ##############################################
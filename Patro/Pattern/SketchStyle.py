@@ -40,9 +40,12 @@ class DetailSketchStyle:
 
         self.point_size = kargs.get('point_size', .2)
         self.point_color = kargs.get('point_color', Colors.black)
+        # points and labels are hidden below these scales in pixel per scene unit, off by default
+        self.point_min_scale = kargs.get('point_min_scale', None)
+        self.label_min_scale = kargs.get('label_min_scale', None)
 
         font_size = kargs.get('font_size', 16)
-        self.font = Font('', font_size)
+        self.font = Font('', font_size, self.label_min_scale)
         self.label_line_width = kargs.get('label_line_width', 2)
 
         self.line_width = kargs.get('line_width', 3)
@@ -66,9 +69,17 @@ class DetailSketchStyle:
     def point_color(self, value):
         self._point_color = Colors.ensure_color(value)
 
+    @property
+    def point_min_scale(self):
+        return self._point_min_scale
+
+    @point_min_scale.setter
+    def point_min_scale(self, value):
+        self._point_min_scale = value
+
     @property
     def point_style(self):
-        return GraphicPathStyle(fill_color=self._point_color)
+        return GraphicPathStyle(fill_color=self._point_color, min_scale=self.point_min_scale)
 
     ##############################################
 
@@ -88,9 +99,17 @@ class DetailSketchStyle:
     def label_line_width(self, value):
         self._label_line_width = value
 
+    @property
+    def label_min_scale(self):
+        return self._label_min_scale
+
+    @label_min_scale.setter
+    def label_min_scale(self, value):
+        self._label_min_scale = value
+
     @property
     def label_line_style(self):
-        return GraphicPathStyle(line_width=self._label_line_width)
+        return GraphicPathStyle(line_width=self._label_line_width, min_scale=self.label_min_scale)
 
     ##############################################
 
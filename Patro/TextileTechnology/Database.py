@@ -23,7 +23,8 @@ __all__ = ['Database']
 ####################################################################################################
 
 from pathlib import Path
-import yaml
+
+from Patro.Common.YamlCache import load_yaml
 
 ####################################################################################################
 
@@ -59,4 +60,4 @@ class Database:
     def load(self, yaml_path=None):
         if yaml_path is None:
             yaml_path = self.DEFAULT_DATA_DIRECTORY.joinpath(self.DEFAULT_DATA_FILENAME)
-        return yaml.load(open(yaml_path, 'r'), Loader=yaml.SafeLoader)
+        return load_yaml(yaml_path)
@@ -118,7 +118,7 @@ class SceneImporter(SvgFileInternal):
         #     for part in item.path_data:
         #         print(part)
 
-        state = self._dispatcher.state.clone().merge(item)
+        state = self._dispatcher.state.merge(item)
         # self._logger.info('Item: {}\n{}'.format(item.id, item))
         # self._logger.info('Item State:\n' + str(state))
 
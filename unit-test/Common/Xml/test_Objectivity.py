@@ -139,6 +139,24 @@ class TestObjectivity(unittest.TestCase):
         self.assertEqual(composed_object.float_attribute, float_attribute)
         self.assertEqual(composed_object.string_attribute, string_attribute)
 
+    ##############################################
+
+    def test_from_xml_elements(self):
+
+        xml_elements = [
+            FakeXmlElement(xint_attribute=str(i), xstring_attribute='string{}'.format(i))
+            for i in range(3)
+        ]
+        objects = MyObject.from_xml_elements(xml_elements)
+        self.assertEqual([obj.int_attribute for obj in objects], [0, 1, 2])
+        self.assertEqual([obj.string_attribute for obj in objects], ['string0', 'string1', 'string2'])
+        # missing attribute
+        self.assertIsNone(objects[0].float_attribute)
+
+        # attribute values are stored in slots
+        self.assertIn('_int_attribute', MyObject.__slots__)
+        self.assertNotIn('_int_attribute', objects[0].__dict__)
+
 ####################################################################################################
 
 if __name__ == '__main__':
@@ -0,0 +1,93 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+####################################################################################################
+
+import unittest
+
+from Patro.Common.Graph.DirectedAcyclicGraph import DirectedAcyclicGraph
+
+####################################################################################################
+
+class TestDirectedAcyclicGraph(unittest.TestCase):
+
+    ##############################################
+
+    def _check_order(self, dag):
+        order = dag.topological_sort()
+        for rank, node in enumerate(order):
+            self.assertEqual(node.rank, rank)
+            for descendant in node.descendants:
+                self.assertLess(node.rank, descendant.rank)
+
+    ##############################################
+
+    def test_topological_order(self):
+
+        dag = DirectedAcyclicGraph()
+        nodes = [dag.add_node(i) for i in range(6)]
+        # edges are added against the insertion order
+        dag.add_edge(nodes[5], nodes[3])
+        dag.add_edge(nodes[4], nodes[1])
+        dag.add_edge(nodes[3], nodes[1])
+        dag.add_edge(nodes[1], nodes[0])
+        dag.add_edge(nodes[2], nodes[0])
+        self._check_order(dag)
+
+        self.assertEqual(dag.descendants_of([nodes[3]]), {nodes[3], nodes[1], nodes[0]})
+        self.assertEqual(dag.ancestors_of([nodes[1]]), {nodes[1], nodes[3], nodes[4], nodes[5]})
+        self.assertEqual(nodes[1].ancestors, {nodes[3], nodes[4]})
+        self.assertEqual(dag.sort([nodes[0], nodes[5], nodes[1]]), [nodes[5], nodes[1], nodes[0]])
+        self.assertEqual(list(nodes[0].ancestor_breadth_first_search())[0], nodes[0])
+
+    ##############################################
+
+    def test_cycle(self):
+
+        dag = DirectedAcyclicGraph()
+        nodes = [dag.add_node(i) for i in range(3)]
+        dag.add_edge(nodes[0], nodes[1])
+        dag.add_edge(nodes[1], nodes[2])
+        with self.assertRaises(NameError):
+            dag.add_edge(nodes[2], nodes[0])
+        with self.assertRaises(NameError):
+            dag.add_edge(nodes[1], nodes[1])
+        self.assertFalse(nodes[0].ancestors)
+        self._check_order(dag)
+
+    ##############################################
+
+    def test_long_chain(self):
+
+        dag = DirectedAcyclicGraph()
+        number_of_nodes = 2000 # above the recursion limit
+        nodes = [dag.add_node(i) for i in range(number_of_nodes)]
+        for i in range(number_of_nodes -1):
+            nodes[i].connect_ancestor(nodes[i+1])
+        self.assertEqual(dag.topological_sort()[0], nodes[-1])
+        self.assertEqual(len(list(nodes[-1].breadth_first_search())), number_of_nodes)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
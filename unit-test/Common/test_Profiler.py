@@ -0,0 +1,68 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+####################################################################################################
+
+import json
+import unittest
+
+from Patro.Common.Profiler import Profiler
+
+####################################################################################################
+
+class TestProfiler(unittest.TestCase):
+
+    ##############################################
+
+    def test(self):
+
+        profiler = Profiler()
+        self.assertFalse(profiler.enabled)
+        with profiler.region('disabled', cls='Foo'):
+            pass
+        self.assertIs(profiler.region('outer'), profiler.region('inner'))
+        self.assertEqual(profiler.stats, {})
+        profiler.enable()
+
+        with profiler.region('outer'):
+            for i in range(3):
+                with profiler.region('inner', cls='Foo', id=i % 2):
+                    pass
+
+        stats = profiler.stats
+        self.assertEqual(stats['outer']['total'].count, 1)
+        self.assertEqual(stats['inner']['total'].count, 3)
+        self.assertEqual(stats['inner']['cls']['Foo'].count, 3)
+        self.assertEqual(stats['inner']['id'][0].count, 2)
+        self.assertLessEqual(stats['inner']['total'].max_time, stats['outer']['total'].cumulative_time)
+
+        profile = json.loads(json.dumps(profiler.to_json()))
+        self.assertEqual(profile['inner']['id']['1']['count'], 1)
+
+        stacks = [line.split(' ')[0] for line in profiler.collapsed_stacks().splitlines()]
+        self.assertEqual(stacks, ['outer', 'outer;inner:Foo'])
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,68 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+####################################################################################################
+
+from Patro.Common.YamlCache import load_yaml, cache_path_of
+
+####################################################################################################
+
+class TestYamlCache(unittest.TestCase):
+
+    ##############################################
+
+    def test(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('data.yaml')
+            path.write_text('a: 1\nb: [1, 2]\n')
+
+            data = load_yaml(path)
+            self.assertEqual(data, {'a': 1, 'b': [1, 2]})
+            cache_path = cache_path_of(path)
+            self.assertTrue(cache_path.exists())
+            self.assertEqual(load_yaml(path), data)
+
+            # touched but unchanged
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(load_yaml(path), data)
+            # the stat of the cache header is refreshed
+            with open(cache_path, 'rb') as fh:
+                self.assertEqual(pickle.load(fh)['mtime'], path.stat().st_mtime_ns)
+
+            # modified
+            path.write_text('a: 2\n')
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2*10**9))
+            self.assertEqual(load_yaml(path), {'a': 2})
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
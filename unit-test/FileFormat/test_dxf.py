@@ -0,0 +1,106 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import ezdxf
+
+from Patro.FileFormat.Dxf.BulkImporter import DxfBulkImporter, weld_points
+from Patro.GeometryEngine.Conic import Circle2D
+from Patro.GeometryEngine.Path import Path2D
+from Patro.GeometryEngine.Polygon import Polygon2D
+from Patro.GeometryEngine.Polyline import Polyline2D
+
+####################################################################################################
+
+class TestDxfBulkImporter(unittest.TestCase):
+
+    ##############################################
+
+    def test_weld_points(self):
+
+        points = [(0, 0), (0.0004, 0), (10, 10), (10, 10.0004), (0.00099, -0.0001), (5, 5)]
+        vertexes = weld_points(points, 1e-3)
+        self.assertEqual(vertexes[0], vertexes[1])
+        self.assertEqual(vertexes[0], vertexes[4])
+        self.assertEqual(vertexes[2], vertexes[3])
+        self.assertEqual(len(set(vertexes.tolist())), 3)
+
+        # same cell but too far
+        vertexes = weld_points([(0, 0), (0.99, 0.99)], 1.)
+        self.assertNotEqual(vertexes[0], vertexes[1])
+
+        # close points on either side of a cell boundary
+        vertexes = weld_points([(0, 0), (0.99, 0), (1.01, 0), (1.9, 0)], 1.)
+        self.assertEqual(vertexes[1], vertexes[2])
+        vertexes = weld_points([(0, 0), (0.99, 0), (1.01, 0), (2.5, 0)], 1.)
+        self.assertEqual(vertexes.tolist(), [0, 0, 0, 1])
+
+    ##############################################
+
+    def test_import(self):
+
+        drawing = ezdxf.new()
+        model_space = drawing.modelspace()
+        # a square with a gap below the tolerance
+        model_space.add_line((0, 0), (10, 0))
+        model_space.add_line((10, 0.0001), (10, 10))
+        model_space.add_line((0, 10), (10, 10))
+        model_space.add_line((0, 10), (0, 0))
+        # a piece with an arc
+        model_space.add_line((20, 0), (30, 0))
+        model_space.add_arc((30, 5), 5, -90, 90)
+        model_space.add_line((30, 10), (20, 10))
+        model_space.add_lwpolyline([(20, 10), (20, 0)])
+        model_space.add_circle((50, 50), 3)
+        model_space.add_lwpolyline([(0, 100), (10, 100), (10, 110)], close=True)
+        # an open path
+        model_space.add_line((100, 0), (110, 0))
+        model_space.add_line((110, 0), (120, 5))
+
+        with tempfile.TemporaryDirectory() as tmp_directory:
+            path = Path(tmp_directory).joinpath('test.dxf')
+            drawing.saveas(path)
+            for streaming in (False, True):
+                importer = DxfBulkImporter(path, streaming=streaming)
+                self.assertEqual(importer.lines.shape, (8, 4))
+                self.assertEqual(importer.arcs.shape, (1, 5))
+                self.assertEqual(len(importer), 5)
+                contours = {contour.__class__: contour for contour in importer.contours}
+                self.assertEqual(len(importer.contours), 4)
+                self.assertEqual(contours[Circle2D].radius, 3)
+                self.assertEqual(contours[Path2D].bounding_box.x.sup, 35)
+                open_path, = importer.open_paths
+                self.assertIsInstance(open_path, Polyline2D)
+                self.assertEqual(open_path.number_of_points, 3)
+                polygons = [contour for contour in importer.contours if isinstance(contour, Polygon2D)]
+                self.assertEqual(sorted(polygon.number_of_points for polygon in polygons), [3, 4])
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -20,18 +20,23 @@
 
 ####################################################################################################
 
+import gzip
 import logging
+import tempfile
 import unittest
 from pathlib import Path
 
+from lxml import etree
+
 from Patro.Common.Logging import Logging
 Logging.setup_logging()
 
 from IntervalArithmetic import Interval2D
 
 from Patro.FileFormat.Svg import SvgFormat
-from Patro.FileFormat.Svg.SvgFile import SvgFile, SvgFileInternal
+from Patro.FileFormat.Svg.SvgFile import RenderState, SvgFile, SvgFileInternal, SvgStreamWriter
 from Patro.GeometryEngine.Transformation import AffineTransformation2D
+from Patro.GraphicEngine.Painter.Paper import PaperSize
 from Patro.GeometryEngine.Vector import Vector2D
 # from PatroExample import find_data_path
 
@@ -136,7 +141,7 @@ class SceneImporter(SvgFileInternal):
 
     def on_graphic_item(self, item):
 
-        state = self._dispatcher.state.clone().merge(item)
+        state = self._dispatcher.state.merge(item)
         self._logger.info('Item: {}\n{}'.format(item.id, item))
         # self._logger.info('Item State:\n' + str(state))
 
@@ -216,6 +221,160 @@ class TestLine2D(unittest.TestCase):
 
 ####################################################################################################
 
+class TestPathData(unittest.TestCase):
+
+    ##############################################
+
+    def test_tokenizer(self):
+
+        iter_commands = SvgFormat.PathDataAttribute.iter_commands
+        self.assertEqual(list(iter_commands('M10-5L.5.5 1e2,3zm1 1 2 2')), [
+            ('M', [10, -5]),
+            ('L', [.5, .5]),
+            ('L', [100, 3]),
+            ('z', []),
+            ('m', [1, 1]),
+            ('l', [2, 2]),
+        ])
+        self.assertEqual(list(iter_commands('a25 25 0 1050 0')), [('a', [25, 25, 0, 1, 0, 50, 0])])
+        for path_data in ('M 0 0 X 1', 'M 0 0 L 1', 'M 0 0 z 1', 'foo M 0 0', 'M 1 - 2', 'M1 2e', 'M1 2e3e4 5'):
+            with self.assertRaises(ValueError):
+                list(iter_commands(path_data))
+
+    ##############################################
+
+    def test_polyline_coordinates(self):
+
+        polyline_coordinates = SvgFormat.PathDataAttribute.polyline_coordinates
+        polylines = polyline_coordinates('M0 0h10v10l-10 0z m20 20 5 5')
+        self.assertEqual(len(polylines), 2)
+        self.assertEqual(polylines[0].tolist(), [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]])
+        self.assertEqual(polylines[1].tolist(), [[20, 20], [25, 25]])
+        for path_data in ('M0 0 C 1 1 2 2 3 3', 'M 1 - 2', 'M1 2e'):
+            with self.assertRaises(ValueError):
+                polyline_coordinates(path_data)
+
+####################################################################################################
+
+class TestStreaming(unittest.TestCase):
+
+    ##############################################
+
+    def test_iter_geometry(self):
+
+        svg_importer = SvgFileInternal(None, svg_data, streaming=True)
+        geometries = list(svg_importer.iter_geometry())
+        self.assertEqual(len(geometries), count_svg_tags(svg_data)['path'] + count_svg_tags(svg_data)['rect'])
+        self.assertEqual(svg_importer.view_box, Interval2D((0, 140), (0, 140)))
+        self.assertEqual(geometries[0].bounding_box, Interval2D((20, 120), (20, 20)))
+
+    ##############################################
+
+    def test_group_state(self):
+
+        data = """
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" height="100mm" width="100mm">
+  <defs><circle cx="0" cy="0" r="1" /></defs>
+  <g transform="translate(10,0)">
+    <circle cx="0" cy="0" r="1" />
+    <g transform="translate(0,10)"><line x1="0" y1="0" x2="1" y2="1" /></g>
+    <polygon points="0,0 1,0 1,1" />
+  </g>
+  <polyline points="0,0 1,1 2,0" />
+</svg>
+"""
+        svg_importer = SvgFileInternal(None, data, streaming=True)
+        geometries = list(svg_importer.iter_geometry())
+        self.assertEqual([geometry.__class__.__name__ for geometry in geometries],
+                         ['Circle2D', 'Segment2D', 'Polygon2D', 'Polyline2D'])
+        self.assertEqual(geometries[0].center, Vector2D(10, 0))
+        self.assertEqual(geometries[1].bounding_box, Interval2D((10, 11), (10, 11)))
+        self.assertEqual(geometries[2].bounding_box, Interval2D((10, 11), (0, 1)))
+        self.assertEqual(geometries[3].bounding_box, Interval2D((0, 2), (0, 1)))
+
+####################################################################################################
+
+class TestRenderState(unittest.TestCase):
+
+    ##############################################
+
+    def test_merge(self):
+
+        state = RenderState()
+        group = SvgFormat.Group(transform='translate(10,0)', style='stroke:#000000;stroke-width:2')
+        group_state = state.merge(group)
+        self.assertIsNot(group_state, state)
+        self.assertEqual(state.stroke, None)
+        self.assertEqual(group_state.stroke, '#000000')
+        self.assertEqual(group_state.stroke_width, 2)
+
+        # an item without presentation attribute shares the state of its group
+        item = SvgFormat.Line(x1=0, y1=0, x2=1, y2=1)
+        self.assertIs(group_state.merge(item), group_state)
+
+        # items having the same style share their state
+        item1 = SvgFormat.Line(style='fill:#ff0000')
+        item2 = SvgFormat.Line(style='fill:#ff0000')
+        item_state = group_state.merge(item1)
+        self.assertIs(group_state.merge(item2), item_state)
+        self.assertEqual(item_state.fill, '#ff0000')
+        self.assertEqual(item_state.stroke, '#000000')
+        self.assertIs(item_state.transform, group_state.transform)
+
+        item = SvgFormat.Line(transform='translate(0,10)')
+        transform = group_state.merge(item).transform
+        self.assertEqual(transform * Vector2D(0, 0), Vector2D(10, 10))
+
+####################################################################################################
+
+class TestStreamWriter(unittest.TestCase):
+
+    ##############################################
+
+    def test_format_number(self):
+
+        format_number = SvgStreamWriter.format_number
+        self.assertEqual(format_number(1, 3), '1')
+        self.assertEqual(format_number(10.5, 3), '10.5')
+        self.assertEqual(format_number(0.25, 3), '.25')
+        self.assertEqual(format_number(-0.1234, 3), '-.123')
+        self.assertEqual(format_number(-0.0001, 3), '0')
+
+    ##############################################
+
+    def test_write(self):
+
+        paper = PaperSize('a4', 'portrait', 10)
+        style = dict(stroke='black', stroke_width='1')
+        other_style = dict(stroke='red', stroke_width='1')
+        for suffix in ('.svg', '.svgz'):
+            with tempfile.TemporaryDirectory() as tmp_directory:
+                path = Path(tmp_directory).joinpath('test' + suffix)
+                with SvgStreamWriter(path, paper, precision=2) as writer:
+                    writer.line(Vector2D(0, 0), Vector2D(10, 0), **style)
+                    writer.line(Vector2D(10, 0), Vector2D(10, 10.5), **style)
+                    writer.line(Vector2D(0, 20), Vector2D(.5, -.5), **style)
+                    writer.cubic(Vector2D(.5, -.5), Vector2D(1, 1), Vector2D(2, 2), Vector2D(3, 3), **style)
+                    writer.line(Vector2D(3, 3), Vector2D(4, 4), **other_style)
+                    writer.write(SvgFormat.Circle(cx=1, cy=1, r=2))
+                with open(path, 'rb') as fh:
+                    data = fh.read()
+                if suffix == '.svgz':
+                    data = gzip.decompress(data)
+                root = etree.fromstring(data)
+                paths = root.findall('{http://www.w3.org/2000/svg}path')
+                self.assertEqual([element.get('d') for element in paths], [
+                    'M0 0L10 0 10 10.5M0 20L.5-.5C1 1 2 2 3 3',
+                    'M3 3L4 4',
+                ])
+                self.assertEqual(paths[1].get('stroke'), 'red')
+                self.assertEqual(len(root), 4)   # comment, 2 paths, circle
+
+                geometries = list(SvgFileInternal(None, data, streaming=True).iter_geometry())
+                self.assertEqual(len(geometries), 3)
+
+####################################################################################################
+
 if __name__ == '__main__':
 
     unittest.main()
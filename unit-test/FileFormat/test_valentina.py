@@ -0,0 +1,111 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+####################################################################################################
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from Patro.FileFormat.Valentina.Pattern import ValFileReader
+from Patro.FileFormat.Valentina.PatternCache import PatternCache
+
+####################################################################################################
+
+VAL_SOURCE = '''<?xml version="1.0" encoding="UTF-8"?>
+<pattern>
+    <version>0.7.10</version>
+    <unit>cm</unit>
+    <measurements/>
+    <increments/>
+    <draw name="front">
+        <calculation>
+            <point id="1" mx="0.1" x="0" y="0" name="A" type="single" my="0.2"/>
+            <point id="2" basePoint="1" typeLine="hair" mx="0.1" length="10" name="B" lineColor="blue" type="endLine" angle="0" my="0.2"/>
+        </calculation>
+        <modeling>
+            <point id="4" idObject="1" inUse="true" mx="0.1" type="modeling" my="0.2"/>
+            <point id="5" idObject="2" inUse="true" mx="0.1" type="modeling" my="0.2"/>
+        </modeling>
+        <details>
+            <detail id="6" version="2" forbidFlipping="false" width="1" united="false" mx="0" name="Front" seamAllowance="true" my="0">
+                <nodes>
+                    <node idObject="4" type="NodePoint"/>
+                    <node idObject="5" type="NodePoint"/>
+                </nodes>
+            </detail>
+        </details>
+    </draw>
+    <draw name="back">
+        <calculation>
+            <point id="3" mx="0.1" x="10" y="10" name="A" type="single" my="0.2"/>
+        </calculation>
+        <modeling/>
+        <details/>
+    </draw>
+</pattern>
+'''
+
+####################################################################################################
+
+class TestValFileReader(unittest.TestCase):
+
+    ##############################################
+
+    def test_lazy(self):
+
+        with tempfile.TemporaryDirectory() as tmp_directory:
+            val_path = Path(tmp_directory).joinpath('pattern.val')
+            with open(val_path, 'w') as fh:
+                fh.write(VAL_SOURCE)
+
+            val_file = ValFileReader(val_path, lazy=True)
+            self.assertEqual(val_file.scope_names, ['front', 'back'])
+            front, back = val_file.pattern.scopes
+            self.assertFalse(front.is_loaded)
+            self.assertFalse(back.is_loaded)
+            point = back.sketch.get_operation('A')
+            self.assertEqual((point.vector.x, point.vector.y), (10, 10))
+            self.assertTrue(back.is_loaded)
+            self.assertFalse(front.is_loaded)
+            self.assertEqual(len(front.sketch.operations), 2)
+            details = val_file.read_details('front')
+            self.assertEqual(len(details), 1)
+            detail = details[0]
+            self.assertEqual(detail.name, 'Front')
+            self.assertEqual([(node.object_id, modeling_item.object_id)
+                              for node, modeling_item in detail.iter_on_nodes()], [(4, 1), (5, 2)])
+            self.assertEqual(val_file.read_details('back'), [])
+
+            val_file = ValFileReader(val_path, scopes=('back',))
+            self.assertEqual(val_file.pattern.scope_names(), ['back'])
+            self.assertEqual(val_file.scope_names, ['front', 'back'])
+
+            # the cache stores fully evaluated patterns
+            with self.assertRaises(ValueError):
+                ValFileReader(val_path, cache=PatternCache(tmp_directory), lazy=True)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,139 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+####################################################################################################
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from Patro.FileFormat.Valentina.Pattern import ValFileReader
+from Patro.FileFormat.Valentina.PatternCache import PatternCache
+
+####################################################################################################
+
+VIT_SOURCE = '''<?xml version='1.0' encoding='UTF-8'?>
+<vit>
+  <version>0.3.3</version>
+  <read-only>false</read-only>
+  <notes/>
+  <unit>cm</unit>
+  <pm_system>998</pm_system>
+  <personal>
+    <customer>John Doe</customer>
+    <birth-date>1970-01-01</birth-date>
+    <gender>male</gender>
+    <email/>
+  </personal>
+  <body-measurements>
+    <m value="96" name="hip_circ"/>
+    <m value="(hip_circ/4)" name="@hip_quarter"/>
+  </body-measurements>
+</vit>
+'''
+
+VAL_SOURCE = '''<?xml version="1.0" encoding="UTF-8"?>
+<pattern>
+    <version>0.7.10</version>
+    <unit>cm</unit>
+    <description/>
+    <notes/>
+    <measurements>measurements.vit</measurements>
+    <increments/>
+    <draw name="piece">
+        <calculation>
+            <point id="1" mx="0.1" x="0" y="0" name="A" type="single" my="0.2"/>
+            <point id="2" basePoint="1" typeLine="hair" mx="0.1" length="@hip_quarter" name="B" lineColor="blue" type="endLine" angle="0" my="0.2"/>
+            <point id="3" firstPoint="1" typeLine="hair" mx="0.1" secondPoint="2" length="Line_A_B/2" name="C" lineColor="black" type="alongLine" my="0.2"/>
+            <line id="4" firstPoint="1" typeLine="hair" secondPoint="3" lineColor="black"/>
+        </calculation>
+        <modeling/>
+        <details/>
+    </draw>
+</pattern>
+'''
+
+####################################################################################################
+
+class TestPatternCache(unittest.TestCase):
+
+    ##############################################
+
+    def _point_coordinates(self, pattern):
+        return {operation.name:(operation.vector.x, operation.vector.y)
+                for operation in pattern.scope(0).sketch.operations
+                if hasattr(operation, 'vector')}
+
+    ##############################################
+
+    def test(self):
+
+        with tempfile.TemporaryDirectory() as tmp_directory:
+            tmp_directory = Path(tmp_directory)
+            with open(tmp_directory.joinpath('measurements.vit'), 'w') as fh:
+                fh.write(VIT_SOURCE)
+            val_path = tmp_directory.joinpath('pattern.val')
+            with open(val_path, 'w') as fh:
+                fh.write(VAL_SOURCE)
+
+            cache = PatternCache(tmp_directory.joinpath('cache'))
+            self.assertIsNone(cache.load(val_path))
+
+            val_file = ValFileReader(val_path, cache=cache)
+            coordinates = self._point_coordinates(val_file.pattern)
+            self.assertEqual(coordinates['C'], (12, 0))
+            self.assertGreater(cache.size, 0)
+
+            cached_val_file = ValFileReader(val_path, cache=cache)
+            self.assertIsNot(cached_val_file.pattern, val_file.pattern)
+            self.assertEqual(self._point_coordinates(cached_val_file.pattern), coordinates)
+            self.assertEqual(float(cached_val_file.measurements['@hip_quarter']), 24)
+            sketch = cached_val_file.pattern.scope(0).sketch
+            point_c = sketch.get_operation('C')
+            self.assertEqual({operation.name for operation in point_c.dependencies}, {'A', 'B'})
+            self.assertEqual(point_c.length.value, 12)
+            self.assertEqual(str(cached_val_file.vit_file.path.name), 'measurements.vit')
+
+            # a modified measurement file invalidates the entry
+            with open(tmp_directory.joinpath('measurements.vit'), 'w') as fh:
+                fh.write(VIT_SOURCE.replace('"96"', '"100"'))
+            self.assertIsNone(cache.load(val_path))
+            val_file = ValFileReader(val_path, cache=cache)
+            self.assertEqual(self._point_coordinates(val_file.pattern)['C'], (12.5, 0))
+
+            # LRU eviction
+            cache._max_size = 1
+            cache._evict()
+            self.assertEqual(len(cache._entry_paths()), 1)
+
+            # corrupted entry
+            entry_path = cache._entry_paths()[0]
+            with open(entry_path, 'wb') as fh:
+                fh.write(b'garbage')
+            self.assertIsNone(cache.load(val_path))
+            self.assertFalse(entry_path.exists())
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,77 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2017 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import ezdxf
+
+####################################################################################################
+
+from Patro.GeometryEngine.Vector import Vector2D
+from Patro.GraphicEngine.GraphicScene.GraphicStyle import GraphicPathStyle
+from Patro.GraphicEngine.GraphicScene.Scene import GraphicScene
+from Patro.GraphicEngine.Painter.DxfPainter import DxfPainter, EzdxfPainter
+from Patro.GraphicEngine.Painter.Paper import PaperSize
+
+####################################################################################################
+
+class TestDxfPainter(unittest.TestCase):
+
+    ##############################################
+
+    def test(self):
+
+        scene = GraphicScene()
+        path_style = GraphicPathStyle()
+        points = [Vector2D(0, 0), Vector2D(1, 0), Vector2D(1, 1), Vector2D(0, 1)]
+        for i in range(4):
+            scene.segment(points[i], points[(i+1) % 4], path_style, user_data=i)
+        scene.segment(Vector2D(5, 5), Vector2D(6, 5), path_style, user_data=10)
+        # back and forth
+        scene.segment(Vector2D(10, 10), Vector2D(11, 10), path_style, user_data=11)
+        scene.segment(Vector2D(11, 10), Vector2D(10, 10), path_style, user_data=12)
+        for i in range(3):
+            scene.circle(Vector2D(i, i), '1pt', path_style, user_data=20+i)
+
+        paper = PaperSize('a4', 'portrait', 10)
+        with tempfile.TemporaryDirectory() as tmp_directory:
+            path = Path(tmp_directory).joinpath('test.dxf')
+            painter = DxfPainter(path, scene, paper)
+            self.assertEqual(painter.number_of_painted_items, 10)
+            self.assertEqual(painter.number_of_culled_items, 0)
+            drawing = ezdxf.readfile(path)
+
+        model_space = drawing.modelspace()
+        self.assertEqual([entity.dxftype() for entity in model_space],
+                         ['LWPOLYLINE', 'LINE', 'LINE', 'INSERT', 'INSERT', 'INSERT'])
+        polyline = model_space[0]
+        self.assertTrue(polyline.closed)
+        self.assertEqual(len(polyline), 4)
+        self.assertIn(EzdxfPainter.POINT_BLOCK, drawing.blocks)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
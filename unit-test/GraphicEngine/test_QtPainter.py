@@ -0,0 +1,206 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2017 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+"""Offscreen smoke tests of the Qt painters, they are skipped if no Qt binding is installed."""
+
+####################################################################################################
+
+import os
+import unittest
+
+import numpy as np
+
+from IntervalArithmetic import Interval2D
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+    from QtShim.QtCore import Qt, QPointF, QRectF
+    from QtShim.QtGui import QGuiApplication, QImage, QPainter
+except ImportError:
+    QGuiApplication = None
+
+####################################################################################################
+
+from Patro.GeometryEngine.Vector import Vector2D
+from Patro.GraphicEngine.GraphicScene.GraphicStyle import GraphicPathStyle, GraphicBezierStyle, Font
+if QGuiApplication is not None:
+    from Patro.GraphicEngine.Painter.QtPainter import (
+        QtPainter, QtQuickPaintedSceneItem, QtScene, RenderJob, TileArea, TileRenderer,
+    )
+    from Patro.GraphicEngine.Painter.TileCache import TileCache
+
+####################################################################################################
+
+def make_scene():
+
+    scene = QtScene()
+    scene.bounding_box = Interval2D((0, 60), (0, 60))
+    path_style = GraphicPathStyle(line_width=2)
+    scene.add_coordinate('O', Vector2D(0, 0))
+    scene.segment('O', Vector2D(10, 10), path_style, user_data=1)
+    scene.segment(Vector2D(10, 10), Vector2D(20, 0), path_style, user_data=2)
+    scene.polyline([Vector2D(0, 20), Vector2D(10, 30), Vector2D(20, 20)], path_style, user_data=3)
+    scene.polygon([Vector2D(30, 0), Vector2D(40, 0), Vector2D(40, 10)], GraphicPathStyle(fill_color='blue'),
+                  user_data=4)
+    scene.cubic_bezier(Vector2D(0, 40), Vector2D(10, 50), Vector2D(20, 30), Vector2D(30, 40), path_style,
+                       user_data=5)
+    scene.cubic_bezier(Vector2D(0, 40), Vector2D(10, 50), Vector2D(20, 30), Vector2D(30, 45),
+                       GraphicBezierStyle(show_control=True, control_color='red'), user_data=6)
+    scene.quadratic_bezier(Vector2D(0, 50), Vector2D(10, 60), Vector2D(20, 50), path_style, user_data=7)
+    scene.circle(Vector2D(50, 50), 2, GraphicPathStyle(fill_color='black'), user_data=8)
+    scene.ellipse(Vector2D(50, 20), 3, 2, 0, path_style, user_data=9)
+    scene.text(Vector2D(5, 5), 'label', Font('', 12), user_data=10)
+    return scene
+
+####################################################################################################
+
+def to_array(image):
+    image = image.convertToFormat(QImage.Format_ARGB32)
+    bits = image.constBits()
+    bits.setsize(image.byteCount())
+    return np.frombuffer(bits, np.uint8).reshape(image.height(), image.width(), 4).astype(int)
+
+####################################################################################################
+
+@unittest.skipIf(QGuiApplication is None, 'no Qt binding')
+class TestQtPainter(unittest.TestCase):
+
+    ##############################################
+
+    @classmethod
+    def setUpClass(cls):
+        cls._application = QGuiApplication.instance() or QGuiApplication([])
+
+    ##############################################
+
+    def _make_item(self, scene, tiled=True, render_thread=False):
+        item = QtQuickPaintedSceneItem()
+        item.setWidth(400)
+        item.setHeight(300)
+        item._viewport_area.viewport_size = QRectF(0, 0, 400, 300)
+        item.scene = scene
+        item._use_tile_cache = tiled
+        item._use_render_thread = render_thread
+        return item
+
+    ##############################################
+
+    def _paint(self, item, clip=None):
+        image = QImage(400, 300, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.white)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if clip is not None:
+            painter.setClipRect(clip)
+        item.paint(painter)
+        painter.end()
+        return image
+
+    ##############################################
+
+    def test_painter(self):
+
+        scene = make_scene()
+        painter = QtPainter(scene)
+        painter._scale = 5
+        image = QImage(300, 300, QImage.Format_ARGB32)
+        image.fill(Qt.white)
+        qpainter = QPainter(image)
+        painter.paint(qpainter)
+        qpainter.end()
+        self.assertEqual(painter.number_of_painted_items, len(scene))
+        self.assertTrue((to_array(image) != 255).any())
+
+    ##############################################
+
+    def test_tile_renderer(self):
+
+        scene = make_scene()
+        tile_cache = TileCache(tile_size=64)
+        display_list = scene.display_list
+        tile_area = TileArea(4., 0, -1, tile_cache)
+        indexes = display_list.indexes_of(scene.item_ids_in_bounding_box(tile_area.area))
+        self.assertTrue(indexes)
+        renderer = TileRenderer(scene, tile_area, 64, display_list, indexes)
+        image = renderer.render()
+        self.assertEqual(image.width(), 64)
+
+        images = []
+        job = RenderJob(('scene', 4., 0, -1), renderer)
+        job.signals.finished.connect(lambda job, image: images.append(image))
+        job.run()
+        self.assertEqual(len(images), 1)
+
+        grid = TileRenderer(scene, tile_area, 64, grid_step=10).render()
+        self.assertEqual(grid.width(), 64)
+
+    ##############################################
+
+    def test_tiled_paint(self):
+
+        # the tiles must look like a direct paint
+        scene = make_scene()
+        tiled_item = self._make_item(scene)
+        direct_item = self._make_item(scene, tiled=False)
+        for item in (tiled_item, direct_item):
+            item._show_grid = False
+        tiled = to_array(self._paint(tiled_item))
+        direct = to_array(self._paint(direct_item))
+        painted = (direct.min(axis=2) < 200).sum()
+        self.assertGreater(painted, 1000)
+        different = (np.abs(tiled - direct).max(axis=2) > 64).sum()
+        self.assertLess(different, painted / 10)
+
+    ##############################################
+
+    def test_render_thread(self):
+
+        scene = make_scene()
+        item = self._make_item(scene, render_thread=True)
+        self._paint(item)
+        self.assertTrue(item._pending_jobs)
+        item._thread_pool.waitForDone()
+        # deliver the queued signals of the worker threads
+        self._application.processEvents()
+        self.assertFalse(item._pending_jobs)
+        self._paint(item)
+        self.assertIsNotNone(item._last_frame)
+
+    ##############################################
+
+    def test_damaged_areas(self):
+
+        scene = make_scene()
+        item = self._make_item(scene)
+        self._paint(item)
+        # the second selection repaints the damaged areas
+        item.item_at(QPointF(200, 150))
+        item.item_at(QPointF(100, 100))
+        self.assertIsNotNone(item._update_counter)
+        self._paint(item, QRectF(10, 10, 50, 50))
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
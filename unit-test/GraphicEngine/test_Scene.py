@@ -0,0 +1,208 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2017 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+import unittest
+
+from IntervalArithmetic import Interval2D
+
+####################################################################################################
+
+from Patro.FileFormat.Svg.SvgFormat import PathDataAttribute
+from Patro.GeometryEngine.Vector import Vector2D
+from Patro.GraphicEngine.GraphicScene.GraphicStyle import GraphicPathStyle
+from Patro.GraphicEngine.GraphicScene.Scene import GraphicScene
+
+####################################################################################################
+
+class TestScene(unittest.TestCase):
+
+    ##############################################
+
+    def test_rtree(self):
+
+        scene = GraphicScene()
+        path_style = GraphicPathStyle()
+        items = [
+            scene.segment(Vector2D(10*i, 0), Vector2D(10*i + 1, 1), path_style, user_data=i)
+            for i in range(100)
+        ]
+
+        def found(bounding_box):
+            return sorted(item.user_data for item in scene.item_in_bounding_box(bounding_box))
+
+        self.assertEqual(found((-1, -1, 12, 2)), [0, 1])
+        self.assertEqual(len(scene._item_bounding_box_cache), 100)
+
+        # move an item
+        item = items[50]
+        item._position1 = Vector2D(1000, 0)
+        item._position2 = Vector2D(1001, 1)
+        item.dirty = True
+        self.assertEqual(found((495, -1, 505, 2)), [])
+        self.assertEqual(found((999, -1, 1002, 2)), [50])
+
+        # add and remove
+        scene.segment(Vector2D(0, 5), Vector2D(1, 6), path_style, user_data=200)
+        self.assertEqual(found((-1, -1, 2, 7)), [0, 200])
+        scene.remove_item(items[0])
+        self.assertEqual(found((-1, -1, 2, 7)), [200])
+        self.assertEqual(len(scene), 100)
+
+        self.assertEqual([distance_item[1].user_data for distance_item in scene.item_at(Vector2D(10, 0), 1)], [1])
+
+    ##############################################
+
+    def test_z_value_iter(self):
+
+        scene = GraphicScene()
+        path_style = GraphicPathStyle()
+        for i in range(10):
+            item = scene.segment(Vector2D(i, 0), Vector2D(i + .5, 1), path_style, user_data=i)
+            item.z_value = -i if i % 2 else 0
+        items = [item.user_data for item in scene.z_value_iter()]
+        self.assertEqual(items, [9, 7, 5, 3, 1, 0, 2, 4, 6, 8])
+        items = [item.user_data for item in scene.z_value_iter(Interval2D((2.8, 6.2), (0, 1)))]
+        self.assertEqual(items, [5, 3, 4, 6])
+
+        # hidden items keep their place when shown again
+        scene_items = list(scene)
+        scene_items[4].visible = False
+        self.assertEqual([item.user_data for item in scene.z_value_iter()], [9, 7, 5, 3, 1, 0, 2, 6, 8])
+        scene_items[4].visible = True
+        self.assertEqual([item.user_data for item in scene.z_value_iter()], [9, 7, 5, 3, 1, 0, 2, 4, 6, 8])
+
+        scene_items[2].z_value = 1
+        scene.remove_item(scene_items[9])
+        self.assertEqual([item.user_data for item in scene.z_value_iter()], [7, 5, 3, 1, 0, 4, 6, 8, 2])
+
+        scene_items[6].selected = True
+        scene_items[3].selected = True
+        self.assertEqual(sorted(item.user_data for item in scene.selected_items), [3, 6])
+        scene.unselect_items()
+        self.assertEqual(scene.selected_items, [])
+
+    ##############################################
+
+    def test_display_list(self):
+
+        scene = GraphicScene()
+        path_style = GraphicPathStyle()
+        scene.add_coordinate('O', Vector2D(1, 2))
+        scene.segment('O', Vector2D(3, 4), path_style, user_data=0)
+        item = scene.circle(Vector2D(5, 6), '1pt', GraphicPathStyle(), user_data=1)
+        item.z_value = -1
+
+        display_list = scene.display_list
+        self.assertIs(scene.display_list, display_list)
+        self.assertEqual(len(display_list), 2)
+        self.assertEqual(display_list.items[0], item)
+        self.assertEqual(display_list.coordinates.tolist(), [[5, 6], [1, 2], [3, 4]])
+        self.assertEqual(display_list.offsets.tolist(), [0, 1, 3])
+        self.assertEqual(display_list.style_indexes.tolist(), [0, 1])
+        self.assertEqual(display_list.positions_of(1), [Vector2D(1, 2), Vector2D(3, 4)])
+        self.assertEqual(display_list.extents.tolist(), [0, 2])
+        coordinates, offsets = display_list.gather([1])
+        self.assertEqual(coordinates.tolist(), [[1, 2], [3, 4]])
+        self.assertEqual(offsets.tolist(), [0, 2])
+        coordinates, offsets = display_list.gather([1, 0])
+        self.assertEqual(coordinates.tolist(), [[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(offsets.tolist(), [0, 2, 3])
+        self.assertIs(display_list.gather(range(2))[0], display_list.coordinates)
+
+        item.visible = False
+        self.assertIsNot(scene.display_list, display_list)
+        self.assertEqual(len(scene.display_list), 1)
+
+    ##############################################
+
+    def test_set_coordinate(self):
+
+        scene = GraphicScene()
+        path_style = GraphicPathStyle()
+        scene.add_coordinate('A', Vector2D(0, 0))
+        item1 = scene.segment('A', Vector2D(1, 1), path_style, user_data=1)
+        item2 = scene.segment(Vector2D(2, 2), Vector2D(3, 3), path_style, user_data=2)
+
+        self.assertEqual(item1.casted_positions, [Vector2D(0, 0), Vector2D(1, 1)])
+        coordinates2 = scene.casted_coordinates(item2)
+        self.assertEqual(item1.bounding_box.bounding_box, (0, 0, 1, 1))
+        version = scene.version
+
+        scene.set_coordinate('A', Vector2D(-1, 0))
+        self.assertGreater(scene.version, version)
+        self.assertEqual(item1.bounding_box.bounding_box, (-1, 0, 1, 1))
+        self.assertEqual(scene.display_list.coordinates_of(0).tolist(), [[-1, 0], [1, 1]])
+        # only the items which reference the coordinate are updated
+        self.assertIs(scene.casted_coordinates(item2), coordinates2)
+
+    ##############################################
+
+    def test_damaged_areas(self):
+
+        scene = GraphicScene()
+        path_style = GraphicPathStyle()
+        item1 = scene.segment(Vector2D(0, 0), Vector2D(1, 1), path_style, user_data=1)
+        item2 = scene.segment(Vector2D(5, 5), Vector2D(6, 6), path_style, user_data=2)
+        scene.update_rtree()
+
+        counter = scene.damage_counter
+        self.assertEqual(scene.damaged_areas(counter), [])
+        self.assertIsNone(scene.damaged_areas(0))
+
+        item2._position2 = Vector2D(7, 8)
+        item2.dirty = True
+        item1.selected = True
+        # old and new area of item2, then item1
+        self.assertEqual(scene.damaged_areas(counter), [(5, 5, 6, 6), (5, 5, 7, 8), (0, 0, 1, 1)])
+
+        # the old and new areas of a damage are evicted together
+        scene.MAX_DAMAGES = 3
+        scene.update_rtree()
+        counter = scene.damage_counter
+        item2._position2 = Vector2D(9, 9)
+        item2.dirty = True
+        self.assertIsNone(scene.damaged_areas(counter - 1))
+        self.assertEqual(scene.damaged_areas(counter), [(5, 5, 7, 8), (5, 5, 9, 9)])
+
+    ##############################################
+
+    def test_add_smooth_path(self):
+
+        path_style = GraphicPathStyle()
+        for svg_path in (
+                'M0 0 C 1 1 2 2 3 3 S 5 5 6 6',
+                'M0 0 Q 1 1 2 0 T 4 0',
+        ):
+            path = PathDataAttribute.from_xml(svg_path)
+            scene = GraphicScene()
+            scene.add_path(path, path_style)
+            # smooth segments are not yet rendered
+            self.assertEqual(len(scene), 1)
+            item = scene.add_path(path, path_style, as_segments=False)
+            self.assertEqual(len(scene), 2)
+            self.assertEqual(len(item), 1)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
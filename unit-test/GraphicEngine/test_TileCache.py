@@ -0,0 +1,68 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2017 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+import unittest
+
+####################################################################################################
+
+from Patro.GraphicEngine.Painter.TileCache import TileCache
+
+####################################################################################################
+
+class TestTileCache(unittest.TestCase):
+
+    ##############################################
+
+    def test(self):
+
+        cache = TileCache(tile_size=100, max_memory=3)
+
+        # 1 px / mm, rows go downward
+        self.assertEqual(cache.tile_area(1, 0, 0), (0, -100, 100, 0))
+        self.assertEqual(cache.tile_area(2, 1, -1), (50, 0, 100, 50))
+        self.assertEqual(cache.tiles_for((-10, -10, 150, 10), 1), [(-1, -1), (0, -1), (1, -1), (-1, 0), (0, 0), (1, 0)])
+
+        for column in range(3):
+            cache.add(('scene', 1, column, 0), column, 1)
+        self.assertEqual(cache.get(('scene', 1, 0, 0)), 0)
+        # LRU
+        cache.add(('grid', 1, 0, 0), 'grid', 1)
+        self.assertNotIn(('scene', 1, 1, 0), cache)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.memory, 3)
+
+        # tile (2, 0) covers x in [200, 300]
+        self.assertEqual(cache.invalidate('scene', (250, -50, 260, -40)), 1)
+        self.assertNotIn(('scene', 1, 2, 0), cache)
+        self.assertEqual(cache.invalidate('scene', (101, -50, 110, -40)), 0)
+        self.assertEqual(cache.invalidate('scene', (101, -50, 110, -40), margin=2), 1)
+        self.assertIn(('grid', 1, 0, 0), cache)
+
+        cache.clear('grid')
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.memory, 0)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
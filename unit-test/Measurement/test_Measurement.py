@@ -0,0 +1,102 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+import unittest
+
+import numpy as np
+
+from Patro.Measurement.Measurement import MeasurementSet
+
+####################################################################################################
+
+class TestMeasurementSet(unittest.TestCase):
+
+    ##############################################
+
+    def _make_measurements(self):
+
+        measurements = MeasurementSet()
+        # defined before its dependencies
+        measurements.add('hip_circ_with_abdomen', '(hip_arc_b + hip_with_abdomen_arc_f)')
+        measurements.add('hip_arc_b', '(hip_circ - hip_arc_f)')
+        measurements.add('hip_circ', 96)
+        measurements.add('hip_arc_f', '10/3')
+        measurements.add('hip_with_abdomen_arc_f', '1')
+        measurements.add('waist_circ', 84)
+        return measurements
+
+    ##############################################
+
+    def test_eval(self):
+
+        measurements = self._make_measurements()
+        self.assertEqual(measurements['hip_arc_b'].value, 96 - 10/3)
+        self.assertEqual(measurements['hip_circ_with_abdomen'].value, 96 - 10/3 + 1)
+        self.assertEqual(float(measurements.hip_circ), 96)
+
+        names = [measurement.name for measurement in measurements.sorted_measurements]
+        self.assertLess(names.index('hip_circ'), names.index('hip_arc_b'))
+        self.assertLess(names.index('hip_arc_b'), names.index('hip_circ_with_abdomen'))
+
+    ##############################################
+
+    def test_update(self):
+
+        measurements = self._make_measurements()
+        measurements.eval()
+        measurements.update({'hip_circ': 100})
+        self.assertEqual(measurements['hip_arc_b'].value, 100 - 10/3)
+        self.assertEqual(measurements['hip_circ_with_abdomen'].value, 100 - 10/3 + 1)
+
+        measurements.update({'hip_arc_b': 50})
+        self.assertTrue(measurements['hip_arc_b'].is_constant)
+        self.assertEqual(measurements['hip_circ_with_abdomen'].value, 51)
+
+    ##############################################
+
+    def test_eval_array(self):
+
+        measurements = self._make_measurements()
+        arrays = measurements.eval_array({'hip_circ': [90, 100, 110]})
+        np.testing.assert_allclose(arrays['hip_arc_b'], np.array([90, 100, 110]) - 10/3)
+        np.testing.assert_allclose(arrays['waist_circ'], [84, 84, 84])
+
+    ##############################################
+
+    def test_error(self):
+
+        measurements = MeasurementSet()
+        measurements.add('a', 'b + 1')
+        measurements.add('b', 'a * 2')
+        with self.assertRaises(NameError):
+            measurements.eval()
+
+        measurements = MeasurementSet()
+        measurements.add('a', 'c + 1')
+        with self.assertRaises(NameError):
+            measurements.eval()
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
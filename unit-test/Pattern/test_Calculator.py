@@ -0,0 +1,77 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+####################################################################################################
+
+import unittest
+
+from Patro.Measurement.Measurement import MeasurementSet
+from Patro.Pattern.Calculator import Expression
+from Patro.Pattern.Pattern import Pattern
+from Patro.Pattern.SketchOperation import AlongLinePoint, SimpleInteractiveSpline, SinglePoint
+
+####################################################################################################
+
+class TestCalculator(unittest.TestCase):
+
+    ##############################################
+
+    def test_spline_functions(self):
+
+        measurements = MeasurementSet()
+        measurements.add('length1', 10)
+        pattern = Pattern(measurements, 'cm')
+        sketch = pattern.add_scope('test').sketch
+
+        operations = []
+        def add(operation):
+            sketch._add_operation(operation)
+            operations.append(operation)
+            return operation
+
+        point_a = add(SinglePoint(sketch, 'A', 0, 0, None))
+        point_b = add(SinglePoint(sketch, 'B', 10, 0, None))
+        spline = add(SimpleInteractiveSpline(sketch, point_a, point_b, 45, 'length1', 135, 5))
+        point_c = add(AlongLinePoint(sketch, 'C', point_a, point_b, 'Spl_A_B', None))
+        point_d = add(AlongLinePoint(sketch, 'D', point_a, point_b,
+                                     'Angle1Spl_A_B + Angle2Spl_A_B + C1LengthSpl_A_B + C2LengthSpl_A_B',
+                                     None))
+        sketch.eval()
+
+        length = spline.geometry().length
+        self.assertAlmostEqual(point_c.vector.x, length)
+        self.assertAlmostEqual(point_d.vector.x, 45 + 135 + 10 + 5)
+        self.assertIn(spline, point_c.dependencies)
+
+        # move B, the memoised metrics and the dependent expressions must be invalidated
+        point_b._x = Expression(20, sketch.calculator)
+        point_b.eval()
+        spline.eval()
+        point_c.eval()
+        self.assertNotAlmostEqual(point_c.vector.x, length)
+        self.assertAlmostEqual(point_c.vector.x, spline.geometry().length)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,73 @@
+####################################################################################################
+#
+# Patro - A Python library to make patterns for fashion design
+# Copyright (C) 2019 Fabrice Salvaire
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################################################################
+
+####################################################################################################
+
+####################################################################################################
+
+import threading
+import unittest
+
+from Patro.Measurement.Measurement import MeasurementSet
+from Patro.Pattern.Pattern import Pattern
+from Patro.Pattern.SketchOperation import SinglePoint
+
+####################################################################################################
+
+class TestPattern(unittest.TestCase):
+
+    ##############################################
+
+    def test_operation_id(self):
+
+        sketches = [Pattern(MeasurementSet(), 'cm').add_scope('test').sketch for i in range(2)]
+        for sketch in sketches:
+            # same ids in two patterns
+            point = SinglePoint(sketch, 'A', 0, 0, None, id=10)
+            self.assertEqual(point.id, 10)
+            point = SinglePoint(sketch, 'B', 0, 0, None, id=5)
+            self.assertEqual(point.id, 5)
+            point = SinglePoint(sketch, 'C', 0, 0, None)
+            self.assertEqual(point.id, 11)
+            with self.assertRaises(NameError):
+                SinglePoint(sketch, 'D', 0, 0, None, id=5)
+
+    ##############################################
+
+    def test_concurrent_id(self):
+
+        pattern = Pattern(MeasurementSet(), 'cm')
+        sketch = pattern.add_scope('test').sketch
+        ids = []
+        def create():
+            for i in range(100):
+                ids.append(SinglePoint(sketch, 'P', 0, 0, None).id)
+        threads = [threading.Thread(target=create) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(ids)), 400)
+
+####################################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()